@@ -0,0 +1,70 @@
+"""Workflow phases must only read deck fields inside the `presentations.get` mask."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from wesfarmers_slide_reviewer.deck_snapshot import DeckSnapshot
+from wesfarmers_slide_reviewer.demo_content import REVIEW_MODES
+from wesfarmers_slide_reviewer.field_masks import (
+    WORKFLOW_PHASES,
+    FieldMaskViolation,
+    field_tree,
+    guard_response,
+    project,
+)
+from wesfarmers_slide_reviewer.review_workflow import _sync_issues_register_slide, _update_speaker_notes
+from wesfarmers_slide_reviewer.synthetic_deck import generate_presentation
+
+
+class _RecordingRequest:
+    def __init__(self, response: dict[str, Any]) -> None:
+        self._response = response
+
+    def execute(self) -> dict[str, Any]:
+        return self._response
+
+
+class _RecordingSlidesService:
+    """Slides stand-in that accepts writes without touching the network."""
+
+    def __init__(self) -> None:
+        self.batch_updates: list[dict[str, Any]] = []
+
+    def presentations(self) -> _RecordingSlidesService:
+        return self
+
+    def batchUpdate(self, presentationId: str, body: dict[str, Any]) -> _RecordingRequest:
+        self.batch_updates.append(body)
+        return _RecordingRequest({"replies": [{} for _ in body["requests"]]})
+
+
+def _guarded_snapshot(slide_count: int) -> DeckSnapshot:
+    full = generate_presentation(slide_count=slide_count)
+    tree = field_tree(*WORKFLOW_PHASES)
+    return DeckSnapshot(
+        presentation_id=full["presentationId"],
+        presentation=guard_response(project(full, tree), tree),
+    )
+
+
+@pytest.mark.parametrize("mode_key", list(REVIEW_MODES))
+def test_workflow_reads_only_masked_fields(mode_key: str) -> None:
+    snapshot = _guarded_snapshot(slide_count=25)
+    service = _RecordingSlidesService()
+    mode = REVIEW_MODES[mode_key]
+
+    assert snapshot.title
+    issues_slide = _sync_issues_register_slide(service, snapshot, mode)
+    _update_speaker_notes(service, snapshot, mode, issues_slide["slide_ids"])
+
+    assert service.batch_updates
+
+
+def test_guard_rejects_fields_outside_the_mask() -> None:
+    snapshot = _guarded_snapshot(slide_count=2)
+
+    with pytest.raises(FieldMaskViolation):
+        snapshot.presentation["pageSize"]
@@ -0,0 +1,126 @@
+"""Optimized Slides request lists must leave the deck exactly as the originals do.
+
+Both lists are applied to the emulator, which honours `fields` masks, so a
+rewrite that drops or widens a mask shows up as a different deck.
+"""
+
+from __future__ import annotations
+
+import copy
+from typing import Any
+
+import pytest
+
+from wesfarmers_slide_reviewer.demo_content import REVIEW_MODES
+from wesfarmers_slide_reviewer.emulator import SlidesDriveEmulator
+from wesfarmers_slide_reviewer.request_optimizer import optimize_requests
+from wesfarmers_slide_reviewer.review_workflow import _issues_register_content_requests
+from wesfarmers_slide_reviewer.synthetic_deck import generate_presentation
+
+BASE = generate_presentation(slide_count=2)
+PRESENTATION_ID = BASE["presentationId"]
+SLIDE_ID = "golden_slide"
+CREATE_SLIDE = {"createSlide": {"objectId": SLIDE_ID, "insertionIndex": 0}}
+
+
+def _redundant_requests(slide_id: str) -> list[dict[str, Any]]:
+    """Requests that exercise every rewrite in `request_optimizer`."""
+
+    table_id, box_id = "golden_table", "golden_box"
+    page = {"pageObjectId": slide_id}
+    fill = "tableCellBackgroundFill.solidFill.color"
+    requests: list[dict[str, Any]] = [
+        {"createTable": {"objectId": table_id, "rows": 4, "columns": 3, "elementProperties": page}},
+        {"createShape": {"objectId": box_id, "shapeType": "TEXT_BOX", "elementProperties": page}},
+    ]
+    for row in range(4):
+        for column in range(3):
+            color = {"red": 1, "green": 1, "blue": 1} if row else {"red": 0.8, "green": 0.0, "blue": 0.15}
+            requests.append(
+                {
+                    "updateTableCellProperties": {
+                        "objectId": table_id,
+                        "tableRange": {"location": {"rowIndex": row, "columnIndex": column}},
+                        "tableCellProperties": {
+                            "tableCellBackgroundFill": {"solidFill": {"color": {"rgbColor": color}}}
+                        },
+                        "fields": f"{fill},{fill}",
+                    }
+                }
+            )
+    for column, width in enumerate((40, 40, 120)):
+        requests.append(
+            {
+                "updateTableColumnProperties": {
+                    "objectId": table_id,
+                    "columnIndices": [column],
+                    "tableColumnProperties": {"columnWidth": {"magnitude": width, "unit": "PT"}},
+                    "fields": "columnWidth",
+                }
+            }
+        )
+    requests.append({"insertText": {"objectId": box_id, "insertionIndex": 0, "text": "Golden"}})
+    styles = (({"bold": True}, "bold,bold"), ({"fontSize": {"magnitude": 9, "unit": "PT"}}, "fontSize,italic"))
+    for style, fields in styles:
+        requests.append(
+            {
+                "updateTextStyle": {
+                    "objectId": box_id,
+                    "textRange": {"type": "ALL"},
+                    "style": style,
+                    "fields": fields,
+                }
+            }
+        )
+    shape = {
+        "updateShapeProperties": {
+            "objectId": box_id,
+            "shapeProperties": {"outline": {"propertyState": "NOT_RENDERED"}},
+            "fields": "outline,outline.propertyState",
+        }
+    }
+    return [*requests, shape, shape]
+
+
+def _apply(requests: list[dict[str, Any]]) -> dict[str, Any]:
+    emulator = SlidesDriveEmulator()
+    emulator.add_presentation(copy.deepcopy(BASE))
+    emulator.batch_update(PRESENTATION_ID, {"requests": copy.deepcopy(requests)})
+    return emulator.presentations[PRESENTATION_ID]
+
+
+@pytest.mark.parametrize("mode_key", list(REVIEW_MODES))
+def test_issues_register_requests_are_equivalent(mode_key: str) -> None:
+    requests = [
+        CREATE_SLIDE,
+        *_issues_register_content_requests(SLIDE_ID, REVIEW_MODES[mode_key], generated="golden"),
+    ]
+    original = copy.deepcopy(requests)
+
+    optimized = optimize_requests(requests)
+
+    assert requests == original
+    assert len(optimized) <= len(requests)
+    assert _apply(optimized) == _apply(requests)
+
+
+def test_redundant_requests_shrink_and_stay_equivalent() -> None:
+    requests = [CREATE_SLIDE, *_redundant_requests(SLIDE_ID)]
+    original = copy.deepcopy(requests)
+
+    optimized = optimize_requests(requests)
+
+    assert requests == original
+    assert len(optimized) < len(requests)
+    assert _apply(optimized) == _apply(requests)
+
+
+@pytest.mark.parametrize("kind", ["updateShapeProperties", "updateTableCellProperties", "updateTableColumnProperties"])
+def test_golden_comparison_catches_a_narrowed_mask(kind: str) -> None:
+    requests = [CREATE_SLIDE, *_redundant_requests(SLIDE_ID)]
+    narrowed = copy.deepcopy(requests)
+    for request in narrowed:
+        if kind in request:
+            request[kind]["fields"] = "contentAlignment"
+
+    assert _apply(narrowed) != _apply(requests)
@@ -0,0 +1,46 @@
+"""Snapshot cache entries round-trip as JSON and unreadable entries are discarded."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from wesfarmers_slide_reviewer.snapshot_cache import SnapshotCache
+from wesfarmers_slide_reviewer.synthetic_deck import generate_presentation
+
+PRINCIPAL = "reviewer@example.com"
+FIELDS = "slides"
+
+
+def test_store_then_load_returns_the_same_presentation(tmp_path: Path) -> None:
+    cache = SnapshotCache(tmp_path)
+    presentation = generate_presentation(slide_count=3)
+
+    cache.store(PRINCIPAL, presentation["presentationId"], FIELDS, presentation)
+    loaded = cache.load(PRINCIPAL, presentation["presentationId"], FIELDS, presentation["revisionId"])
+
+    assert loaded == presentation
+    assert cache.stats.hits == 1
+
+
+def test_unreadable_entry_is_a_miss_and_is_removed(tmp_path: Path) -> None:
+    cache = SnapshotCache(tmp_path)
+    presentation = generate_presentation(slide_count=1)
+    cache.store(PRINCIPAL, presentation["presentationId"], FIELDS, presentation)
+    (entry,) = tmp_path.iterdir()
+    entry.write_bytes(b"\xe3\x00\x00not json")
+
+    loaded = cache.load(PRINCIPAL, presentation["presentationId"], FIELDS, presentation["revisionId"])
+
+    assert loaded is None
+    assert cache.stats.misses == 1
+    assert not entry.exists()
+
+
+def test_other_accounts_do_not_share_entries(tmp_path: Path) -> None:
+    cache = SnapshotCache(tmp_path)
+    presentation = generate_presentation(slide_count=1)
+    cache.store(PRINCIPAL, presentation["presentationId"], FIELDS, presentation)
+
+    loaded = cache.load("other@example.com", presentation["presentationId"], FIELDS, presentation["revisionId"])
+
+    assert loaded is None
@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from google.adk.agents import Agent
 
-from .tools import list_review_modes, review_presentation
+from .google_clients import load_environment, warm_up_clients_in_background
+from .tools import list_review_modes, review_presentation_async
+
+load_environment()
 
 AGENT_INSTRUCTION = """
 You are the Wesfarmers Business Development slide-review agent.
@@ -12,12 +15,16 @@ You are the Wesfarmers Business Development slide-review agent.
 Operating protocol:
 1) Start every conversation by calling `list_review_modes` and showing the three modes.
 2) Ask the user to pick one mode and provide a `presentation_id`.
-3) Only after both values are provided, call `review_presentation`.
+3) Only after both values are provided, call `review_presentation_async`.
 4) Summarize exactly what was changed in the deck:
    - number of Drive comments created,
    - Issues Register slide insertion,
-   - number of speaker notes updated.
+   - number of speaker notes updated,
+   - how long the review took, from `timing_summary.total_ms`,
+   - any phases listed in `skipped_phases` or `late_phases`.
 5) If the user asks for another mode, rerun with the same presentation ID unless they provide a new one.
+6) If a review returns `status: error` and the user retries the same deck and mode, call
+   `review_presentation_async` again with `resume=true` so finished work is not repeated.
 
 Review modes available:
 - ic_hard_mode
@@ -33,5 +40,9 @@ root_agent = Agent(
         "an Issues Register slide, and speaker notes."
     ),
     instruction=AGENT_INSTRUCTION,
-    tools=[list_review_modes, review_presentation],
+    tools=[list_review_modes, review_presentation_async],
 )
+
+# Mint a token and build the Slides/Drive clients while the user is still
+# choosing a review mode, so the first tool call does not pay for it.
+warm_up_clients_in_background()
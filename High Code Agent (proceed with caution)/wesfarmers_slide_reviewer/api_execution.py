@@ -0,0 +1,301 @@
+"""Shared execution layer for Google API calls: rate limits, retries, backoff and hedging."""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import random
+import socket
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from googleapiclient.errors import HttpError
+
+from .deadlines import current_deadline, ensure_time_for
+from .instrumentation import record_api_call, record_hedge, record_retry
+
+SLIDES_READ = "slides_read"
+SLIDES_WRITE = "slides_write"
+DRIVE_COMMENTS = "drive_comments"
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_403_REASONS = frozenset({"rateLimitExceeded", "userRateLimitExceeded"})
+# Failures that mean the request never reached the server.
+NOT_SENT_ERRORS: tuple[type[BaseException], ...] = (ConnectionRefusedError, socket.gaierror)
+
+HEDGE_READS_ENV = "WESFARMERS_HEDGE_READS"
+HEDGE_PERCENTILE = 0.95
+# Below this many samples the caller's default hedge delay is used.
+HEDGE_MIN_SAMPLES = 8
+HEDGE_WORKERS = 8
+_LATENCY_WINDOW = 200
+
+# Requests per minute and burst size for each quota bucket. The defaults sit
+# just under the documented per-user quotas so a batch run is never throttled.
+DEFAULT_RATE_LIMITS: dict[str, tuple[float, int]] = {
+    SLIDES_READ: (570.0, 20),
+    SLIDES_WRITE: (57.0, 5),
+    DRIVE_COMMENTS: (170.0, 20),
+}
+
+T = TypeVar("T")
+
+
+class TokenBucket:
+    """Thread-safe token bucket; `acquire` blocks until enough tokens exist."""
+
+    def __init__(self, per_minute: float, burst: int) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: int = 1) -> float:
+        """Take `tokens` and return the seconds spent waiting for them.
+
+        A request larger than the burst waits for a full bucket and then
+        leaves it in debt, so later callers absorb the overshoot.
+        """
+
+        tokens = max(1, tokens)
+        needed = min(tokens, self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= needed:
+                    self._tokens -= tokens
+                    return waited
+                delay = (needed - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 16.0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given 1-based attempt."""
+
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+@dataclass
+class _LimiterRegistry:
+    limits: dict[str, tuple[float, int]] = field(default_factory=lambda: dict(DEFAULT_RATE_LIMITS))
+    buckets: dict[str, TokenBucket] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def bucket(self, api: str) -> TokenBucket:
+        with self.lock:
+            bucket = self.buckets.get(api)
+            if bucket is None:
+                per_minute, burst = self.limits.get(api, DEFAULT_RATE_LIMITS[SLIDES_READ])
+                bucket = self.buckets[api] = TokenBucket(per_minute, burst)
+            return bucket
+
+
+# One limiter per quota for the whole process, shared by every thread and
+# every concurrent review.
+RATE_LIMITERS = _LimiterRegistry()
+
+
+def configure_rate_limit(api: str, per_minute: float, burst: int) -> None:
+    """Override the limit for one quota bucket (takes effect immediately)."""
+
+    with RATE_LIMITERS.lock:
+        RATE_LIMITERS.limits[api] = (per_minute, burst)
+        RATE_LIMITERS.buckets.pop(api, None)
+
+
+def http_status(exc: BaseException) -> int | None:
+    if isinstance(exc, HttpError):
+        return getattr(exc.resp, "status", None)
+    return None
+
+
+def is_retryable(exc: BaseException, idempotent: bool = True) -> bool:
+    """Whether a failed call is safe to send again unchanged.
+
+    A call that is not idempotent may have taken effect despite a 5xx or a
+    dropped connection, so it is only retried when it was rejected before
+    being applied: rate limiting, or a connection that was never made.
+    """
+
+    if isinstance(exc, HttpError):
+        status = http_status(exc)
+        if status == 429:
+            return True
+        if status in RETRYABLE_STATUS_CODES:
+            return idempotent
+        if status == 403:
+            reasons = {
+                detail.get("reason")
+                for detail in (exc.error_details or [])
+                if isinstance(detail, dict)
+            }
+            return bool(reasons & RETRYABLE_403_REASONS)
+        return False
+    if isinstance(exc, NOT_SENT_ERRORS):
+        return True
+    return idempotent and isinstance(exc, (ConnectionError, TimeoutError))
+
+
+def call_with_retry(
+    call: Callable[[], T],
+    api: str,
+    cost: int = 1,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    idempotent: bool = True,
+) -> T:
+    """Run `call` under the quota bucket for `api`, retrying retryable failures.
+
+    Pass `idempotent=False` for calls that must not be applied twice.
+    """
+
+    bucket = RATE_LIMITERS.bucket(api)
+    attempt = 1
+    while True:
+        ensure_time_for(0, f"a {api} call")
+        bucket.acquire(cost)
+        record_api_call(cost)
+        try:
+            return call()
+        except Exception as exc:
+            if attempt >= policy.max_attempts or not is_retryable(exc, idempotent):
+                raise
+            delay = policy.backoff(attempt)
+            ensure_time_for(delay, f"retrying a {api} call", cause=exc)
+        record_retry()
+        time.sleep(delay)
+        attempt += 1
+
+
+def execute(
+    request: Any,
+    api: str,
+    cost: int = 1,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    idempotent: bool = True,
+) -> Any:
+    """Execute a googleapiclient request (or batch) through the shared layer.
+
+    `cost` is the number of quota units the call consumes, e.g. the number of
+    calls inside a batch HTTP request. Writes that are not safe to repeat,
+    such as creating a comment or an unpinned batchUpdate, pass
+    `idempotent=False` (see `is_retryable`).
+    """
+
+    return call_with_retry(request.execute, api=api, cost=cost, policy=policy, idempotent=idempotent)
+
+
+class LatencyTracker:
+    """Recent latencies of each kind of read, used to decide when to hedge."""
+
+    def __init__(self, window: int = _LATENCY_WINDOW) -> None:
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(name, deque(maxlen=self.window)).append(seconds)
+
+    def percentile(self, name: str, pct: float) -> float | None:
+        """The `pct` quantile of recent `name` latencies, or None with too few samples."""
+
+        with self._lock:
+            samples = sorted(self._samples.get(name, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(pct * len(samples)))]
+
+
+READ_LATENCIES = LatencyTracker()
+
+_hedge_executor: ThreadPoolExecutor | None = None
+_hedge_executor_lock = threading.Lock()
+
+
+def hedging_enabled() -> bool:
+    return os.getenv(HEDGE_READS_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_executor_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedged-read")
+        return _hedge_executor
+
+
+def shutdown_hedge_pool() -> None:
+    """Stop the hedged-read threads once in-flight reads finish; the next read starts a new pool."""
+
+    global _hedge_executor
+    with _hedge_executor_lock:
+        executor, _hedge_executor = _hedge_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _timed_read(build: Callable[[], Any], api: str, name: str, policy: RetryPolicy) -> Any:
+    started = time.perf_counter()
+    result = execute(build(), api=api, policy=policy)
+    READ_LATENCIES.record(name, time.perf_counter() - started)
+    return result
+
+
+def execute_hedged(
+    build: Callable[[], Any],
+    api: str,
+    name: str,
+    default_delay: float,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+) -> Any:
+    """Execute an idempotent read, sending a second copy if the first is slow.
+
+    The copy goes out once the first request has taken longer than the p95 of
+    recent `name` reads (`default_delay` until there are enough of them), and
+    the first successful response wins. `build` returns a fresh request and
+    is called on the sending thread, since each thread has its own transport.
+    `WESFARMERS_HEDGE_READS=0` sends a single request.
+    """
+
+    if not hedging_enabled():
+        return _timed_read(build, api, name, policy)
+
+    delay = READ_LATENCIES.percentile(name, HEDGE_PERCENTILE) or default_delay
+    pool = _hedge_pool()
+    # Each copy carries the caller's span and deadline.
+    futures = [pool.submit(contextvars.copy_context().run, _timed_read, build, api, name, policy)]
+    done, _ = wait(futures, timeout=delay)
+    deadline = current_deadline()
+    if not done and (deadline is None or deadline.remaining() > 0):
+        record_hedge()
+        futures.append(pool.submit(contextvars.copy_context().run, _timed_read, build, api, name, policy))
+
+    errors: list[Exception] = []
+    for future in as_completed(futures):
+        try:
+            return future.result()
+        except Exception as exc:
+            errors.append(exc)
+    raise errors[0]
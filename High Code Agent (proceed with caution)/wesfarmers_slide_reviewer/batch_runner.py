@@ -0,0 +1,144 @@
+"""Review many decks in one process on a bounded worker pool."""
+
+from __future__ import annotations
+
+import json
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Any
+
+from .demo_content import normalize_mode
+from .tools import review_presentation
+
+DEFAULT_BATCH_WORKERS = 4
+
+
+class BatchInputError(ValueError):
+    """Raised when a batch input line cannot be parsed."""
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    line_number: int
+    presentation_id: str
+    review_mode: str
+
+
+def parse_batch_input(lines: Iterable[str], default_mode: str | None = None) -> list[BatchJob]:
+    """Parse one deck per line.
+
+    A line is either a JSON object with `presentation_id` and optional
+    `review_mode`, or `<presentation_id> [review_mode]` separated by
+    whitespace or a comma. Blank lines and `#` comments are skipped. A
+    presentation listed twice in the same mode is rejected.
+    """
+
+    jobs: list[BatchJob] = []
+    seen: dict[tuple[str, str], int] = {}
+    for line_number, raw in enumerate(lines, start=1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        if line.startswith("{"):
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise BatchInputError(f"Line {line_number}: invalid JSON ({exc.msg}).") from exc
+            presentation_id = str(entry.get("presentation_id", "")).strip()
+            review_mode = str(entry.get("review_mode") or default_mode or "").strip()
+        else:
+            parts = line.replace(",", " ").split()
+            presentation_id = parts[0]
+            review_mode = parts[1] if len(parts) > 1 else (default_mode or "")
+
+        if not presentation_id:
+            raise BatchInputError(f"Line {line_number}: missing presentation_id.")
+        if not review_mode:
+            raise BatchInputError(
+                f"Line {line_number}: missing review_mode and no --review-mode default was given."
+            )
+        key = (presentation_id, normalize_mode(review_mode))
+        if key in seen:
+            raise BatchInputError(
+                f"Line {line_number}: presentation {presentation_id} in mode {review_mode} "
+                f"is already listed on line {seen[key]}."
+            )
+        seen[key] = line_number
+        jobs.append(BatchJob(line_number, presentation_id, review_mode))
+
+    return jobs
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for an empty list."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    reviewer_name: str,
+    workers: int = DEFAULT_BATCH_WORKERS,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Review every job and return a throughput and latency summary.
+
+    Workers share the process-wide client registry and quota buckets, so the
+    pool size bounds concurrency without multiplying API setup or quota use.
+    Jobs for the same presentation run one after another on one worker, in
+    input order, since they write to the same register slides and notes.
+    `on_result` is called with each deck's result as soon as it finishes.
+    """
+
+    groups: dict[str, list[BatchJob]] = {}
+    for job in jobs:
+        groups.setdefault(job.presentation_id, []).append(job)
+
+    latencies: list[float] = []
+    failed = 0
+    lock = threading.Lock()
+
+    def _review(group: list[BatchJob]) -> None:
+        nonlocal failed
+        for job in group:
+            job_started = time.perf_counter()
+            result = review_presentation(job.presentation_id, job.review_mode, reviewer_name)
+            result = {
+                "line": job.line_number,
+                "latency_ms": round((time.perf_counter() - job_started) * 1000, 2),
+                **result,
+            }
+            with lock:
+                latencies.append(result["latency_ms"])
+                if result.get("status") != "ok":
+                    failed += 1
+                if on_result is not None:
+                    on_result(result)
+
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch-review") as pool:
+        futures = [pool.submit(_review, group) for group in groups.values()]
+        for future in as_completed(futures):
+            future.result()
+
+    wall_s = time.perf_counter() - started
+    return {
+        "decks": len(jobs),
+        "succeeded": len(jobs) - failed,
+        "failed": failed,
+        "workers": max(1, workers),
+        "wall_s": round(wall_s, 2),
+        "throughput_decks_per_min": round(len(jobs) / wall_s * 60, 2) if wall_s > 0 else 0.0,
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p95_ms": percentile(latencies, 95),
+    }
@@ -0,0 +1,112 @@
+"""Batch HTTP helpers for Google API clients."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Collection, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .api_execution import DEFAULT_RETRY_POLICY, RetryPolicy, call_with_retry, is_retryable
+from .deadlines import ensure_time_for
+from .instrumentation import record_retry
+
+# Drive and Slides both cap a single batch HTTP request at 100 calls.
+MAX_BATCH_SIZE = 100
+
+
+@dataclass
+class BatchItemResult:
+    key: str
+    response: dict[str, Any] | None = None
+    error: Exception | None = None
+    attempts: int = 0
+    # Set when a retry round found the call had already taken effect.
+    already_applied: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def execute_batched(
+    service: Any,
+    request_factories: Sequence[tuple[str, Callable[[], Any]]],
+    batch_size: int,
+    api: str,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    already_applied: Callable[[list[str]], Collection[str]] | None = None,
+    idempotent: bool = True,
+) -> list[BatchItemResult]:
+    """Execute requests through batch HTTP, retrying only items that failed.
+
+    Each entry pairs a unique key with a factory returning a fresh
+    ``HttpRequest``; results are returned in the order the factories were given.
+    Every batch is charged against the `api` quota bucket, one unit per call.
+
+    A batch HTTP request is only resent when it was rejected before reaching
+    the server (see `is_retryable`). Items that failed with a retryable
+    error, including every item of a batch that failed as a whole, are sent
+    again in later rounds. With `idempotent=False` an item is only resent
+    when it was rejected before being applied, unless `already_applied` is
+    given: before each retry round it gets the keys about to be resent and
+    returns those whose calls already took effect, which are dropped and
+    marked `already_applied`.
+    """
+
+    batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+    # Re-checking before each round makes resending a failed item safe.
+    resendable = idempotent or already_applied is not None
+    factories = dict(request_factories)
+    results = {key: BatchItemResult(key=key) for key in factories}
+    pending = list(factories)
+
+    for attempt in range(1, policy.max_attempts + 1):
+        if not pending:
+            break
+        if attempt > 1:
+            delay = policy.backoff(attempt - 1)
+            ensure_time_for(delay, f"retrying {len(pending)} {api} calls")
+            if already_applied is not None:
+                applied = set(already_applied(pending))
+                for key in pending:
+                    if key in applied:
+                        results[key].error = None
+                        results[key].already_applied = True
+                pending = [key for key in pending if key not in applied]
+                if not pending:
+                    break
+            record_retry(len(pending))
+            time.sleep(delay)
+
+        for start in range(0, len(pending), batch_size):
+            chunk = pending[start : start + batch_size]
+
+            def _collect(request_id: str, response: Any, exception: Exception | None) -> None:
+                item = results[request_id]
+                item.attempts += 1
+                item.response = response if exception is None else None
+                item.error = exception
+
+            batch = service.new_batch_http_request(callback=_collect)
+            for key in chunk:
+                batch.add(factories[key](), request_id=key)
+            try:
+                call_with_retry(batch.execute, api=api, cost=len(chunk), policy=policy, idempotent=False)
+            except Exception as exc:
+                if not is_retryable(exc, resendable):
+                    raise
+                for key in chunk:
+                    item = results[key]
+                    if item.attempts < attempt:
+                        item.attempts += 1
+                        item.response = None
+                        item.error = exc
+
+        pending = [
+            key
+            for key in pending
+            if results[key].error is not None and is_retryable(results[key].error, resendable)
+        ]
+
+    return [results[key] for key, _ in request_factories]
@@ -0,0 +1,175 @@
+"""Microbenchmarks for the pure-CPU request builders and notes generator."""
+
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from .deck_index import DeckIndex
+from .demo_content import REVIEW_MODES, load_style_guide, load_style_guide_rules
+from .review_workflow import (
+    _issues_register_content_requests,
+    _notes_template,
+    _register_from_template_requests,
+)
+from .synthetic_deck import generate_presentation
+
+DEFAULT_SIZES: tuple[int, ...] = (10, 100, 500, 2000)
+DEFAULT_TOLERANCE = 0.25
+# Added to the traced-block threshold so benchmarks that allocate only a
+# handful of blocks are not flagged for a few extra.
+ALLOCATION_SLACK_BLOCKS = 16
+DEFAULT_MIN_TIME_S = 0.2
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    ops_per_sec: float
+    mean_us: float
+    traced_blocks: int
+    peak_kib: float
+
+
+def _measure(name: str, op: Callable[[], Any], min_time: float) -> BenchmarkResult:
+    op()  # warm caches and lazy imports outside the timed region
+
+    iterations = 0
+    gc.collect()
+    started = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time:
+        op()
+        iterations += 1
+        elapsed = time.perf_counter() - started
+
+    # Blocks one call allocates that are still alive when it returns (the
+    # result and anything it caches), counted by tracemalloc so collections
+    # and interpreter free lists do not move the number.
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    result = op()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del result
+    own_frames = (tracemalloc.Filter(False, tracemalloc.__file__),)
+    traced_blocks = sum(
+        stat.count_diff
+        for stat in after.filter_traces(own_frames).compare_to(before.filter_traces(own_frames), "filename")
+    )
+
+    return BenchmarkResult(
+        name=name,
+        ops_per_sec=round(iterations / elapsed, 2),
+        mean_us=round(elapsed / iterations * 1e6, 2),
+        traced_blocks=traced_blocks,
+        peak_kib=round(peak / 1024, 2),
+    )
+
+
+def _notes_for_deck(index: DeckIndex, rules: tuple[str, ...]) -> list[str]:
+    template = _notes_template(REVIEW_MODES["ic_hard_mode"], rules)
+    return [template.render(number, number + 1, record.title) for number, record in index.numbered()]
+
+
+def benchmark_cases(sizes: tuple[int, ...]) -> dict[str, Callable[[], Any]]:
+    """Name -> zero-argument callable for every benchmarked hot path."""
+
+    cases: dict[str, Callable[[], Any]] = {}
+    for key, mode in REVIEW_MODES.items():
+        cases[f"issues_register_requests[{key}]"] = (
+            lambda mode=mode: _issues_register_content_requests("issues_register_bench", mode)
+        )
+        cases[f"issues_register_template_fill[{key}]"] = (
+            lambda mode=mode: _register_from_template_requests("issues_register_bench", mode, 0)
+        )
+
+    cases["style_guide_load"] = load_style_guide
+
+    rules = load_style_guide_rules()
+    for size in sizes:
+        for density, body_lines, notes_every in (("sparse", 1, 0), ("dense", 12, 1)):
+            slides = generate_presentation(
+                slide_count=size,
+                body_lines=body_lines,
+                notes_every=notes_every,
+            )["slides"]
+            cases[f"deck_index_build[{size},{density}]"] = lambda slides=slides: DeckIndex.build(slides)
+
+        index = DeckIndex.build(generate_presentation(slide_count=size)["slides"])
+        cases[f"speaker_note_text[{size}]"] = lambda index=index: _notes_for_deck(index, rules)
+
+    return cases
+
+
+def run_benchmarks(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    min_time: float = DEFAULT_MIN_TIME_S,
+) -> dict[str, Any]:
+    results = [
+        asdict(_measure(name, op, min_time))
+        for name, op in benchmark_cases(sizes).items()
+    ]
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "benchmarks": {result.pop("name"): result for result in results},
+    }
+
+
+def compare_to_baseline(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[dict[str, Any]]:
+    """List every benchmark that is slower or heavier than baseline beyond `tolerance`.
+
+    Heavier means a larger peak or more traced blocks; the block count is
+    also given `ALLOCATION_SLACK_BLOCKS` of headroom, and is skipped for
+    baselines saved before it was recorded.
+    """
+
+    regressions: list[dict[str, Any]] = []
+    for name, base in baseline.get("benchmarks", {}).items():
+        now = current["benchmarks"].get(name)
+        if now is None:
+            continue
+        checks = (
+            ("ops_per_sec", now["ops_per_sec"] < base["ops_per_sec"] * (1 - tolerance)),
+            ("peak_kib", now["peak_kib"] > base["peak_kib"] * (1 + tolerance)),
+            (
+                "traced_blocks",
+                "traced_blocks" in base
+                and now["traced_blocks"]
+                > max(base["traced_blocks"], 0) * (1 + tolerance) + ALLOCATION_SLACK_BLOCKS,
+            ),
+        )
+        for metric, regressed in checks:
+            if regressed:
+                regressions.append(
+                    {
+                        "benchmark": name,
+                        "metric": metric,
+                        "baseline": base[metric],
+                        "current": now[metric],
+                    }
+                )
+    return regressions
+
+
+def save_baseline(results: dict[str, Any], path: Path) -> None:
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def load_baseline(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
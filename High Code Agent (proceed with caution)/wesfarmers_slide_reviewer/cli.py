@@ -4,10 +4,22 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
+from typing import Any
 
+from .deadlines import parse_duration
+from .discovery_documents import refresh_discovery_documents
 from .tools import list_review_modes, review_presentation
 
 
+def _duration(value: str) -> str:
+    try:
+        parse_duration(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+    return value
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="wesfarmers-slide-reviewer",
@@ -20,6 +32,22 @@ def build_parser() -> argparse.ArgumentParser:
         help="Print available review modes.",
     )
 
+    subparsers.add_parser(
+        "refresh-discovery",
+        help="Download current Slides/Drive discovery documents over the pinned copies.",
+    )
+
+    selfcheck_parser = subparsers.add_parser(
+        "selfcheck",
+        help="Run performance self-checks (startup import budget, deck field masks).",
+    )
+    selfcheck_parser.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        default=None,
+        help="Cumulative package import budget for `modes` and `--help`.",
+    )
+
     run_parser = subparsers.add_parser(
         "run",
         help="Execute the review workflow against a presentation.",
@@ -39,21 +67,185 @@ def build_parser() -> argparse.ArgumentParser:
         default="Wesfarmers BD Demo Agent",
         help="Name stamped into the output summary.",
     )
+    run_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the last unfinished run of this presentation and mode from its journal.",
+    )
+    run_parser.add_argument(
+        "--deadline",
+        type=_duration,
+        default=None,
+        help="Time budget for the run, e.g. 45s or 2m. Calls time out and optional phases are skipped to meet it.",
+    )
+    run_parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Capture cProfile, tracemalloc and per-phase wall/CPU times for the run.",
+    )
+    run_parser.add_argument(
+        "--profile-dir",
+        default="profiles",
+        help="Directory that receives one sub-directory of profile artefacts per run.",
+    )
+    run_parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=25,
+        help="Number of functions and allocation sites listed in the text reports.",
+    )
+
+    bench_parser = subparsers.add_parser(
+        "bench",
+        help="Microbenchmark the register builder, deck index and notes generator.",
+    )
+    bench_parser.add_argument(
+        "--sizes",
+        default="10,100,500,2000",
+        help="Comma-separated synthetic deck sizes (slides).",
+    )
+    bench_parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Seconds to run each benchmark for.",
+    )
+    bench_parser.add_argument(
+        "--save-baseline",
+        default=None,
+        help="Write results to this JSON file.",
+    )
+    bench_parser.add_argument(
+        "--baseline",
+        default=None,
+        help="Compare against this JSON baseline and exit non-zero on regression.",
+    )
+    bench_parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed fractional slowdown, peak-memory growth or traced-block growth versus baseline.",
+    )
+
+    batch_parser = subparsers.add_parser(
+        "run-batch",
+        help="Review many presentations on a worker pool, one JSON result per line.",
+    )
+    batch_parser.add_argument(
+        "--input",
+        default="-",
+        help="File with one `presentation_id [review_mode]` or JSON object per line (default: stdin).",
+    )
+    batch_parser.add_argument(
+        "--review-mode",
+        default=None,
+        help="Mode for lines that do not name one.",
+    )
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of decks reviewed concurrently.",
+    )
+    batch_parser.add_argument(
+        "--reviewer-name",
+        default="Wesfarmers BD Demo Agent",
+        help="Name stamped into each output summary.",
+    )
 
     return parser
 
 
+def _run_batch(args: argparse.Namespace) -> dict[str, Any]:
+    from .batch_runner import BatchInputError, parse_batch_input, run_batch
+
+    try:
+        if args.input == "-":
+            jobs = parse_batch_input(sys.stdin, default_mode=args.review_mode)
+        else:
+            with open(args.input, encoding="utf-8") as handle:
+                jobs = parse_batch_input(handle, default_mode=args.review_mode)
+    except (BatchInputError, OSError) as exc:
+        raise SystemExit(f"run-batch: {exc}") from exc
+
+    def _emit(result: dict[str, Any]) -> None:
+        print(json.dumps(result), flush=True)
+
+    return run_batch(
+        jobs,
+        reviewer_name=args.reviewer_name,
+        workers=args.workers,
+        on_result=_emit,
+    )
+
+
+def _bench(args: argparse.Namespace) -> dict[str, Any]:
+    from pathlib import Path
+
+    from .benchmarks import compare_to_baseline, load_baseline, run_benchmarks, save_baseline
+
+    sizes = tuple(int(size) for size in args.sizes.split(",") if size.strip())
+    result = run_benchmarks(sizes=sizes, min_time=args.min_time)
+    if args.save_baseline:
+        save_baseline(result, Path(args.save_baseline))
+    if args.baseline:
+        result["regressions"] = compare_to_baseline(
+            result,
+            load_baseline(Path(args.baseline)),
+            tolerance=args.tolerance,
+        )
+    return result
+
+
 def main() -> None:
     parser = build_parser()
     args = parser.parse_args()
 
     if args.command == "modes":
         result = list_review_modes()
+    elif args.command == "refresh-discovery":
+        result = {"refreshed": refresh_discovery_documents()}
+    elif args.command == "bench":
+        result = _bench(args)
+        print(json.dumps(result, indent=2))
+        if result.get("regressions"):
+            raise SystemExit(1)
+        return
+    elif args.command == "run-batch":
+        print(json.dumps({"summary": _run_batch(args)}), flush=True)
+        return
+    elif args.command == "selfcheck":
+        from .selfcheck import DEFAULT_STARTUP_BUDGET_MS, run_selfchecks
+
+        result = run_selfchecks(
+            startup_budget_ms=args.startup_budget_ms or DEFAULT_STARTUP_BUDGET_MS,
+        )
+        print(json.dumps(result, indent=2))
+        if not result["passed"]:
+            raise SystemExit(1)
+        return
+    elif args.profile:
+        from .profiling import profile_run
+
+        result = profile_run(
+            lambda: review_presentation(
+                presentation_id=args.presentation_id,
+                review_mode=args.review_mode,
+                reviewer_name=args.reviewer_name,
+                resume=args.resume,
+                deadline=args.deadline,
+            ),
+            label=f"{args.presentation_id}-{args.review_mode}",
+            output_dir=args.profile_dir,
+            top_n=args.profile_top,
+        )
     else:
         result = review_presentation(
             presentation_id=args.presentation_id,
             review_mode=args.review_mode,
             reviewer_name=args.reviewer_name,
+            resume=args.resume,
+            deadline=args.deadline,
         )
 
     print(json.dumps(result, indent=2))
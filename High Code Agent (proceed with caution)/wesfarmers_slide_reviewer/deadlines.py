@@ -0,0 +1,118 @@
+"""Overall time budget for a review, and per-call timeouts derived from it."""
+
+from __future__ import annotations
+
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+# A call is never given less than this, so a nearly spent budget fails fast
+# with a timeout rather than with a zero-length socket wait.
+MIN_CALL_TIMEOUT_S = 0.5
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m)?\s*$", re.IGNORECASE)
+_UNIT_SECONDS = {"ms": 0.001, "s": 1.0, "m": 60.0}
+
+
+class DeadlineExceededError(RuntimeError):
+    """Raised instead of starting (or retrying) a call once the budget is spent."""
+
+
+def parse_duration(value: str | float | int) -> float:
+    """Seconds in `45`, `45s`, `1.5m` or `500ms`."""
+
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = _DURATION_RE.match(value)
+        if match is None:
+            raise ValueError(f"Invalid duration {value!r}; use e.g. 45s, 2m or 500ms.")
+        seconds = float(match.group(1)) * _UNIT_SECONDS[(match.group(2) or "s").lower()]
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive, got {value!r}.")
+    return seconds
+
+
+class Deadline:
+    """A point in time, on the monotonic clock, by which a review should finish."""
+
+    def __init__(self, seconds: float) -> None:
+        self.budget_s = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+
+_active_deadline: ContextVar[Deadline | None] = ContextVar("wesfarmers_deadline", default=None)
+
+
+def current_deadline() -> Deadline | None:
+    return _active_deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Deadline | None) -> Iterator[None]:
+    """Make `deadline` apply to API calls made from this thread inside the block.
+
+    `run_phases` opens a scope around every phase it submits; code that hands
+    API calls to its own threads must open one in each of them as well.
+    """
+
+    token = _active_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _active_deadline.reset(token)
+
+
+def ensure_time_for(seconds: float, what: str, cause: BaseException | None = None) -> None:
+    """Raise `DeadlineExceededError` if the active deadline leaves less than `seconds`."""
+
+    deadline = _active_deadline.get()
+    if deadline is None:
+        return
+    remaining = deadline.remaining()
+    if remaining <= seconds:
+        raise DeadlineExceededError(
+            f"Review deadline of {deadline.budget_s:g}s reached before {what}."
+        ) from cause
+
+
+def call_timeout() -> float | None:
+    """Socket timeout for the next call: the time left, or None without a deadline."""
+
+    deadline = _active_deadline.get()
+    if deadline is None:
+        return None
+    return max(MIN_CALL_TIMEOUT_S, deadline.remaining())
+
+
+class DeadlineHttp:
+    """Wrap an `httplib2.Http` so each request times out when the deadline does.
+
+    httplib2 reads `timeout` only when it opens a connection, so sockets it
+    keeps alive are updated as well.
+    """
+
+    def __init__(self, http: Any) -> None:
+        self._http = http
+
+    def request(self, *args: Any, **kwargs: Any) -> Any:
+        timeout = call_timeout()
+        if timeout != self._http.timeout:
+            self._http.timeout = timeout
+            for connection in self._http.connections.values():
+                connection.timeout = timeout
+                if getattr(connection, "sock", None) is not None:
+                    connection.sock.settimeout(timeout)
+        return self._http.request(*args, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._http, name)
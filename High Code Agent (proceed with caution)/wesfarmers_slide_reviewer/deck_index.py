@@ -0,0 +1,186 @@
+"""Compact, single-pass index over a Slides `Presentation` resource."""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from typing import Any
+
+TITLE_PLACEHOLDERS = frozenset({"TITLE", "CENTERED_TITLE"})
+
+# Last line of generated speaker notes; records what the notes were built from.
+NOTES_FINGERPRINT_RE = re.compile(r"\[wesfarmers-review:([0-9a-f]{16})\]\s*$")
+
+
+def notes_fingerprint_marker(fingerprint: str) -> str:
+    return f"[wesfarmers-review:{fingerprint}]"
+
+
+@dataclass(frozen=True, slots=True)
+class SlideRecord:
+    """What the workflow needs to know about one slide.
+
+    `text` is every text run on the slide concatenated in element order;
+    `run_offsets` holds the start offset of each run within `text`, and
+    `shape_spans` the (objectId, start, end) of each text-bearing shape,
+    and `element_ids` the objectId of every page element on the slide.
+    `notes_fingerprint` is the marker left by the last generated notes, if any.
+    """
+
+    object_id: str
+    title: str
+    notes_object_id: str | None
+    notes_has_text: bool
+    text: str
+    run_offsets: array
+    shape_spans: tuple[tuple[str, int, int], ...]
+    element_ids: tuple[str, ...] = ()
+    notes_fingerprint: str = ""
+
+    def shape_text(self, object_id: str) -> str:
+        for shape_id, start, end in self.shape_spans:
+            if shape_id == object_id:
+                return self.text[start:end]
+        return ""
+
+
+@dataclass
+class DeckIndex:
+    """Slide records plus lookup maps, built in one pass over the deck JSON."""
+
+    slides: list[SlideRecord] = field(default_factory=list)
+    by_object_id: dict[str, SlideRecord] = field(default_factory=dict)
+    by_placeholder: dict[str, list[tuple[str, str]]] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, slides: Iterable[dict[str, Any]]) -> DeckIndex:
+        index = cls()
+        for slide in slides:
+            index.append(index_slide(slide, index.by_placeholder))
+        return index
+
+    def append(self, record: SlideRecord) -> None:
+        self.slides.append(record)
+        self._map(record)
+
+    def insert(self, position: int, record: SlideRecord) -> None:
+        self.slides.insert(position, record)
+        self._map(record)
+
+    def remove(self, object_id: str) -> SlideRecord | None:
+        record = self.by_object_id.get(object_id)
+        if record is None or record.object_id != object_id:
+            return None
+        self.slides.remove(record)
+        for key in [key for key, value in self.by_object_id.items() if value is record]:
+            del self.by_object_id[key]
+        for placements in self.by_placeholder.values():
+            placements[:] = [entry for entry in placements if entry[0] != object_id]
+        return record
+
+    def _map(self, record: SlideRecord) -> None:
+        self.by_object_id[record.object_id] = record
+        for shape_id, _, _ in record.shape_spans:
+            self.by_object_id[shape_id] = record
+
+    def slide_for(self, object_id: str) -> SlideRecord | None:
+        """Return the slide owning a slide or page-element objectId."""
+
+        return self.by_object_id.get(object_id)
+
+    def numbered(self, start: int = 1) -> Iterator[tuple[int, SlideRecord]]:
+        return enumerate(self.slides, start=start)
+
+    def __len__(self) -> int:
+        return len(self.slides)
+
+
+def index_slide(
+    slide: dict[str, Any],
+    by_placeholder: dict[str, list[tuple[str, str]]] | None = None,
+) -> SlideRecord:
+    """Build the record for one slide with a single walk over its elements."""
+
+    slide_id = slide.get("objectId", "unknown")
+    chunks: list[str] = []
+    run_offsets = array("I")
+    shape_spans: list[tuple[str, int, int]] = []
+    element_ids: list[str] = []
+    offset = 0
+    placeholder_title = ""
+    first_text_line = ""
+
+    for page_element in slide.get("pageElements", []):
+        element_id = page_element.get("objectId", "")
+        if element_id:
+            element_ids.append(element_id)
+        shape = page_element.get("shape")
+        if not shape:
+            continue
+
+        placeholder_type = shape.get("placeholder", {}).get("type")
+        if placeholder_type and by_placeholder is not None:
+            by_placeholder.setdefault(placeholder_type, []).append((slide_id, element_id))
+
+        start = offset
+        first_chunk = len(chunks)
+        for element in shape.get("text", {}).get("textElements", []):
+            content = element.get("textRun", {}).get("content")
+            if content:
+                run_offsets.append(offset)
+                chunks.append(content)
+                offset += len(content)
+        if offset == start:
+            continue
+
+        shape_spans.append((element_id, start, offset))
+        wants_title = not placeholder_title and placeholder_type in TITLE_PLACEHOLDERS
+        if first_text_line and not wants_title:
+            continue
+        shape_text = "".join(chunks[first_chunk:]).strip()
+        if not shape_text:
+            continue
+        if wants_title:
+            placeholder_title = shape_text
+        if not first_text_line:
+            first_text_line = shape_text.splitlines()[0].strip()
+
+    notes_page = slide.get("slideProperties", {}).get("notesPage", {})
+    notes_object_id = notes_page.get("notesProperties", {}).get("speakerNotesObjectId")
+    notes_has_text, notes_fingerprint = _notes_state(notes_page.get("pageElements", []), notes_object_id)
+
+    return SlideRecord(
+        object_id=slide_id,
+        title=placeholder_title or first_text_line,
+        notes_object_id=notes_object_id,
+        notes_has_text=notes_has_text,
+        text="".join(chunks),
+        run_offsets=run_offsets,
+        shape_spans=tuple(shape_spans),
+        element_ids=tuple(element_ids),
+        notes_fingerprint=notes_fingerprint,
+    )
+
+
+def _notes_state(page_elements: list[dict[str, Any]], notes_object_id: str | None) -> tuple[bool, str]:
+    """Whether the speaker notes shape has text, and the fingerprint marker it ends with."""
+
+    if not notes_object_id:
+        return False, ""
+    for page_element in page_elements:
+        if page_element.get("objectId") != notes_object_id:
+            continue
+        shape = page_element.get("shape")
+        if not shape:
+            return False, ""
+        runs = [
+            element.get("textRun", {}).get("content", "")
+            for element in shape.get("text", {}).get("textElements", [])
+        ]
+        if not any(run.strip() for run in runs):
+            return False, ""
+        match = NOTES_FINGERPRINT_RE.search("".join(runs[-3:]))
+        return True, match.group(1) if match else ""
+    return False, ""
@@ -0,0 +1,197 @@
+"""Single in-memory snapshot of a presentation shared by workflow phases."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from functools import cached_property
+from typing import TYPE_CHECKING, Any
+
+from .api_execution import SLIDES_READ, execute_hedged
+from .deck_index import DeckIndex, index_slide
+from .field_masks import (
+    WORKFLOW_PHASES,
+    field_tree,
+    fields_mask,
+    guard_response,
+    strict_field_masks_enabled,
+)
+
+if TYPE_CHECKING:
+    from .snapshot_cache import SnapshotCache
+
+# Hedge delays used until enough reads have been timed to know their p95.
+REVISION_READ_HEDGE_S = 1.0
+FULL_READ_HEDGE_S = 5.0
+
+
+class DeckChangedError(RuntimeError):
+    """Raised when a write pinned to the snapshot's revision finds the deck edited since."""
+
+
+@dataclass
+class DeckSnapshot:
+    """The presentation resource as last fetched, plus local edits.
+
+    Phases read from `index` instead of calling `presentations().get()`
+    themselves. After the workflow changes the deck, it records the change
+    here using object IDs it already knows rather than fetching again.
+    `revision_id` follows the deck only while every change is mirrored.
+    """
+
+    presentation_id: str
+    presentation: dict[str, Any]
+    api_reads: int = 0
+    fields: str = ""
+    from_cache: bool = False
+    stored_revision_id: str | None = None
+    # Account the deck was read as; the cache keys on it.
+    principal: str = ""
+
+    @classmethod
+    def fetch(
+        cls,
+        slides_service: Any,
+        presentation_id: str,
+        phases: tuple[str, ...] = WORKFLOW_PHASES,
+        cache: SnapshotCache | None = None,
+        principal: str = "",
+    ) -> DeckSnapshot:
+        """Fetch only the fields the given workflow phases read.
+
+        With a cache, a `fields=revisionId` read comes first and the full
+        fetch is skipped when `principal` has a snapshot of that revision on
+        disk. Both reads are hedged (see `api_execution.execute_hedged`).
+        """
+
+        fields = fields_mask(*phases)
+        api_reads = 0
+        presentation: dict[str, Any] | None = None
+        if cache is not None:
+            revision_id = execute_hedged(
+                lambda: slides_service.presentations().get(presentationId=presentation_id, fields="revisionId"),
+                api=SLIDES_READ,
+                name="presentations.get:revisionId",
+                default_delay=REVISION_READ_HEDGE_S,
+            ).get("revisionId")
+            api_reads += 1
+            if revision_id:
+                presentation = cache.load(principal, presentation_id, fields, revision_id)
+
+        from_cache = presentation is not None
+        if presentation is None:
+            presentation = execute_hedged(
+                lambda: slides_service.presentations().get(presentationId=presentation_id, fields=fields),
+                api=SLIDES_READ,
+                name="presentations.get",
+                default_delay=FULL_READ_HEDGE_S,
+            )
+            api_reads += 1
+            if cache is not None:
+                cache.store(principal, presentation_id, fields, presentation)
+
+        stored_revision_id = presentation.get("revisionId") if cache is not None else None
+        if strict_field_masks_enabled():
+            presentation = guard_response(presentation, field_tree(*phases))
+        return cls(
+            presentation_id=presentation_id,
+            presentation=presentation,
+            api_reads=api_reads,
+            fields=fields,
+            from_cache=from_cache,
+            stored_revision_id=stored_revision_id,
+            principal=principal,
+        )
+
+    @property
+    def revision_id(self) -> str | None:
+        return self.presentation.get("revisionId")
+
+    def record_revision(self, revision_id: str | None) -> None:
+        """Track the revision after a mirrored write; None once the deck may hold unmirrored changes."""
+
+        if revision_id:
+            self.presentation["revisionId"] = revision_id
+        else:
+            self.presentation.pop("revisionId", None)
+
+    def store(self, cache: SnapshotCache) -> bool:
+        """Save the mirrored snapshot under its current revision, if that is known and new."""
+
+        revision_id = self.revision_id
+        if not self.fields or not revision_id or revision_id == self.stored_revision_id:
+            return False
+        cache.store(self.principal, self.presentation_id, self.fields, self.presentation)
+        self.stored_revision_id = revision_id
+        return True
+
+    def refresh(self, slides_service: Any) -> None:
+        """Replace the mirrored deck with a fresh read after someone else edited it."""
+
+        fresh = DeckSnapshot.fetch(slides_service, self.presentation_id)
+        self.presentation = fresh.presentation
+        self.fields = fresh.fields
+        self.api_reads += fresh.api_reads
+        self.from_cache = False
+        self.__dict__.pop("index", None)
+
+    @property
+    def title(self) -> str:
+        return self.presentation.get("title", "Untitled presentation")
+
+    @property
+    def slides(self) -> list[dict[str, Any]]:
+        return self.presentation.setdefault("slides", [])
+
+    @cached_property
+    def index(self) -> DeckIndex:
+        return DeckIndex.build(self.slides)
+
+    def record_slide_inserted(
+        self,
+        slide_id: str,
+        insertion_index: int = 0,
+        element_ids: Sequence[str] = (),
+    ) -> None:
+        """Mirror a `createSlide` request that has already been applied remotely."""
+
+        slide = {
+            "objectId": slide_id,
+            "pageElements": [{"objectId": element_id} for element_id in element_ids],
+            "slideProperties": {},
+        }
+        self.slides.insert(insertion_index, slide)
+        if "index" in self.__dict__:
+            self.index.insert(insertion_index, index_slide(slide))
+
+    def record_notes_written(self, notes_text: Mapping[str, str]) -> None:
+        """Mirror speaker-notes rewrites, keyed by speaker notes objectId.
+
+        Slides creates the speaker notes shape on the first `insertText` into
+        a notes page that had none, so a missing shape is added here too.
+        """
+
+        for slide in self.slides:
+            notes_page = slide.get("slideProperties", {}).get("notesPage", {})
+            notes_id = notes_page.get("notesProperties", {}).get("speakerNotesObjectId")
+            if notes_id not in notes_text:
+                continue
+            elements = notes_page.setdefault("pageElements", [])
+            element = next((item for item in elements if item.get("objectId") == notes_id), None)
+            if element is None:
+                element = {"objectId": notes_id}
+                elements.append(element)
+            element.setdefault("shape", {})["text"] = {
+                "textElements": [{"textRun": {"content": notes_text[notes_id]}}]
+            }
+        # Rebuilt on next use; nothing later in a run reads notes state.
+        self.__dict__.pop("index", None)
+
+    def record_slide_deleted(self, slide_id: str) -> None:
+        """Mirror a `deleteObject` on a slide that has already been applied remotely."""
+
+        self.presentation["slides"] = [
+            slide for slide in self.slides if slide.get("objectId") != slide_id
+        ]
+        if "index" in self.__dict__:
+            self.index.remove(slide_id)
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
 
 
@@ -352,14 +354,20 @@ def get_mode_or_raise(mode: str) -> ModeContent:
     return REVIEW_MODES[normalized]
 
 
-def load_style_guide_rules() -> tuple[str, ...]:
-    """Load style guide bullets from markdown, with safe fallback defaults."""
+@dataclass(frozen=True)
+class StyleGuide:
+    rules: tuple[str, ...]
+    # Hash of the parsed rules; notes fingerprints and compiled templates key on it.
+    version: str = field(init=False)
 
-    if not STYLE_GUIDE_FILE.exists():
-        return DEFAULT_STYLE_GUIDE_RULES
+    def __post_init__(self) -> None:
+        digest = hashlib.sha256("\n".join(self.rules).encode("utf-8")).hexdigest()[:12]
+        object.__setattr__(self, "version", digest)
 
+
+def _parse_style_guide(text: str) -> tuple[str, ...]:
     rules: list[str] = []
-    for line in STYLE_GUIDE_FILE.read_text(encoding="utf-8").splitlines():
+    for line in text.splitlines():
         stripped = line.strip()
         if stripped.startswith("- "):
             rules.append(stripped[2:].strip())
@@ -367,6 +375,55 @@ def load_style_guide_rules() -> tuple[str, ...]:
     return tuple(rules) if rules else DEFAULT_STYLE_GUIDE_RULES
 
 
+# (file stat key, file content hash, parsed guide) from the last load.
+_style_guide_state: tuple[tuple[int, int] | None, str, StyleGuide] | None = None
+_style_guide_lock = threading.Lock()
+
+
+def load_style_guide() -> StyleGuide:
+    """Parsed style guide, re-read only when the file changes.
+
+    An unchanged mtime and size return the cached guide without opening the
+    file; otherwise the file is hashed and only re-parsed if its content
+    differs.
+    """
+
+    global _style_guide_state
+
+    try:
+        stat = STYLE_GUIDE_FILE.stat()
+        stat_key: tuple[int, int] | None = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        stat_key = None
+
+    state = _style_guide_state
+    if state is not None and state[0] == stat_key:
+        return state[2]
+
+    with _style_guide_lock:
+        if stat_key is None:
+            content_hash = ""
+            guide = StyleGuide(DEFAULT_STYLE_GUIDE_RULES)
+        else:
+            try:
+                raw = STYLE_GUIDE_FILE.read_bytes()
+            except FileNotFoundError:
+                raw = b""
+            content_hash = hashlib.sha256(raw).hexdigest()
+            if state is not None and state[1] == content_hash:
+                guide = state[2]
+            else:
+                guide = StyleGuide(_parse_style_guide(raw.decode("utf-8")))
+        _style_guide_state = (stat_key, content_hash, guide)
+    return guide
+
+
+def load_style_guide_rules() -> tuple[str, ...]:
+    """Load style guide bullets from markdown, with safe fallback defaults."""
+
+    return load_style_guide().rules
+
+
 def load_slide_ai_comments(slide_number: int) -> tuple[str, ...]:
     """Return explicit AI comments for a specific deck slide, if configured."""
 
@@ -0,0 +1,83 @@
+"""Pinned Google API discovery documents bundled with the package."""
+
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+DISCOVERY_DIR = Path(__file__).with_name("discovery")
+DISCOVERY_URL_TEMPLATE = "https://www.googleapis.com/discovery/v1/apis/{api}/{version}/rest"
+
+# The APIs the workflow talks to. Each entry maps to `<api>.<version>.json`
+# in DISCOVERY_DIR.
+PINNED_APIS: tuple[tuple[str, str], ...] = (
+    ("slides", "v1"),
+    ("drive", "v3"),
+)
+
+
+class DiscoveryDocumentError(RuntimeError):
+    """Raised when a bundled discovery document is missing or cannot be refreshed."""
+
+
+def discovery_document_path(api: str, version: str) -> Path:
+    return DISCOVERY_DIR / f"{api}.{version}.json"
+
+
+@lru_cache(maxsize=None)
+def load_discovery_document(api: str, version: str) -> dict[str, Any]:
+    """Load and parse a bundled discovery document once per process."""
+
+    path = discovery_document_path(api, version)
+    if not path.exists():
+        raise DiscoveryDocumentError(
+            f"No bundled discovery document for {api} {version}. "
+            "Run `wesfarmers-slide-reviewer refresh-discovery`."
+        )
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def discovery_revisions() -> dict[str, str]:
+    """Return the pinned revision of every bundled discovery document."""
+
+    return {
+        f"{api}.{version}": load_discovery_document(api, version).get("revision", "unknown")
+        for api, version in PINNED_APIS
+    }
+
+
+def refresh_discovery_documents(timeout: float = 30.0) -> dict[str, dict[str, str]]:
+    """Download the current discovery documents and overwrite the pinned copies."""
+
+    import httplib2
+
+    http = httplib2.Http(timeout=timeout)
+    refreshed: dict[str, dict[str, str]] = {}
+    for api, version in PINNED_APIS:
+        url = DISCOVERY_URL_TEMPLATE.format(api=api, version=version)
+        response, content = http.request(url, "GET")
+        if response.status != 200:
+            raise DiscoveryDocumentError(
+                f"Unable to refresh discovery document for {api} {version}: HTTP {response.status}"
+            )
+
+        document = json.loads(content)
+        key = f"{api}.{version}"
+        previous = (
+            load_discovery_document(api, version).get("revision", "unknown")
+            if discovery_document_path(api, version).exists()
+            else "missing"
+        )
+        discovery_document_path(api, version).write_text(
+            json.dumps(document, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+        refreshed[key] = {
+            "previous_revision": previous,
+            "revision": document.get("revision", "unknown"),
+        }
+
+    load_discovery_document.cache_clear()
+    return refreshed
@@ -0,0 +1,698 @@
+"""In-process stand-in for the Slides and Drive APIs the workflow uses.
+
+The emulator keeps decks and comments in memory and exposes objects shaped
+like googleapiclient resources (`presentations().get(...).execute()`,
+`comments().create(...)`, `new_batch_http_request(...)`), so the unmodified
+workflow runs against it once it is installed through `google_clients`.
+Latency, jitter, 429 injection and payload-size accounting are configurable.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from .field_masks import parse_fields_mask, project
+from .google_clients import GoogleClients, set_clients_override
+from .instrumentation import record_io
+from .synthetic_deck import generate_presentation
+
+EMULATOR_LATENCY_ENV = "WESFARMERS_EMULATOR_LATENCY_MS"
+EMULATOR_JITTER_ENV = "WESFARMERS_EMULATOR_JITTER_MS"
+EMULATOR_429_RATE_ENV = "WESFARMERS_EMULATOR_429_RATE"
+EMULATOR_SLIDES_ENV = "WESFARMERS_EMULATOR_SLIDES"
+
+
+@dataclass
+class EmulatorConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    rate_limit_probability: float = 0.0
+    auto_create_slides: int = 12
+    seed: int | None = None
+
+    @classmethod
+    def from_env(cls) -> EmulatorConfig:
+        return cls(
+            latency_ms=float(os.getenv(EMULATOR_LATENCY_ENV, "0") or 0),
+            jitter_ms=float(os.getenv(EMULATOR_JITTER_ENV, "0") or 0),
+            rate_limit_probability=float(os.getenv(EMULATOR_429_RATE_ENV, "0") or 0),
+            auto_create_slides=int(os.getenv(EMULATOR_SLIDES_ENV, "12") or 12),
+        )
+
+
+@dataclass
+class EmulatorStats:
+    calls: Counter[str] = field(default_factory=Counter)
+    rate_limited: Counter[str] = field(default_factory=Counter)
+    request_bytes: Counter[str] = field(default_factory=Counter)
+    response_bytes: Counter[str] = field(default_factory=Counter)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": dict(self.calls),
+            "rate_limited": dict(self.rate_limited),
+            "request_bytes": dict(self.request_bytes),
+            "response_bytes": dict(self.response_bytes),
+        }
+
+
+def _http_error(status: int, message: str, uri: str) -> HttpError:
+    reason = "rateLimitExceeded" if status == 429 else "badRequest"
+    content = json.dumps(
+        {
+            "error": {
+                "code": status,
+                "message": message,
+                "errors": [{"reason": reason, "message": message}],
+            }
+        }
+    ).encode("utf-8")
+    return HttpError(httplib2.Response({"status": status}), content, uri=uri)
+
+
+def _payload_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":"))) if value is not None else 0
+
+
+class EmulatedRequest:
+    """Mirrors `googleapiclient.http.HttpRequest` closely enough for the workflow."""
+
+    def __init__(
+        self,
+        emulator: SlidesDriveEmulator,
+        method_id: str,
+        payload: Any,
+        handler: Callable[[], Any],
+    ) -> None:
+        self.emulator = emulator
+        self.methodId = method_id
+        self.uri = f"emulator://{method_id}"
+        self.payload = payload
+        self._handler = handler
+
+    def execute(self, http: Any = None, num_retries: int = 0) -> Any:
+        self.emulator.simulate_latency()
+        return self.emulator.dispatch(self)
+
+
+class EmulatedBatch:
+    """Mirrors `BatchHttpRequest`: one simulated round-trip for many calls."""
+
+    def __init__(self, emulator: SlidesDriveEmulator, callback: Callable[..., None] | None) -> None:
+        self.emulator = emulator
+        self._callback = callback
+        self._requests: list[tuple[str, EmulatedRequest, Callable[..., None] | None]] = []
+
+    def add(
+        self,
+        request: EmulatedRequest,
+        callback: Callable[..., None] | None = None,
+        request_id: str | None = None,
+    ) -> None:
+        self._requests.append((request_id or str(len(self._requests) + 1), request, callback))
+
+    def execute(self, http: Any = None) -> None:
+        if not self._requests:
+            return
+        self.emulator.simulate_latency()
+        for request_id, request, callback in self._requests:
+            response, error = None, None
+            try:
+                response = self.emulator.dispatch(request)
+            except HttpError as exc:
+                error = exc
+            for handler in (callback, self._callback):
+                if handler is not None:
+                    handler(request_id, response, error)
+
+
+class _Presentations:
+    def __init__(self, emulator: SlidesDriveEmulator) -> None:
+        self._emulator = emulator
+
+    def get(self, presentationId: str, fields: str | None = None) -> EmulatedRequest:
+        return EmulatedRequest(
+            self._emulator,
+            "slides.presentations.get",
+            {"presentationId": presentationId, "fields": fields},
+            lambda: self._emulator.get_presentation(presentationId, fields),
+        )
+
+    def batchUpdate(self, presentationId: str, body: dict[str, Any]) -> EmulatedRequest:
+        return EmulatedRequest(
+            self._emulator,
+            "slides.presentations.batchUpdate",
+            body,
+            lambda: self._emulator.batch_update(presentationId, body),
+        )
+
+
+class _SlidesService:
+    def __init__(self, emulator: SlidesDriveEmulator) -> None:
+        self._emulator = emulator
+
+    def presentations(self) -> _Presentations:
+        return _Presentations(self._emulator)
+
+    def new_batch_http_request(self, callback: Callable[..., None] | None = None) -> EmulatedBatch:
+        return EmulatedBatch(self._emulator, callback)
+
+
+class _Comments:
+    def __init__(self, emulator: SlidesDriveEmulator) -> None:
+        self._emulator = emulator
+
+    def create(self, fileId: str, body: dict[str, Any], fields: str | None = None) -> EmulatedRequest:
+        return EmulatedRequest(
+            self._emulator,
+            "drive.comments.create",
+            body,
+            lambda: self._emulator.create_comment(fileId, body, fields),
+        )
+
+    def list(
+        self,
+        fileId: str,
+        fields: str | None = None,
+        pageSize: int = 20,
+        pageToken: str | None = None,
+        includeDeleted: bool = False,
+    ) -> EmulatedRequest:
+        return EmulatedRequest(
+            self._emulator,
+            "drive.comments.list",
+            {
+                "fileId": fileId,
+                "fields": fields,
+                "pageSize": pageSize,
+                "pageToken": pageToken,
+                "includeDeleted": includeDeleted,
+            },
+            lambda: self._emulator.list_comments(fileId, fields, pageSize, pageToken, includeDeleted),
+        )
+
+    def list_next(
+        self,
+        previous_request: EmulatedRequest,
+        previous_response: dict[str, Any],
+    ) -> EmulatedRequest | None:
+        token = previous_response.get("nextPageToken")
+        if not token:
+            return None
+        return self.list(**{**previous_request.payload, "pageToken": token})
+
+
+class _DriveService:
+    def __init__(self, emulator: SlidesDriveEmulator) -> None:
+        self._emulator = emulator
+
+    def comments(self) -> _Comments:
+        return _Comments(self._emulator)
+
+    def new_batch_http_request(self, callback: Callable[..., None] | None = None) -> EmulatedBatch:
+        return EmulatedBatch(self._emulator, callback)
+
+
+class SlidesDriveEmulator:
+    """Thread-safe in-memory Slides/Drive backend."""
+
+    def __init__(self, config: EmulatorConfig | None = None) -> None:
+        self.config = config or EmulatorConfig()
+        self.presentations: dict[str, dict[str, Any]] = {}
+        self.comments: dict[str, list[dict[str, Any]]] = {}
+        self.stats = EmulatorStats()
+        self._lock = threading.RLock()
+        self._random = random.Random(self.config.seed)
+        self._comment_counter = 0
+
+    # -- setup -----------------------------------------------------------------
+
+    def add_presentation(self, presentation: dict[str, Any]) -> None:
+        with self._lock:
+            self.presentations[presentation["presentationId"]] = copy.deepcopy(presentation)
+
+    def slides_service(self) -> _SlidesService:
+        return _SlidesService(self)
+
+    def drive_service(self) -> _DriveService:
+        return _DriveService(self)
+
+    # -- transport simulation --------------------------------------------------
+
+    def simulate_latency(self) -> None:
+        delay_ms = self.config.latency_ms
+        if self.config.jitter_ms:
+            with self._lock:
+                delay_ms += self._random.uniform(0, self.config.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def dispatch(self, request: EmulatedRequest) -> Any:
+        request_bytes = _payload_size(request.payload)
+        with self._lock:
+            self.stats.calls[request.methodId] += 1
+            self.stats.request_bytes[request.methodId] += request_bytes
+            throttled = (
+                self.config.rate_limit_probability > 0
+                and self._random.random() < self.config.rate_limit_probability
+            )
+            if throttled:
+                self.stats.rate_limited[request.methodId] += 1
+        if throttled:
+            record_io(request_bytes=request_bytes)
+            raise _http_error(429, "Quota exceeded (emulated).", request.uri)
+
+        response = request._handler()
+        response_bytes = _payload_size(response)
+        with self._lock:
+            self.stats.response_bytes[request.methodId] += response_bytes
+        record_io(request_bytes=request_bytes, response_bytes=response_bytes)
+        return response
+
+    # -- Slides ----------------------------------------------------------------
+
+    def _presentation(self, presentation_id: str) -> dict[str, Any]:
+        deck = self.presentations.get(presentation_id)
+        if deck is None and self.config.auto_create_slides > 0:
+            deck = generate_presentation(
+                slide_count=self.config.auto_create_slides,
+                presentation_id=presentation_id,
+            )
+            self.presentations[presentation_id] = deck
+        if deck is None:
+            raise _http_error(404, f"Requested entity was not found: {presentation_id}", "emulator://slides")
+        return deck
+
+    def get_presentation(self, presentation_id: str, fields: str | None) -> dict[str, Any]:
+        with self._lock:
+            deck = self._presentation(presentation_id)
+            # Project first so a narrow mask (e.g. `revisionId`) copies little.
+            return copy.deepcopy(project(deck, parse_fields_mask(fields)) if fields else deck)
+
+    def batch_update(self, presentation_id: str, body: dict[str, Any]) -> dict[str, Any]:
+        with self._lock:
+            # batchUpdate is atomic: apply to a copy and only keep it if every
+            # request succeeds.
+            current = self._presentation(presentation_id)
+            required = (body.get("writeControl") or {}).get("requiredRevisionId")
+            if required and required != current.get("revisionId"):
+                raise _http_error(
+                    400,
+                    "The required revision ID does not match the presentation's current revision.",
+                    "emulator://slides",
+                )
+            working = copy.deepcopy(current)
+            applier = _BatchApplier(working)
+            replies = [applier.apply(request) for request in body.get("requests", [])]
+            revision = int(working.get("revisionId", "0").rsplit("_", 1)[-1] or 0) + 1
+            working["revisionId"] = f"emulated_revision_{revision}"
+            self.presentations[presentation_id] = working
+        return {
+            "presentationId": presentation_id,
+            "replies": replies,
+            "writeControl": {"requiredRevisionId": working["revisionId"]},
+        }
+
+    # -- Drive -----------------------------------------------------------------
+
+    def create_comment(self, file_id: str, body: dict[str, Any], fields: str | None) -> dict[str, Any]:
+        with self._lock:
+            self._comment_counter += 1
+            comment = {
+                "id": f"emulated_comment_{self._comment_counter}",
+                "content": body.get("content", ""),
+                "createdTime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                "deleted": False,
+                "resolved": False,
+            }
+            self.comments.setdefault(file_id, []).append(comment)
+        return project(comment, parse_fields_mask(fields)) if fields else dict(comment)
+
+    def list_comments(
+        self,
+        file_id: str,
+        fields: str | None,
+        page_size: int,
+        page_token: str | None,
+        include_deleted: bool,
+    ) -> dict[str, Any]:
+        with self._lock:
+            comments = [
+                dict(comment)
+                for comment in self.comments.get(file_id, [])
+                if include_deleted or not comment["deleted"]
+            ]
+        start = int(page_token or 0)
+        page = comments[start : start + max(1, page_size)]
+        response: dict[str, Any] = {"comments": page}
+        if start + page_size < len(comments):
+            response["nextPageToken"] = str(start + page_size)
+        return project(response, parse_fields_mask(fields)) if fields else response
+
+
+_MISSING = object()
+
+
+def _text_elements(text: str) -> dict[str, Any]:
+    return {"textElements": [{"textRun": {"content": text}}] if text else []}
+
+
+def _plain_text(container: dict[str, Any]) -> str:
+    return "".join(
+        element.get("textRun", {}).get("content", "")
+        for element in container.get("text", {}).get("textElements", [])
+    )
+
+
+class _BatchApplier:
+    """Applies Slides batchUpdate requests to an in-memory presentation."""
+
+    def __init__(self, presentation: dict[str, Any]) -> None:
+        self.presentation = presentation
+        self.slides: list[dict[str, Any]] = presentation.setdefault("slides", [])
+        self.objects: dict[str, dict[str, Any]] = {}
+        self.owners: dict[str, list[dict[str, Any]]] = {}
+        # Speaker notes IDs whose shape does not exist yet, by notes page.
+        self.unmade_notes: dict[str, dict[str, Any]] = {}
+        for slide in self.slides:
+            self._register_slide(slide)
+
+    def _register_slide(self, slide: dict[str, Any]) -> None:
+        self.objects[slide["objectId"]] = slide
+        self.owners[slide["objectId"]] = self.slides
+        for element in slide.get("pageElements", []):
+            self.objects[element["objectId"]] = element
+            self.owners[element["objectId"]] = slide["pageElements"]
+        notes_page = slide.get("slideProperties", {}).get("notesPage")
+        if notes_page:
+            for element in notes_page.get("pageElements", []):
+                self.objects[element["objectId"]] = element
+                self.owners[element["objectId"]] = notes_page["pageElements"]
+            notes_id = notes_page.get("notesProperties", {}).get("speakerNotesObjectId")
+            if notes_id and notes_id not in self.objects:
+                self.unmade_notes[notes_id] = notes_page
+
+    def _require(self, object_id: str) -> dict[str, Any]:
+        if object_id not in self.objects:
+            raise _http_error(
+                400,
+                f"Invalid requests: object ({object_id}) could not be found.",
+                "emulator://slides",
+            )
+        return self.objects[object_id]
+
+    def _claim(self, object_id: str) -> None:
+        if object_id in self.objects:
+            raise _http_error(
+                400,
+                f"Invalid requests: object ID ({object_id}) should be unique.",
+                "emulator://slides",
+            )
+
+    def _make_notes_shape(self, notes_id: str) -> None:
+        """Create a speaker notes shape on first use, as Slides does for `insertText`."""
+
+        notes_page = self.unmade_notes.pop(notes_id)
+        element = {"objectId": notes_id, "shape": {"shapeType": "TEXT_BOX"}}
+        notes_page.setdefault("pageElements", []).append(element)
+        self.objects[notes_id] = element
+        self.owners[notes_id] = notes_page["pageElements"]
+
+    def _text_target(self, request: dict[str, Any]) -> dict[str, Any]:
+        element = self._require(request["objectId"])
+        cell = request.get("cellLocation")
+        if cell is None:
+            return element.setdefault("shape", {})
+        table = element.get("table")
+        if table is None:
+            raise _http_error(400, "cellLocation used on a non-table object.", "emulator://slides")
+        return table["tableRows"][cell.get("rowIndex", 0)]["tableCells"][cell.get("columnIndex", 0)]
+
+    def apply(self, request: dict[str, Any]) -> dict[str, Any]:
+        (kind, payload), = request.items()
+        handler = getattr(self, f"_{kind}", None)
+        if handler is None:
+            raise _http_error(400, f"Unsupported request in emulator: {kind}", "emulator://slides")
+        return handler(payload) or {}
+
+    def _createSlide(self, payload: dict[str, Any]) -> dict[str, Any]:
+        slide_id = payload["objectId"]
+        self._claim(slide_id)
+        notes_id = f"{slide_id}_notes_body"
+        slide = {
+            "objectId": slide_id,
+            "pageType": "SLIDE",
+            "pageElements": [],
+            "slideProperties": {
+                "notesPage": {
+                    "objectId": f"{slide_id}_notes",
+                    "notesProperties": {"speakerNotesObjectId": notes_id},
+                    "pageElements": [],
+                }
+            },
+        }
+        index = payload.get("insertionIndex", len(self.slides))
+        self.slides.insert(index, slide)
+        self._register_slide(slide)
+        return {"createSlide": {"objectId": slide_id}}
+
+    def _page_element(self, payload: dict[str, Any], body: dict[str, Any]) -> dict[str, Any]:
+        object_id = payload["objectId"]
+        self._claim(object_id)
+        page = self._require(payload["elementProperties"]["pageObjectId"])
+        element = {
+            "objectId": object_id,
+            "size": payload["elementProperties"].get("size", {}),
+            "transform": payload["elementProperties"].get("transform", {}),
+            **body,
+        }
+        page.setdefault("pageElements", []).append(element)
+        self.objects[object_id] = element
+        self.owners[object_id] = page["pageElements"]
+        return element
+
+    def _createShape(self, payload: dict[str, Any]) -> dict[str, Any]:
+        self._page_element(payload, {"shape": {"shapeType": payload.get("shapeType", "TEXT_BOX")}})
+        return {"createShape": {"objectId": payload["objectId"]}}
+
+    def _createTable(self, payload: dict[str, Any]) -> dict[str, Any]:
+        rows, columns = payload["rows"], payload["columns"]
+        self._page_element(
+            payload,
+            {
+                "table": {
+                    "rows": rows,
+                    "columns": columns,
+                    "tableRows": [{"tableCells": [{} for _ in range(columns)]} for _ in range(rows)],
+                    "tableColumns": [{} for _ in range(columns)],
+                }
+            },
+        )
+        return {"createTable": {"objectId": payload["objectId"]}}
+
+    def _insertText(self, payload: dict[str, Any]) -> None:
+        if payload["objectId"] in self.unmade_notes:
+            self._make_notes_shape(payload["objectId"])
+        target = self._text_target(payload)
+        current = _plain_text(target)
+        index = payload.get("insertionIndex", 0)
+        target["text"] = _text_elements(current[:index] + payload["text"] + current[index:])
+
+    def _deleteText(self, payload: dict[str, Any]) -> None:
+        target = self._text_target(payload)
+        text_range = payload.get("textRange", {"type": "ALL"})
+        if text_range.get("type") == "ALL":
+            target["text"] = _text_elements("")
+            return
+        current = _plain_text(target)
+        start = text_range.get("startIndex", 0)
+        end = text_range.get("endIndex", len(current))
+        target["text"] = _text_elements(current[:start] + current[end:])
+
+    @staticmethod
+    def _apply_mask(target: dict[str, Any], values: dict[str, Any], mask: str) -> None:
+        """Set each (dotted) field path in `mask`; a path without a value is reset."""
+
+        for path in mask.split(","):
+            parts = path.strip().split(".")
+            if not parts[0]:
+                continue
+            source: Any = values
+            for part in parts:
+                source = source.get(part, _MISSING) if isinstance(source, dict) else _MISSING
+            destination = target
+            for part in parts[:-1]:
+                destination = destination.setdefault(part, {})
+            if source is _MISSING:
+                destination.pop(parts[-1], None)
+            else:
+                destination[parts[-1]] = copy.deepcopy(source)
+
+    def _updateTextStyle(self, payload: dict[str, Any]) -> None:
+        target = self._text_target(payload)
+        styles = target.setdefault("emulatedTextStyle", {})
+        self._apply_mask(styles, payload.get("style", {}), payload.get("fields", ""))
+
+    def _updateShapeProperties(self, payload: dict[str, Any]) -> None:
+        shape = self._require(payload["objectId"]).setdefault("shape", {})
+        self._apply_mask(
+            shape.setdefault("shapeProperties", {}),
+            payload.get("shapeProperties", {}),
+            payload.get("fields", ""),
+        )
+
+    def _updateTableColumnProperties(self, payload: dict[str, Any]) -> None:
+        table = self._require(payload["objectId"]).get("table")
+        if table is None:
+            raise _http_error(400, "updateTableColumnProperties on a non-table object.", "emulator://slides")
+        indices = payload.get("columnIndices") or range(table["columns"])
+        for column in indices:
+            self._apply_mask(
+                table["tableColumns"][column].setdefault("tableColumnProperties", {}),
+                payload.get("tableColumnProperties", {}),
+                payload.get("fields", ""),
+            )
+
+    def _updateTableCellProperties(self, payload: dict[str, Any]) -> None:
+        table = self._require(payload["objectId"]).get("table")
+        if table is None:
+            raise _http_error(400, "updateTableCellProperties on a non-table object.", "emulator://slides")
+        table_range = payload.get("tableRange")
+        if table_range is None:
+            table_range = {"rowSpan": table["rows"], "columnSpan": table["columns"]}
+        location = table_range.get("location", {})
+        row, column = location.get("rowIndex", 0), location.get("columnIndex", 0)
+        row_end = row + table_range.get("rowSpan", 1)
+        column_end = column + table_range.get("columnSpan", 1)
+        if row_end > table["rows"] or column_end > table["columns"]:
+            raise _http_error(400, "tableRange is outside the table.", "emulator://slides")
+        for row_index in range(row, row_end):
+            for column_index in range(column, column_end):
+                cell = table["tableRows"][row_index]["tableCells"][column_index]
+                self._apply_mask(
+                    cell.setdefault("tableCellProperties", {}),
+                    payload.get("tableCellProperties", {}),
+                    payload.get("fields", ""),
+                )
+
+    def _fresh_id(self, object_id: str) -> str:
+        suffix = 1
+        while f"{object_id}_copy{suffix}" in self.objects:
+            suffix += 1
+        return f"{object_id}_copy{suffix}"
+
+    def _duplicateObject(self, payload: dict[str, Any]) -> dict[str, Any]:
+        source_id = payload["objectId"]
+        source = self._require(source_id)
+        mapping = payload.get("objectIds", {})
+        duplicate = copy.deepcopy(source)
+
+        def rename(item: dict[str, Any]) -> None:
+            new_id = mapping.get(item["objectId"]) or self._fresh_id(item["objectId"])
+            self._claim(new_id)
+            item["objectId"] = new_id
+
+        rename(duplicate)
+        for element in duplicate.get("pageElements", []):
+            rename(element)
+        notes_page = duplicate.get("slideProperties", {}).get("notesPage")
+        if notes_page:
+            renamed: dict[str, str] = {}
+            for element in notes_page.get("pageElements", []):
+                old_id = element["objectId"]
+                rename(element)
+                renamed[old_id] = element["objectId"]
+            notes_page["objectId"] = self._fresh_id(notes_page.get("objectId", duplicate["objectId"] + "_notes"))
+            properties = notes_page.get("notesProperties", {})
+            if properties.get("speakerNotesObjectId") in renamed:
+                properties["speakerNotesObjectId"] = renamed[properties["speakerNotesObjectId"]]
+
+        owner = self.owners[source_id]
+        position = next(index for index, item in enumerate(owner) if item is source)
+        owner.insert(position + 1, duplicate)
+        if owner is self.slides:
+            self._register_slide(duplicate)
+        else:
+            self.objects[duplicate["objectId"]] = duplicate
+            self.owners[duplicate["objectId"]] = owner
+        return {"duplicateObject": {"objectId": duplicate["objectId"]}}
+
+    def _updateSlidesPosition(self, payload: dict[str, Any]) -> None:
+        moving = [self._require(object_id) for object_id in payload["slideObjectIds"]]
+        index = payload["insertionIndex"]
+        if not 0 <= index <= len(self.slides):
+            raise _http_error(400, "insertionIndex is out of range.", "emulator://slides")
+        # The index refers to the order before the move.
+        target = sum(1 for slide in self.slides[:index] if not any(slide is item for item in moving))
+        self.slides[:] = [slide for slide in self.slides if not any(slide is item for item in moving)]
+        self.slides[target:target] = moving
+
+    def _updateSlideProperties(self, payload: dict[str, Any]) -> None:
+        slide = self._require(payload["objectId"])
+        self._apply_mask(
+            slide.setdefault("slideProperties", {}),
+            payload.get("slideProperties", {}),
+            payload.get("fields", ""),
+        )
+
+    def _replaceAllText(self, payload: dict[str, Any]) -> dict[str, Any]:
+        contains = payload["containsText"]
+        pattern = re.compile(re.escape(contains["text"]), 0 if contains.get("matchCase") else re.IGNORECASE)
+        replacement = payload.get("replaceText", "")
+        pages = set(payload.get("pageObjectIds") or [slide["objectId"] for slide in self.slides])
+
+        containers: list[dict[str, Any]] = []
+        for slide in self.slides:
+            if slide["objectId"] not in pages:
+                continue
+            for element in slide.get("pageElements", []):
+                if "shape" in element:
+                    containers.append(element["shape"])
+                for row in element.get("table", {}).get("tableRows", []):
+                    containers.extend(row.get("tableCells", []))
+
+        changed = 0
+        for container in containers:
+            text, count = pattern.subn(lambda _: replacement, _plain_text(container))
+            if count:
+                container["text"] = _text_elements(text)
+                changed += count
+        return {"replaceAllText": {"occurrencesChanged": changed}}
+
+    def _deleteObject(self, payload: dict[str, Any]) -> None:
+        object_id = payload["objectId"]
+        target = self._require(object_id)
+        self.owners[object_id].remove(target)
+        notes_page = target.get("slideProperties", {}).get("notesPage", {})
+        for child in [*target.get("pageElements", []), *notes_page.get("pageElements", [])]:
+            self.objects.pop(child["objectId"], None)
+            self.owners.pop(child["objectId"], None)
+        self.objects.pop(object_id)
+        self.owners.pop(object_id)
+
+
+def install_emulator(emulator: SlidesDriveEmulator | None = None) -> SlidesDriveEmulator:
+    """Route `google_clients.get_clients()` to an emulator for this process."""
+
+    emulator = emulator or SlidesDriveEmulator(EmulatorConfig.from_env())
+    set_clients_override(
+        GoogleClients(
+            credentials=None,
+            slides=emulator.slides_service(),
+            drive=emulator.drive_service(),
+        )
+    )
+    return emulator
@@ -0,0 +1,161 @@
+"""Minimal `fields=` masks for the presentation reads each workflow phase makes."""
+
+from __future__ import annotations
+
+import os
+from typing import Any
+
+STRICT_FIELD_MASKS_ENV = "WESFARMERS_STRICT_FIELD_MASKS"
+
+_TEXT_RUNS = "shape.text.textElements.textRun.content"
+
+# Dotted paths into the Slides `Presentation` resource, per workflow phase.
+# Anything a phase reads from the deck snapshot must be listed here.
+PHASE_FIELD_PATHS: dict[str, tuple[str, ...]] = {
+    "revision": ("revisionId",),
+    "deck_title": ("title",),
+    "slide_titles": (
+        "slides.objectId",
+        "slides.pageElements.objectId",
+        "slides.pageElements.shape.placeholder.type",
+        f"slides.pageElements.{_TEXT_RUNS}",
+    ),
+    "speaker_notes": (
+        "slides.objectId",
+        "slides.slideProperties.notesPage.notesProperties.speakerNotesObjectId",
+        "slides.slideProperties.notesPage.pageElements.objectId",
+        f"slides.slideProperties.notesPage.pageElements.{_TEXT_RUNS}",
+    ),
+}
+
+WORKFLOW_PHASES: tuple[str, ...] = ("revision", "deck_title", "slide_titles", "speaker_notes")
+
+FieldTree = dict[str, "FieldTree"]
+
+
+class FieldMaskViolation(KeyError):
+    """Raised in strict mode when code reads a field the request did not ask for."""
+
+
+def field_tree(*phases: str) -> FieldTree:
+    """Merge the field paths of the given phases into a nested tree."""
+
+    tree: FieldTree = {}
+    for phase in phases:
+        for path in PHASE_FIELD_PATHS[phase]:
+            node = tree
+            for part in path.split("."):
+                node = node.setdefault(part, {})
+    return tree
+
+
+def render_fields_mask(tree: FieldTree) -> str:
+    parts: list[str] = []
+    for name, children in tree.items():
+        parts.append(f"{name}({render_fields_mask(children)})" if children else name)
+    return ",".join(parts)
+
+
+def fields_mask(*phases: str) -> str:
+    """Build the `fields=` value covering every listed phase."""
+
+    return render_fields_mask(field_tree(*phases))
+
+
+def parse_fields_mask(mask: str) -> FieldTree:
+    """Parse a `fields=` value (`a,b(c,d/e)`) back into a field tree."""
+
+    tree: FieldTree = {}
+    stack: list[FieldTree] = [tree]
+    path_nodes: list[FieldTree] = []
+    token = ""
+
+    def _flush() -> None:
+        nonlocal token
+        node = stack[-1]
+        for part in token.strip().split("/") if token.strip() else ():
+            node = node.setdefault(part, {})
+        path_nodes.append(node)
+        token = ""
+
+    for char in mask:
+        if char == ",":
+            if token.strip():
+                _flush()
+        elif char == "(":
+            _flush()
+            stack.append(path_nodes[-1])
+        elif char == ")":
+            if token.strip():
+                _flush()
+            stack.pop()
+        else:
+            token += char
+    if token.strip():
+        _flush()
+    return tree
+
+
+def project(resource: Any, tree: FieldTree) -> Any:
+    """Apply a field tree to a resource the way the API applies `fields=`."""
+
+    if isinstance(resource, list):
+        return [project(item, tree) for item in resource]
+    if not isinstance(resource, dict) or not tree:
+        return resource
+    return {
+        key: project(value, tree[key])
+        for key, value in resource.items()
+        if key in tree
+    }
+
+
+class _MaskedDict(dict):
+    """Dict that refuses reads of keys outside its field mask."""
+
+    def __init__(self, data: dict[str, Any], tree: FieldTree, path: str) -> None:
+        super().__init__(
+            (key, _guard(value, tree.get(key, {}), f"{path}.{key}" if path else key))
+            for key, value in data.items()
+        )
+        self._tree = tree
+        self._path = path
+
+    def _check(self, key: str) -> None:
+        if key not in self._tree:
+            location = f"{self._path}.{key}" if self._path else key
+            raise FieldMaskViolation(f"Read of '{location}' is outside the requested fields mask.")
+
+    def __getitem__(self, key: str) -> Any:
+        self._check(key)
+        return super().__getitem__(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        self._check(key)
+        return super().get(key, default)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        self._check(key)
+        return super().setdefault(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        self._check(str(key))
+        return super().__contains__(key)
+
+
+def _guard(value: Any, tree: FieldTree, path: str) -> Any:
+    if isinstance(value, list):
+        return [_guard(item, tree, path) for item in value]
+    if isinstance(value, dict) and tree:
+        return _MaskedDict(value, tree, path)
+    return value
+
+
+def guard_response(resource: dict[str, Any], tree: FieldTree) -> dict[str, Any]:
+    """Wrap a response so reads outside `tree` raise `FieldMaskViolation`."""
+
+    return _guard(resource, tree, "")
+
+
+def strict_field_masks_enabled() -> bool:
+    return os.getenv(STRICT_FIELD_MASKS_ENV, "").strip().lower() in {"1", "true", "yes"}
@@ -2,17 +2,30 @@
 
 from __future__ import annotations
 
+import logging
 import os
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from functools import cache
 from typing import Any
 
 import google.auth
+import httplib2
 from dotenv import load_dotenv
 from google.api_core.exceptions import GoogleAPIError
 from google.auth.exceptions import DefaultCredentialsError
 from google.oauth2 import service_account
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from google_auth_httplib2 import Request as HttplibAuthRequest
+from googleapiclient.discovery import build_from_document
+from googleapiclient.http import HttpRequest
 
-load_dotenv()
+from .deadlines import DeadlineHttp
+from .discovery_documents import DiscoveryDocumentError, load_discovery_document
+from .instrumentation import MeteredHttp, span
+
+logger = logging.getLogger(__name__)
 
 SCOPES = (
     "https://www.googleapis.com/auth/presentations",
@@ -21,6 +34,19 @@ SCOPES = (
 
 SERVICE_ACCOUNT_PATH_ENV = "GOOGLE_SERVICE_ACCOUNT_JSON"
 DELEGATED_USER_ENV = "GOOGLE_IMPERSONATE_USER"
+ADC_PATH_ENV = "GOOGLE_APPLICATION_CREDENTIALS"
+EMULATOR_ENV = "WESFARMERS_EMULATOR"
+
+# Refresh access tokens this long before they expire so a review never starts
+# with a token that lapses mid-run.
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+
+@cache
+def load_environment() -> None:
+    """Load `.env` into the process environment once."""
+
+    load_dotenv()
 
 
 class CredentialsError(RuntimeError):
@@ -31,14 +57,15 @@ class GoogleApiSetupError(RuntimeError):
     """Raised when Google API clients cannot be created."""
 
 
-def load_credentials() -> Any:
+def load_credentials(scopes: tuple[str, ...] = SCOPES) -> Any:
     """Load credentials from service account JSON or ADC."""
 
+    load_environment()
     service_account_path = os.getenv(SERVICE_ACCOUNT_PATH_ENV)
     if service_account_path:
         creds = service_account.Credentials.from_service_account_file(
             service_account_path,
-            scopes=SCOPES,
+            scopes=scopes,
         )
         delegated_user = os.getenv(DELEGATED_USER_ENV)
         if delegated_user:
@@ -46,7 +73,7 @@ def load_credentials() -> Any:
         return creds
 
     try:
-        creds, _ = google.auth.default(scopes=SCOPES)
+        creds, _ = google.auth.default(scopes=scopes)
     except DefaultCredentialsError as exc:
         raise CredentialsError(
             "No Google credentials found. Set GOOGLE_SERVICE_ACCOUNT_JSON or run "
@@ -61,15 +88,189 @@ def load_credentials() -> Any:
     return creds
 
 
+def thread_local_request_builder(credentials: Any) -> Any:
+    """Return a `requestBuilder` that gives each thread its own HTTP transport.
+
+    httplib2 connections are not thread-safe, so a client shared by concurrent
+    workflow phases must not share one `Http` object across threads. Each
+    request's socket timeout follows the active review deadline.
+    """
+
+    local = threading.local()
+
+    def _build_request(_http: Any, *args: Any, **kwargs: Any) -> HttpRequest:
+        transport = getattr(local, "http", None)
+        if transport is None:
+            transport = local.http = AuthorizedHttp(credentials, http=MeteredHttp(DeadlineHttp(httplib2.Http())))
+        return HttpRequest(transport, *args, **kwargs)
+
+    return _build_request
+
+
 def build_slides_service(credentials: Any) -> Any:
     try:
-        return build("slides", "v1", credentials=credentials, cache_discovery=False)
-    except GoogleAPIError as exc:
+        return build_from_document(
+            load_discovery_document("slides", "v1"),
+            credentials=credentials,
+            requestBuilder=thread_local_request_builder(credentials),
+        )
+    except (GoogleAPIError, DiscoveryDocumentError) as exc:
         raise GoogleApiSetupError(f"Unable to create Google Slides client: {exc}") from exc
 
 
 def build_drive_service(credentials: Any) -> Any:
     try:
-        return build("drive", "v3", credentials=credentials, cache_discovery=False)
-    except GoogleAPIError as exc:
+        return build_from_document(
+            load_discovery_document("drive", "v3"),
+            credentials=credentials,
+            requestBuilder=thread_local_request_builder(credentials),
+        )
+    except (GoogleAPIError, DiscoveryDocumentError) as exc:
         raise GoogleApiSetupError(f"Unable to create Google Drive client: {exc}") from exc
+
+
+def credential_identity() -> str:
+    """Describe which credential source `load_credentials` would use."""
+
+    load_environment()
+    service_account_path = os.getenv(SERVICE_ACCOUNT_PATH_ENV)
+    if service_account_path:
+        subject = os.getenv(DELEGATED_USER_ENV, "")
+        return f"service_account:{os.path.abspath(service_account_path)}:{subject}"
+    return f"adc:{os.getenv(ADC_PATH_ENV, '')}"
+
+
+def credential_principal(credentials: Any) -> str:
+    """Email of the account `credentials` act as, with the delegated user after `>`.
+
+    Falls back to `credential_identity()` for credential types without an email.
+    """
+
+    if credentials is None:
+        return ""
+    parts = (
+        getattr(credentials, "service_account_email", None) or getattr(credentials, "account", None),
+        getattr(credentials, "_subject", None),
+    )
+    return ">".join(part for part in parts if part) or credential_identity()
+
+
+def _needs_refresh(credentials: Any) -> bool:
+    if not getattr(credentials, "token", None):
+        return True
+    expiry = getattr(credentials, "expiry", None)
+    if expiry is None:
+        return False
+    # google-auth stores expiry as a naive UTC datetime.
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    return expiry - now <= TOKEN_REFRESH_MARGIN
+
+
+@dataclass
+class GoogleClients:
+    credentials: Any
+    slides: Any
+    drive: Any
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def principal(self) -> str:
+        """The account these clients act as; per-account caches key on it."""
+
+        return credential_principal(self.credentials)
+
+    def ensure_fresh(self) -> None:
+        """Refresh the access token if it is missing or close to expiry."""
+
+        with self.lock:
+            if _needs_refresh(self.credentials):
+                with span("token_refresh"):
+                    self.credentials.refresh(HttplibAuthRequest(httplib2.Http()))
+
+
+class ClientRegistry:
+    """Process-wide cache of credentials and Slides/Drive clients.
+
+    Entries are keyed by credential identity and scopes, so changing
+    `GOOGLE_SERVICE_ACCOUNT_JSON` or the delegated user yields a fresh entry.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._key_locks: dict[tuple[str, tuple[str, ...]], threading.Lock] = {}
+        self._entries: dict[tuple[str, tuple[str, ...]], GoogleClients] = {}
+
+    def get(self, scopes: tuple[str, ...] = SCOPES) -> GoogleClients:
+        key = (credential_identity(), tuple(scopes))
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Building clients can hit the network, so only callers that want the
+        # same entry wait on each other.
+        with key_lock:
+            clients = self._entries.get(key)
+            if clients is None:
+                with span("credential_load"):
+                    credentials = load_credentials(scopes)
+                with span("client_build"):
+                    clients = GoogleClients(
+                        credentials=credentials,
+                        slides=build_slides_service(credentials),
+                        drive=build_drive_service(credentials),
+                    )
+                self._entries[key] = clients
+
+        clients.ensure_fresh()
+        return clients
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+
+
+CLIENT_REGISTRY = ClientRegistry()
+
+_clients_override: GoogleClients | None = None
+
+
+def set_clients_override(clients: GoogleClients | None) -> None:
+    """Serve `clients` from `get_clients` instead of the registry (None restores it)."""
+
+    global _clients_override
+    _clients_override = clients
+
+
+def emulator_requested() -> bool:
+    load_environment()
+    return os.getenv(EMULATOR_ENV, "").strip().lower() in {"1", "true", "yes"}
+
+
+def get_clients(scopes: tuple[str, ...] = SCOPES) -> GoogleClients:
+    """Return shared, token-fresh Slides/Drive clients for the current identity.
+
+    With `WESFARMERS_EMULATOR=1` the local Slides/Drive emulator is installed
+    on first use and no credentials are loaded.
+    """
+
+    if _clients_override is None and emulator_requested():
+        from .emulator import install_emulator
+
+        install_emulator()
+    if _clients_override is not None:
+        return _clients_override
+    return CLIENT_REGISTRY.get(scopes)
+
+
+def warm_up_clients_in_background() -> threading.Thread:
+    """Resolve clients on a daemon thread so the first review skips setup."""
+
+    def _warm_up() -> None:
+        try:
+            get_clients()
+        except Exception as exc:  # pragma: no cover - surfaced again on first real call.
+            logger.warning("Google client warm-up failed: %s", exc)
+
+    thread = threading.Thread(target=_warm_up, name="google-client-warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,475 @@
+"""Spans, API counters and local exporters for review runs."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import secrets
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol, TextIO
+
+logger = logging.getLogger(__name__)
+
+TELEMETRY_ENV = "WESFARMERS_TELEMETRY"
+SERVICE_NAME = "wesfarmers-slide-reviewer"
+
+
+@dataclass
+class Span:
+    name: str
+    trace: Trace = field(repr=False)
+    span_id: str
+    parent_id: str | None
+    start_unix_ns: int
+    attributes: dict[str, Any] = field(default_factory=dict)
+    end_unix_ns: int = 0
+    duration_ms: float = 0.0
+    cpu_ms: float = 0.0
+    requests: int = 0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    retries: int = 0
+    hedges: int = 0
+    status: str = "ok"
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_unix_ns": self.start_unix_ns,
+            "duration_ms": self.duration_ms,
+            "cpu_ms": self.cpu_ms,
+            "requests": self.requests,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "status": self.status,
+            "attributes": dict(self.attributes),
+        }
+
+
+class Trace:
+    """All spans recorded for one review run.
+
+    Spans may be opened from several phase threads at once; counter updates
+    go through the trace lock.
+    """
+
+    def __init__(self, name: str, attributes: dict[str, Any]) -> None:
+        self.trace_id = secrets.token_hex(16)
+        self.lock = threading.Lock()
+        self.root = Span(
+            name=name,
+            trace=self,
+            span_id=secrets.token_hex(8),
+            parent_id=None,
+            start_unix_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        self.spans: list[Span] = [self.root]
+
+    def _open(self, name: str, parent: Span, attributes: dict[str, Any]) -> Span:
+        child = Span(
+            name=name,
+            trace=self,
+            span_id=secrets.token_hex(8),
+            parent_id=parent.span_id,
+            start_unix_ns=time.time_ns(),
+            attributes=attributes,
+        )
+        with self.lock:
+            self.spans.append(child)
+        return child
+
+    def summary(self) -> dict[str, Any]:
+        """Compact latency and traffic totals, suitable for a tool response."""
+
+        spans_ms: dict[str, float] = {}
+        for item in self.spans[1:]:
+            spans_ms[item.name] = round(spans_ms.get(item.name, 0.0) + item.duration_ms, 2)
+        return {
+            "total_ms": self.root.duration_ms,
+            "spans_ms": spans_ms,
+            "api_requests": sum(item.requests for item in self.spans),
+            "retries": sum(item.retries for item in self.spans),
+            "hedged_requests": sum(item.hedges for item in self.spans),
+            "request_bytes": sum(item.request_bytes for item in self.spans),
+            "response_bytes": sum(item.response_bytes for item in self.spans),
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "name": self.root.name,
+            "status": self.root.status,
+            "summary": self.summary(),
+            "spans": [item.as_dict() for item in self.spans],
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar("wesfarmers_current_span", default=None)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def _close(item: Span, started: int, cpu_started: int, cpu_clock: Callable[[], int], failed: bool) -> None:
+    elapsed_ns = time.perf_counter_ns() - started
+    item.duration_ms = round(elapsed_ns / 1e6, 2)
+    item.cpu_ms = round((cpu_clock() - cpu_started) / 1e6, 2)
+    item.end_unix_ns = item.start_unix_ns + elapsed_ns
+    if failed:
+        item.status = "error"
+
+
+@contextmanager
+def span(name: str, trace: Trace | None = None, **attributes: Any) -> Iterator[Span | None]:
+    """Time a block as a child of the current span.
+
+    Pass `trace` when calling from a thread with no current span, such as a
+    phase worker; the span is then parented to the trace root. Without an
+    active trace (e.g. background warm-up) this is a no-op. CPU time is that
+    of the calling thread.
+    """
+
+    parent = _current_span.get()
+    if trace is None:
+        if parent is None:
+            yield None
+            return
+        trace = parent.trace
+    elif parent is None or parent.trace is not trace:
+        parent = trace.root
+
+    item = trace._open(name, parent, attributes)
+    token = _current_span.set(item)
+    started = time.perf_counter_ns()
+    cpu_started = time.thread_time_ns()
+    failed = False
+    try:
+        yield item
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _current_span.reset(token)
+        _close(item, started, cpu_started, time.thread_time_ns, failed)
+
+
+@contextmanager
+def start_trace(name: str, **attributes: Any) -> Iterator[Trace]:
+    """Open a trace, make its root span current, and export it on exit.
+
+    The root span's CPU time is process-wide, so it includes phase threads.
+    """
+
+    trace = Trace(name, attributes)
+    token = _current_span.set(trace.root)
+    started = time.perf_counter_ns()
+    cpu_started = time.process_time_ns()
+    failed = False
+    try:
+        yield trace
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        _current_span.reset(token)
+        _close(trace.root, started, cpu_started, time.process_time_ns, failed)
+        export(trace)
+
+
+def _record(**counters: int) -> None:
+    item = _current_span.get()
+    if item is None:
+        return
+    with item.trace.lock:
+        for name, value in counters.items():
+            setattr(item, name, getattr(item, name) + value)
+
+
+def record_api_call(calls: int = 1) -> None:
+    """Count API calls sent from the current span (one per call inside a batch)."""
+
+    _record(requests=calls)
+
+
+def record_retry(count: int = 1) -> None:
+    _record(retries=count)
+
+
+def record_hedge(count: int = 1) -> None:
+    _record(hedges=count)
+
+
+def record_io(request_bytes: int = 0, response_bytes: int = 0) -> None:
+    _record(request_bytes=request_bytes, response_bytes=response_bytes)
+
+
+class MeteredHttp:
+    """Wrap an httplib2-compatible transport and record body sizes on the current span.
+
+    Sizes are taken at the transport, so a batch HTTP request is measured as
+    the single multipart round-trip actually sent.
+    """
+
+    def __init__(self, http: Any) -> None:
+        self._http = http
+
+    def request(self, uri: str, method: str = "GET", body: Any = None, *args: Any, **kwargs: Any) -> Any:
+        response, content = self._http.request(uri, method, body, *args, **kwargs)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        record_io(
+            request_bytes=len(body) if body else 0,
+            response_bytes=len(content) if content else 0,
+        )
+        return response, content
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._http, name)
+
+
+# -- Exporters -----------------------------------------------------------------
+
+
+class Exporter(Protocol):
+    def export(self, trace: Trace) -> None: ...
+
+
+class StdoutJsonExporter:
+    """Print each finished trace as one JSON line.
+
+    Writes to stderr unless given a stream: `run` and `run-batch` print their
+    own JSON results on stdout.
+    """
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps({"telemetry": trace.as_dict()})
+        with self._lock:
+            print(line, file=self._stream or sys.stderr, flush=True)
+
+
+class PrometheusTextfileExporter:
+    """Rewrite a node_exporter textfile with totals accumulated in this process."""
+
+    _METRICS = (
+        ("span_duration_seconds_total", "Total time spent in each span.", "counter"),
+        ("spans_total", "Number of finished spans.", "counter"),
+        ("api_requests_total", "Google API calls sent.", "counter"),
+        ("api_request_bytes_total", "Request body bytes sent.", "counter"),
+        ("api_response_bytes_total", "Response body bytes received.", "counter"),
+        ("api_retries_total", "Google API calls retried.", "counter"),
+        ("api_hedges_total", "Hedged duplicate reads sent.", "counter"),
+    )
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._totals: dict[tuple[str, str], float] = {}
+        self._reviews: dict[str, int] = {}
+
+    def export(self, trace: Trace) -> None:
+        with self._lock:
+            self._reviews[trace.root.status] = self._reviews.get(trace.root.status, 0) + 1
+            for item in trace.spans:
+                for metric, value in (
+                    ("span_duration_seconds_total", item.duration_ms / 1000),
+                    ("spans_total", 1),
+                    ("api_requests_total", item.requests),
+                    ("api_request_bytes_total", item.request_bytes),
+                    ("api_response_bytes_total", item.response_bytes),
+                    ("api_retries_total", item.retries),
+                    ("api_hedges_total", item.hedges),
+                ):
+                    key = (metric, item.name)
+                    self._totals[key] = self._totals.get(key, 0) + value
+            text = self._render()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        staging = self.path.with_name(self.path.name + ".tmp")
+        staging.write_text(text, encoding="utf-8")
+        os.replace(staging, self.path)
+
+    def _render(self) -> str:
+        lines = [
+            "# HELP wesfarmers_reviews_total Review runs by final status.",
+            "# TYPE wesfarmers_reviews_total counter",
+        ]
+        lines.extend(
+            f'wesfarmers_reviews_total{{status="{status}"}} {count}'
+            for status, count in sorted(self._reviews.items())
+        )
+        for metric, help_text, metric_type in self._METRICS:
+            lines.append(f"# HELP wesfarmers_{metric} {help_text}")
+            lines.append(f"# TYPE wesfarmers_{metric} {metric_type}")
+            lines.extend(
+                f'wesfarmers_{metric}{{span="{name}"}} {value:g}'
+                for (key, name), value in sorted(self._totals.items())
+                if key == metric
+            )
+        return "\n".join(lines) + "\n"
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(values: dict[str, Any]) -> list[dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in values.items()]
+
+
+def otlp_payload(trace: Trace) -> dict[str, Any]:
+    """Render a trace as an OTLP/JSON `ExportTraceServiceRequest`."""
+
+    spans = []
+    for item in trace.spans:
+        otlp_span: dict[str, Any] = {
+            "traceId": trace.trace_id,
+            "spanId": item.span_id,
+            "name": item.name,
+            "kind": 1,
+            "startTimeUnixNano": str(item.start_unix_ns),
+            "endTimeUnixNano": str(item.end_unix_ns),
+            "attributes": _otlp_attributes(
+                {
+                    **item.attributes,
+                    "api.requests": item.requests,
+                    "api.request_bytes": item.request_bytes,
+                    "api.response_bytes": item.response_bytes,
+                    "api.retries": item.retries,
+                    "api.hedges": item.hedges,
+                }
+            ),
+            "status": {"code": 2 if item.status == "error" else 1},
+        }
+        if item.parent_id:
+            otlp_span["parentSpanId"] = item.parent_id
+        spans.append(otlp_span)
+
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+                "scopeSpans": [{"scope": {"name": __package__ or SERVICE_NAME}, "spans": spans}],
+            }
+        ]
+    }
+
+
+class OtlpJsonFileExporter:
+    """Append one OTLP/JSON request per trace, as the collector's file exporter does."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        line = json.dumps(otlp_payload(trace), separators=(",", ":"))
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(line + "\n")
+
+
+_exporters: list[Exporter] = []
+_exporters_lock = threading.Lock()
+_env_loaded = False
+
+
+def _parse_exporter_entries(spec: str) -> tuple[list[Exporter], list[str]]:
+    exporters: list[Exporter] = []
+    invalid: list[str] = []
+    for entry in spec.split(","):
+        kind, _, target = entry.strip().partition("=")
+        kind = kind.strip().lower()
+        if not kind:
+            continue
+        if kind == "stdout":
+            exporters.append(StdoutJsonExporter())
+        elif kind == "prometheus" and target:
+            exporters.append(PrometheusTextfileExporter(target.strip()))
+        elif kind == "otlp" and target:
+            exporters.append(OtlpJsonFileExporter(target.strip()))
+        else:
+            invalid.append(entry.strip())
+    return exporters, invalid
+
+
+def parse_exporter_spec(spec: str) -> list[Exporter]:
+    """Build exporters from e.g. `stdout,prometheus=/tmp/review.prom,otlp=traces.jsonl`."""
+
+    exporters, invalid = _parse_exporter_entries(spec)
+    if invalid:
+        raise ValueError(
+            f"Unknown telemetry exporter '{invalid[0]}'. "
+            "Use stdout, prometheus=<path> or otlp=<path>."
+        )
+    return exporters
+
+
+def register_exporter(exporter: Exporter) -> None:
+    with _exporters_lock:
+        _exporters.append(exporter)
+
+
+def unregister_exporter(exporter: Exporter) -> None:
+    with _exporters_lock:
+        if exporter in _exporters:
+            _exporters.remove(exporter)
+
+
+def clear_exporters() -> None:
+    global _env_loaded
+    with _exporters_lock:
+        _exporters.clear()
+        _env_loaded = True
+
+
+def _active_exporters() -> list[Exporter]:
+    global _env_loaded
+    with _exporters_lock:
+        if not _env_loaded:
+            # Telemetry is optional: a bad entry is logged once and skipped
+            # rather than failing the review. `selfcheck` reports it.
+            exporters, invalid = _parse_exporter_entries(os.getenv(TELEMETRY_ENV, ""))
+            for entry in invalid:
+                logger.warning(
+                    "Ignoring unknown %s exporter '%s'. Use stdout, prometheus=<path> or otlp=<path>.",
+                    TELEMETRY_ENV,
+                    entry,
+                )
+            _exporters.extend(exporters)
+            _env_loaded = True
+        return list(_exporters)
+
+
+def export(trace: Trace) -> None:
+    """Send a finished trace to every exporter; exporter failures are logged, not raised."""
+
+    for exporter in _active_exporters():
+        try:
+            exporter.export(trace)
+        except Exception as exc:
+            logger.warning("Telemetry exporter %s failed: %s", type(exporter).__name__, exc)
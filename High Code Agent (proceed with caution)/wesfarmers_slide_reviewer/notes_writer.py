@@ -0,0 +1,136 @@
+"""Streams speaker-notes writes to Slides in bounded, adaptive batches."""
+
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .api_execution import is_retryable
+from .deadlines import DeadlineExceededError
+from .deck_snapshot import DeckChangedError
+from .request_optimizer import BATCH_BODY_OVERHEAD_BYTES, batch_entry_size, batch_max_bytes
+
+NOTES_BATCH_SLIDES_ENV = "WESFARMERS_NOTES_BATCH_SLIDES"
+DEFAULT_NOTES_BATCH_SLIDES = 50
+
+
+@dataclass(frozen=True)
+class NoteWrite:
+    """The requests that replace one slide's speaker notes."""
+
+    slide_object_id: str
+    notes_object_id: str
+    text: str
+    requests: tuple[dict[str, Any], ...]
+    summary: dict[str, str]
+    size: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "size", sum(batch_entry_size(request) for request in self.requests))
+
+
+@dataclass
+class NotesProgress:
+    """Checkpoint of a notes write: which slides are done, in write order."""
+
+    written: list[str] = field(default_factory=list)
+    batches: int = 0
+    split_batches: int = 0
+    elapsed_s: float = 0.0
+
+    @property
+    def slides_per_sec(self) -> float:
+        return round(len(self.written) / self.elapsed_s, 1) if self.elapsed_s else 0.0
+
+
+class NotesWriteInterrupted(RuntimeError):
+    """Raised when a notes batch cannot be written; earlier batches stay written."""
+
+    def __init__(self, progress: NotesProgress, cause: BaseException) -> None:
+        super().__init__(
+            f"Speaker notes stopped after {len(progress.written)} slides in {progress.batches} batches: "
+            f"{cause}. Written slides carry their fingerprint, so a rerun resumes with the rest."
+        )
+        self.progress = progress
+
+
+def notes_batch_slides() -> int:
+    """Most slides per notes batch, from `WESFARMERS_NOTES_BATCH_SLIDES`."""
+
+    try:
+        return max(1, int(os.environ[NOTES_BATCH_SLIDES_ENV]))
+    except (KeyError, ValueError):
+        return DEFAULT_NOTES_BATCH_SLIDES
+
+
+def write_notes(
+    writes: Iterable[NoteWrite],
+    send: Callable[[list[dict[str, Any]]], Any],
+    on_batch: Callable[[list[NoteWrite], NotesProgress], None] | None = None,
+    max_slides: int | None = None,
+    max_bytes: int | None = None,
+    pinned: Callable[[], bool] | None = None,
+) -> NotesProgress:
+    """Send `writes` in batches of at most `max_slides` slides and `max_bytes` bytes.
+
+    `writes` is consumed lazily, so only one batch of notes text is held at a
+    time. `on_batch` runs after each batch is written. A batch that still
+    fails after `execute`'s retries with a retryable error is resent in
+    halves, and the batch size grows back after each success. `pinned` says
+    whether the next send is pinned to a deck revision, which makes a
+    resend of an applied batch fail instead of inserting the notes twice;
+    an unpinned batch is only resent when it cannot have been applied (see
+    `is_retryable`). Running out of the review deadline raises
+    `DeadlineExceededError` and a concurrent edit `DeckChangedError`; any
+    other failure raises `NotesWriteInterrupted`.
+    """
+
+    max_slides = max_slides or notes_batch_slides()
+    max_bytes = max_bytes or batch_max_bytes()
+    progress = NotesProgress()
+    pending: deque[NoteWrite] = deque()
+    source = iter(writes)
+    limit = max_slides
+    started = time.perf_counter()
+
+    try:
+        while True:
+            batch: list[NoteWrite] = []
+            size = BATCH_BODY_OVERHEAD_BYTES
+            while len(batch) < limit:
+                item = pending.popleft() if pending else next(source, None)
+                if item is None:
+                    break
+                if batch and size + item.size > max_bytes:
+                    pending.appendleft(item)
+                    break
+                batch.append(item)
+                size += item.size
+            if not batch:
+                break
+
+            resend_safe = pinned is not None and pinned()
+            try:
+                send([request for item in batch for request in item.requests])
+            except (DeadlineExceededError, DeckChangedError):
+                raise
+            except Exception as exc:
+                if len(batch) == 1 or not is_retryable(exc, idempotent=resend_safe):
+                    raise NotesWriteInterrupted(progress, exc) from exc
+                pending.extendleft(reversed(batch))
+                limit = max(1, len(batch) // 2)
+                progress.split_batches += 1
+                continue
+
+            progress.batches += 1
+            progress.written.extend(item.slide_object_id for item in batch)
+            if on_batch is not None:
+                on_batch(batch, progress)
+            limit = min(max_slides, limit * 2)
+    finally:
+        progress.elapsed_s = time.perf_counter() - started
+    return progress
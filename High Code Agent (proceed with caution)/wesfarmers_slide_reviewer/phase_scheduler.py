@@ -0,0 +1,198 @@
+"""Run workflow phases concurrently while respecting declared dependencies."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any
+
+from .deadlines import Deadline, DeadlineExceededError, deadline_scope
+
+DEFAULT_PHASE_WORKERS = 3
+# Threads shared by every run in the process. Each thread keeps its own
+# authorized HTTP transport (see `google_clients.thread_local_request_builder`),
+# so reusing threads across runs reuses their connections too.
+PHASE_POOL_WORKERS = 16
+
+_phase_executor: ThreadPoolExecutor | None = None
+_phase_executor_lock = threading.Lock()
+
+
+class PhaseGraphError(ValueError):
+    """Raised when phase dependencies are unknown or cyclic."""
+
+
+class PhaseCancelledError(RuntimeError):
+    """Raised when a run is cancelled before all phases have started."""
+
+
+@dataclass(frozen=True)
+class Phase:
+    """One unit of workflow work.
+
+    `run` receives the results of every completed phase, keyed by name, so a
+    phase can read what its dependencies produced. Under a deadline, an
+    `optional` phase is skipped (its result is None) when less than
+    `min_budget_s` remains at its start, when the deadline cuts it short, or
+    when a phase it depends on was skipped.
+    """
+
+    name: str
+    run: Callable[[Mapping[str, Any]], Any]
+    depends_on: tuple[str, ...] = ()
+    optional: bool = False
+    min_budget_s: float = 0.0
+
+
+@dataclass
+class PhaseRun:
+    results: dict[str, Any] = field(default_factory=dict)
+    timings: dict[str, dict[str, float]] = field(default_factory=dict)
+    wall_ms: float = 0.0
+    skipped: list[str] = field(default_factory=list)
+    # Phases that completed after the deadline had passed.
+    late: list[str] = field(default_factory=list)
+
+    def timing_summary(self) -> dict[str, Any]:
+        return {
+            "wall_ms": self.wall_ms,
+            "phases": self.timings,
+            "sum_of_phases_ms": round(sum(t["duration_ms"] for t in self.timings.values()), 2),
+            "skipped": self.skipped,
+            "late": self.late,
+        }
+
+
+def _validate(phases: Sequence[Phase]) -> None:
+    names = {phase.name for phase in phases}
+    if len(names) != len(phases):
+        raise PhaseGraphError("Phase names must be unique.")
+
+    for phase in phases:
+        missing = set(phase.depends_on) - names
+        if missing:
+            raise PhaseGraphError(f"Phase '{phase.name}' depends on unknown phases: {sorted(missing)}")
+
+    resolved: set[str] = set()
+    remaining = list(phases)
+    while remaining:
+        ready = [phase for phase in remaining if set(phase.depends_on) <= resolved]
+        if not ready:
+            raise PhaseGraphError(
+                "Phase dependencies form a cycle: " + ", ".join(p.name for p in remaining)
+            )
+        resolved.update(phase.name for phase in ready)
+        remaining = [phase for phase in remaining if phase.name not in resolved]
+
+
+def _phase_pool() -> ThreadPoolExecutor:
+    global _phase_executor
+    with _phase_executor_lock:
+        if _phase_executor is None:
+            _phase_executor = ThreadPoolExecutor(max_workers=PHASE_POOL_WORKERS, thread_name_prefix="review-phase")
+        return _phase_executor
+
+
+def shutdown_phase_pool() -> None:
+    """Stop the phase threads once running phases finish; the next run starts a new pool."""
+
+    global _phase_executor
+    with _phase_executor_lock:
+        executor, _phase_executor = _phase_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def run_phases(
+    phases: Sequence[Phase],
+    max_workers: int = DEFAULT_PHASE_WORKERS,
+    cancel_event: threading.Event | None = None,
+    deadline: Deadline | None = None,
+) -> PhaseRun:
+    """Run phases as soon as their dependencies finish, `max_workers` at a time.
+
+    Phases run on a process-wide thread pool that outlives the run, so later
+    runs reuse its threads and their HTTP connections. The first phase to
+    raise, or `cancel_event` being set, stops new phases from starting;
+    phases already running are allowed to finish before the exception is
+    re-raised. `deadline` applies to the API calls each phase makes (see
+    `deadlines`).
+    """
+
+    _validate(phases)
+    outcome = PhaseRun()
+    by_name = {phase.name: phase for phase in phases}
+    pending = dict(by_name)
+    running: dict[Future[Any], str] = {}
+    started = time.perf_counter()
+    failure: BaseException | None = None
+
+    def _timed(phase: Phase, snapshot: dict[str, Any]) -> tuple[Any, float, float, bool]:
+        phase_start = time.perf_counter()
+        with deadline_scope(deadline):
+            result = phase.run(snapshot)
+        return result, phase_start, time.perf_counter(), deadline is not None and deadline.expired()
+
+    def _skip(phase: Phase) -> bool:
+        if not phase.optional or deadline is None:
+            return False
+        if any(dep in outcome.skipped for dep in phase.depends_on):
+            return True
+        return deadline.remaining() < phase.min_budget_s
+
+    pool = _phase_pool()
+    max_workers = max(1, max_workers)
+    while pending or running:
+        if failure is None and cancel_event is not None and cancel_event.is_set():
+            failure = PhaseCancelledError(
+                "Review cancelled before phases completed: " + ", ".join(sorted(pending))
+            )
+        ready = failure is None
+        while ready:
+            ready = False
+            for name, phase in list(pending.items()):
+                if len(running) >= max_workers:
+                    break
+                if all(dep in outcome.results for dep in phase.depends_on):
+                    del pending[name]
+                    if _skip(phase):
+                        # A skip can make further phases ready right away.
+                        outcome.results[name] = None
+                        outcome.skipped.append(name)
+                        ready = True
+                        continue
+                    running[pool.submit(_timed, phase, dict(outcome.results))] = name
+
+        if not running:
+            break
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = running.pop(future)
+            try:
+                result, phase_start, phase_end, late = future.result()
+            except DeadlineExceededError as exc:
+                if by_name[name].optional:
+                    outcome.results[name] = None
+                    outcome.skipped.append(name)
+                else:
+                    failure = failure or exc
+                continue
+            except BaseException as exc:
+                failure = failure or exc
+                continue
+            outcome.results[name] = result
+            if late:
+                outcome.late.append(name)
+            outcome.timings[name] = {
+                "start_ms": round((phase_start - started) * 1000, 2),
+                "duration_ms": round((phase_end - phase_start) * 1000, 2),
+            }
+
+    outcome.wall_ms = round((time.perf_counter() - started) * 1000, 2)
+    if failure is not None:
+        raise failure
+    return outcome
@@ -0,0 +1,172 @@
+"""CPU and memory profiling for a single review run."""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import json
+import logging
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from .api_execution import shutdown_hedge_pool
+from .instrumentation import Trace, register_exporter, unregister_exporter
+from .phase_scheduler import shutdown_phase_pool
+
+logger = logging.getLogger(__name__)
+DEFAULT_PROFILE_DIR = "profiles"
+DEFAULT_TOP_N = 25
+
+
+class _ThreadProfiles:
+    """Give every thread started while installed its own `cProfile.Profile`.
+
+    cProfile only sees the thread that enabled it, and workflow phases run on
+    a pool, so each new thread enables a profiler on its first profiling
+    event; the profiles are merged when the run ends.
+
+    A profiler can only be switched off from its own thread, so `uninstall`
+    stops the persistent phase and hedged-read pools; their threads exit and
+    take their profilers with them, and later runs start unprofiled threads.
+    """
+
+    def __init__(self) -> None:
+        self.profiles: list[cProfile.Profile] = []
+        self.threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def _start(self, *_: Any) -> None:
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.append(profile)
+            self.threads.append(threading.current_thread())
+        profile.enable()
+
+    def install(self) -> None:
+        threading.setprofile(self._start)
+
+    def uninstall(self) -> None:
+        threading.setprofile(None)
+        shutdown_phase_pool()
+        shutdown_hedge_pool()
+        for profile in self.profiles:
+            profile.disable()
+        still_profiled = [thread.name for thread in self.threads if thread.is_alive()]
+        if still_profiled:
+            logger.warning("Profilers stay enabled on threads that outlived the run: %s", ", ".join(still_profiled))
+
+
+class _TraceCollector:
+    def __init__(self) -> None:
+        self.traces: list[Trace] = []
+
+    def export(self, trace: Trace) -> None:
+        self.traces.append(trace)
+
+
+def _phase_times(traces: list[Trace]) -> dict[str, Any]:
+    phases: dict[str, dict[str, float]] = {}
+    for trace in traces:
+        for item in trace.spans:
+            entry = phases.setdefault(item.name, {"wall_ms": 0.0, "cpu_ms": 0.0})
+            entry["wall_ms"] = round(entry["wall_ms"] + item.duration_ms, 2)
+            entry["cpu_ms"] = round(entry["cpu_ms"] + item.cpu_ms, 2)
+    return phases
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, top_n: int) -> list[dict[str, Any]]:
+    return [
+        {
+            "location": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+            "size_kib": round(stat.size / 1024, 2),
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top_n]
+    ]
+
+
+def _slug(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", value)[:80] or "run"
+
+
+def profile_run(
+    run: Callable[[], dict[str, Any]],
+    label: str,
+    output_dir: str | Path = DEFAULT_PROFILE_DIR,
+    top_n: int = DEFAULT_TOP_N,
+) -> dict[str, Any]:
+    """Run `run()` under cProfile and tracemalloc and write the artefacts to disk.
+
+    Writes `result.json`, `profile.pstats` (open with `python -m pstats` or
+    snakeviz), `profile.txt`, `tracemalloc.txt` and `phases.json` into a new
+    directory under `output_dir`, and adds a `profile` section to the result.
+    Wall times include profiler overhead.
+    """
+
+    target = Path(output_dir) / f"{_slug(label)}-{time.strftime('%Y%m%dT%H%M%S')}"
+    target.mkdir(parents=True, exist_ok=True)
+
+    collector = _TraceCollector()
+    threads = _ThreadProfiles()
+    main_profile = cProfile.Profile()
+
+    register_exporter(collector)
+    tracemalloc.start()
+    threads.install()
+    main_profile.enable()
+    try:
+        result = run()
+    finally:
+        main_profile.disable()
+        threads.uninstall()
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        unregister_exporter(collector)
+
+    stats = pstats.Stats(main_profile)
+    for profile in threads.profiles:
+        stats.add(profile)
+    stats.dump_stats(target / "profile.pstats")
+    threads_profiled = 1 + len(threads.profiles)
+    threads.profiles.clear()
+    threads.threads.clear()
+
+    report = io.StringIO()
+    pstats.Stats(str(target / "profile.pstats"), stream=report).sort_stats("cumulative").print_stats(top_n)
+    (target / "profile.txt").write_text(report.getvalue(), encoding="utf-8")
+
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ]
+    )
+    allocations = _top_allocations(snapshot, top_n)
+    (target / "tracemalloc.txt").write_text(
+        "".join(f"{item['location']}: {item['size_kib']} KiB in {item['count']} blocks\n" for item in allocations),
+        encoding="utf-8",
+    )
+
+    phases = _phase_times(collector.traces)
+    (target / "phases.json").write_text(json.dumps(phases, indent=2) + "\n", encoding="utf-8")
+
+    result = {
+        **result,
+        "profile": {
+            "directory": str(target),
+            "threads_profiled": threads_profiled,
+            "peak_traced_kib": round(peak / 1024, 2),
+            "phases": phases,
+            "top_allocations": allocations[:5],
+        },
+    }
+    (target / "result.json").write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    return result
@@ -0,0 +1,350 @@
+"""Equivalence-preserving rewrites of Slides batchUpdate request lists.
+
+`optimize_requests` only merges requests the API accepts in merged form:
+
+- consecutive `updateTableColumnProperties` on one table become one request
+  per distinct column setting, with the columns listed in `columnIndices`;
+- consecutive single-cell `updateTableCellProperties` on one table become one
+  request per rectangle of identical cells, using `tableRange`;
+- repeated `updateTextStyle` / `updateParagraphStyle` on the same text become
+  one request whose mask is the union of theirs;
+- field masks lose duplicate paths and paths covered by a listed parent;
+- an update that repeats the request just before it is dropped.
+
+`updateTextStyle` addresses one table cell at a time (`cellLocation`), so
+per-cell text styles cannot be folded into row or table ranges.
+
+Batch replies line up with the optimized list, not the original one.
+
+`chunk_requests` then splits a list, in order, into batches whose JSON body
+stays under `batch_max_bytes()`.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Iterable
+from typing import Any
+
+BATCH_MAX_BYTES_ENV = "WESFARMERS_BATCH_MAX_BYTES"
+DEFAULT_BATCH_MAX_BYTES = 256 * 1024
+# `{"requests": []}` plus a `writeControl` block.
+BATCH_BODY_OVERHEAD_BYTES = 128
+
+_STYLE_KINDS = frozenset({"updateTextStyle", "updateParagraphStyle"})
+
+# Requests that change nothing but the object (or table cell) named in their
+# payload. Anything else may touch other objects, so it ends every merge.
+_LOCAL_KINDS = frozenset(
+    {
+        "createShape",
+        "createTable",
+        "createParagraphBullets",
+        "deleteParagraphBullets",
+        "deleteText",
+        "insertText",
+        "updateShapeProperties",
+        "updateTableCellProperties",
+        "updateTableColumnProperties",
+        *_STYLE_KINDS,
+    }
+)
+
+# Setting the same properties twice in a row is the same as setting them once.
+_IDEMPOTENT_KINDS = frozenset(
+    {
+        "updatePageProperties",
+        "updateShapeProperties",
+        "updateTableCellProperties",
+        "updateTableColumnProperties",
+        *_STYLE_KINDS,
+    }
+)
+
+
+def _unpack(request: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    (kind, payload), = request.items()
+    return kind, payload
+
+
+def _key(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def normalize_fields_mask(mask: str) -> str:
+    """Drop blank and duplicate paths, and paths covered by a listed parent."""
+
+    paths = list(dict.fromkeys(part.strip() for part in mask.split(",") if part.strip()))
+    if "*" in paths:
+        return "*"
+    return ",".join(
+        path
+        for path in paths
+        if not any(path.startswith(parent + ".") for parent in paths if parent != path)
+    )
+
+
+def _normalize_fields(request: dict[str, Any]) -> dict[str, Any]:
+    kind, payload = _unpack(request)
+    mask = payload.get("fields")
+    if not isinstance(mask, str):
+        return request
+    normalized = normalize_fields_mask(mask)
+    if normalized == mask:
+        return request
+    return {kind: {**payload, "fields": normalized}}
+
+
+def _merge_styles(earlier: dict[str, Any], later: dict[str, Any]) -> dict[str, Any]:
+    """One style update equivalent to applying `earlier` then `later`.
+
+    A path in the mask without a value in `style` resets it, so only values
+    that are present are copied.
+    """
+
+    later_paths = later["fields"].split(",")
+    earlier_paths = [path for path in earlier["fields"].split(",") if path not in later_paths]
+    style = {
+        **{path: earlier["style"][path] for path in earlier_paths if path in earlier.get("style", {})},
+        **{path: later["style"][path] for path in later_paths if path in later.get("style", {})},
+    }
+    return {**earlier, "style": style, "fields": ",".join(earlier_paths + later_paths)}
+
+
+def _mergeable_mask(payload: dict[str, Any]) -> bool:
+    mask = payload.get("fields", "")
+    return bool(mask) and mask != "*" and "." not in mask
+
+
+def _merge_style_updates(requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    # (kind, objectId, cell, range) -> index in `out` of the last style update
+    # for that text that nothing since could have affected.
+    open_updates: dict[tuple[str, str, str, str], int] = {}
+
+    def close(object_id: str | None, cell: str | None) -> None:
+        for key in [key for key in open_updates if key[1] == object_id and (cell is None or key[2] == cell)]:
+            del open_updates[key]
+
+    for request in requests:
+        kind, payload = _unpack(request)
+        if kind not in _LOCAL_KINDS:
+            open_updates.clear()
+            out.append(request)
+            continue
+
+        object_id = payload.get("objectId")
+        cell = _key(payload["cellLocation"]) if "cellLocation" in payload else None
+        if kind not in _STYLE_KINDS:
+            close(object_id, cell)
+            out.append(request)
+            continue
+
+        key = (kind, object_id, cell or "", _key(payload.get("textRange")))
+        index = open_updates.get(key)
+        if index is not None and _mergeable_mask(payload) and _mergeable_mask(out[index][kind]):
+            out[index] = {kind: _merge_styles(out[index][kind], payload)}
+            continue
+
+        # An update on an overlapping range of the same text must stay ordered.
+        close(object_id, cell or "")
+        open_updates[key] = len(out)
+        out.append(request)
+    return out
+
+
+def _column_updates(run: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+    """Merge a run of `updateTableColumnProperties`, or None to keep it as is."""
+
+    tables: dict[str, dict[str, Any]] = {}
+    for request in run:
+        payload = request["updateTableColumnProperties"]
+        if not payload.get("columnIndices"):
+            return None
+        table = tables.setdefault(payload["objectId"], {"fields": payload.get("fields"), "columns": {}})
+        if table["fields"] != payload.get("fields"):
+            return None
+        for column in payload["columnIndices"]:
+            table["columns"].pop(column, None)
+            table["columns"][column] = payload.get("tableColumnProperties", {})
+
+    merged: list[dict[str, Any]] = []
+    for object_id, table in tables.items():
+        groups: dict[str, tuple[dict[str, Any], list[int]]] = {}
+        for column, properties in table["columns"].items():
+            groups.setdefault(_key(properties), (properties, []))[1].append(column)
+        for properties, columns in groups.values():
+            merged.append(
+                {
+                    "updateTableColumnProperties": {
+                        "objectId": object_id,
+                        "columnIndices": sorted(columns),
+                        "tableColumnProperties": properties,
+                        "fields": table["fields"],
+                    }
+                }
+            )
+    return merged
+
+
+def _rectangles(cells: Iterable[tuple[int, int]]) -> list[tuple[int, int, int, int]]:
+    """Cover `cells` with (row, column, row_span, column_span) rectangles.
+
+    Each row is split into runs of adjacent columns, and a run is extended
+    downwards while the next row has exactly the same run.
+    """
+
+    by_row: dict[int, list[int]] = {}
+    for row, column in cells:
+        by_row.setdefault(row, []).append(column)
+
+    open_runs: dict[tuple[int, int], list[int]] = {}
+    rectangles: list[list[int]] = []
+    for row in sorted(by_row):
+        runs: list[tuple[int, int]] = []
+        for column in sorted(by_row[row]):
+            if runs and runs[-1][1] == column:
+                runs[-1] = (runs[-1][0], column + 1)
+            else:
+                runs.append((column, column + 1))
+
+        next_open: dict[tuple[int, int], list[int]] = {}
+        for run in runs:
+            rectangle = open_runs.get(run)
+            if rectangle is not None and rectangle[0] + rectangle[2] == row:
+                rectangle[2] += 1
+            else:
+                rectangle = [row, run[0], 1, run[1] - run[0]]
+                rectangles.append(rectangle)
+            next_open[run] = rectangle
+        open_runs = next_open
+    return [tuple(rectangle) for rectangle in rectangles]  # type: ignore[misc]
+
+
+def _cell_updates(run: list[dict[str, Any]]) -> list[dict[str, Any]] | None:
+    """Merge a run of `updateTableCellProperties`, or None to keep it as is."""
+
+    tables: dict[str, dict[str, Any]] = {}
+    for request in run:
+        payload = request["updateTableCellProperties"]
+        table_range = payload.get("tableRange")
+        if table_range is None:
+            return None
+        table = tables.setdefault(payload["objectId"], {"fields": payload.get("fields"), "cells": {}})
+        if table["fields"] != payload.get("fields"):
+            return None
+        location = table_range.get("location", {})
+        row, column = location.get("rowIndex", 0), location.get("columnIndex", 0)
+        for row_index in range(row, row + table_range.get("rowSpan", 1)):
+            for column_index in range(column, column + table_range.get("columnSpan", 1)):
+                table["cells"].pop((row_index, column_index), None)
+                table["cells"][(row_index, column_index)] = payload.get("tableCellProperties", {})
+
+    merged: list[dict[str, Any]] = []
+    for object_id, table in tables.items():
+        groups: dict[str, tuple[dict[str, Any], list[tuple[int, int]]]] = {}
+        for cell, properties in table["cells"].items():
+            groups.setdefault(_key(properties), (properties, []))[1].append(cell)
+        for properties, cells in groups.values():
+            for row, column, row_span, column_span in _rectangles(cells):
+                merged.append(
+                    {
+                        "updateTableCellProperties": {
+                            "objectId": object_id,
+                            "tableRange": {
+                                "location": {"rowIndex": row, "columnIndex": column},
+                                "rowSpan": row_span,
+                                "columnSpan": column_span,
+                            },
+                            "tableCellProperties": properties,
+                            "fields": table["fields"],
+                        }
+                    }
+                )
+    return merged
+
+
+_RUN_MERGERS = {
+    "updateTableColumnProperties": _column_updates,
+    "updateTableCellProperties": _cell_updates,
+}
+
+
+def _merge_table_runs(requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    index = 0
+    while index < len(requests):
+        kind, _ = _unpack(requests[index])
+        merger = _RUN_MERGERS.get(kind)
+        end = index + 1
+        if merger is not None:
+            while end < len(requests) and _unpack(requests[end])[0] == kind:
+                end += 1
+        run = requests[index:end]
+        merged = merger(run) if merger is not None and len(run) > 1 else None
+        out.extend(run if merged is None or len(merged) >= len(run) else merged)
+        index = end
+    return out
+
+
+def _drop_repeats(requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for request in requests:
+        if out and _unpack(request)[0] in _IDEMPOTENT_KINDS and request == out[-1]:
+            continue
+        out.append(request)
+    return out
+
+
+def optimize_requests(requests: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Return a shorter request list with the same effect on the presentation.
+
+    The input is not modified; requests that are not rewritten are reused.
+    """
+
+    optimized = [_normalize_fields(request) for request in requests]
+    optimized = _merge_style_updates(optimized)
+    optimized = _merge_table_runs(optimized)
+    return _drop_repeats(optimized)
+
+
+def batch_max_bytes() -> int:
+    """Largest batchUpdate body to send, from `WESFARMERS_BATCH_MAX_BYTES`."""
+
+    try:
+        return max(1, int(os.environ[BATCH_MAX_BYTES_ENV]))
+    except (KeyError, ValueError):
+        return DEFAULT_BATCH_MAX_BYTES
+
+
+def request_size(request: dict[str, Any]) -> int:
+    return len(json.dumps(request, separators=(",", ":")).encode("utf-8"))
+
+
+def batch_entry_size(request: dict[str, Any]) -> int:
+    """Bytes `request` adds to a batchUpdate body, including its separator."""
+
+    return request_size(request) + 1
+
+
+def chunk_requests(requests: list[dict[str, Any]], max_bytes: int) -> list[list[dict[str, Any]]]:
+    """Split `requests`, in order, into batches whose body stays under `max_bytes`.
+
+    A request that is larger than the limit on its own is sent alone.
+    """
+
+    batches: list[list[dict[str, Any]]] = []
+    current: list[dict[str, Any]] = []
+    size = BATCH_BODY_OVERHEAD_BYTES
+    for request in requests:
+        request_bytes = batch_entry_size(request)
+        if current and size + request_bytes > max_bytes:
+            batches.append(current)
+            current = []
+            size = BATCH_BODY_OVERHEAD_BYTES
+        current.append(request)
+        size += request_bytes
+    if current:
+        batches.append(current)
+    return batches
@@ -2,32 +2,221 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
+import re
+import threading
+from collections.abc import Callable, Collection, Iterator, Mapping
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
-from uuid import uuid4
+from functools import cache, lru_cache
+from typing import Any, TypeVar
 
 from googleapiclient.errors import HttpError
 
+from .api_execution import (
+    DRIVE_COMMENTS,
+    HEDGE_PERCENTILE,
+    SLIDES_WRITE,
+    LatencyTracker,
+    execute,
+    http_status,
+)
+from .batching import execute_batched
+from .deck_index import SlideRecord, notes_fingerprint_marker
+from .deadlines import Deadline, deadline_scope
+from .deck_snapshot import DeckChangedError, DeckSnapshot
 from .demo_content import (
+    SLIDE_AI_COMMENTS,
     STYLE_GUIDE_FILE,
     ModeContent,
     get_mode_or_raise,
-    load_slide_ai_comments,
-    load_style_guide_rules,
-)
-from .google_clients import (
-    build_drive_service,
-    build_slides_service,
-    load_credentials,
+    load_style_guide,
 )
+from .google_clients import get_clients
+from .instrumentation import Trace, span, start_trace
+from .notes_writer import NotesProgress, NoteWrite, write_notes
+from .phase_scheduler import DEFAULT_PHASE_WORKERS, Phase, run_phases
+from .request_optimizer import batch_max_bytes, chunk_requests, optimize_requests
+from .run_journal import RunJournal
+from .snapshot_cache import default_snapshot_cache
 
 WESFARMERS_RED = {"red": 0.8, "green": 0.0, "blue": 0.15}
 WESFARMERS_CHARCOAL = {"red": 0.14, "green": 0.16, "blue": 0.19}
 WESFARMERS_MUTED = {"red": 0.34, "green": 0.37, "blue": 0.41}
 
+DEFAULT_COMMENT_BATCH_SIZE = 50
+COMMENT_LIST_PAGE_SIZE = 100
+# Under a deadline, an optional phase only starts with enough time left for
+# the p95 of its recent durations in this process. Until enough runs have
+# been timed, it needs this much, capped at a fraction of the whole budget
+# so short deadlines still leave room for it.
+OPTIONAL_PHASE_MIN_BUDGET_S = 5.0
+OPTIONAL_PHASE_MIN_BUDGET_FRACTION = 0.25
+PHASE_DURATIONS = LatencyTracker()
+
+# A batchUpdate rejected with one of these is bisected to find the bad request.
+BISECT_STATUS_CODES = frozenset({400, 413})
+# How many times a deck-writing phase is rebuilt after concurrent edits.
+DECK_CHANGED_ATTEMPTS = 3
+_REVISION_CONFLICT_RE = re.compile(r"required\s*revision", re.IGNORECASE)
+
+T = TypeVar("T")
+
+# The register slide keeps one ID across reruns so it can be found and
+# refilled; its elements are named after a digest of their content, so an
+# unchanged register is recognised without reading any text.
+ISSUES_REGISTER_SLIDE_ID = "wesfarmers_issues_register"
+REGISTER_ELEMENTS = ("top_bar", "title", "subtitle", "meta", "table", "footer")
+
+# A longer register continues on further slides (`<id>_p2`, ...) placed
+# straight after the first, so the table never outgrows its slide.
+REGISTER_ROWS_PER_SLIDE = 8
+REGISTER_PAGE_RE = re.compile(rf"^{ISSUES_REGISTER_SLIDE_ID}(?:_p\d+)?$")
+
+# Bump when `_speaker_note_text` changes shape, so existing notes are rewritten.
+NOTES_TEMPLATE_VERSION = "1"
+
+# Register slides written before IDs were deterministic were named
+# `issues_register_` plus ten random hex digits; reconcile removes them.
+# Only that exact shape is matched, so slides other tools named with the
+# same prefix are left alone.
+LEGACY_REGISTER_RE = re.compile(r"issues_register_[0-9a-f]{10}")
+
+# A hidden slide at the end of the deck holds the styled register layout with
+# placeholder text. Registers are made by duplicating it and replacing the
+# placeholders; its ID ends in a digest of the layout, so a layout change
+# brings in a new template and the old one is removed.
+REGISTER_TEMPLATE_PREFIX = "wesfarmers_register_template_"
+REGISTER_PLACEHOLDER = "{{{{register.{}}}}}"
+
+
+def _register_element_ids(digest: str) -> dict[str, str]:
+    return {name: f"ir_{name}_{digest}" for name in REGISTER_ELEMENTS}
+
+
+def _register_page_id(page: int) -> str:
+    return ISSUES_REGISTER_SLIDE_ID if page == 1 else f"{ISSUES_REGISTER_SLIDE_ID}_p{page}"
+
 
-def _new_object_id(prefix: str) -> str:
-    return f"{prefix}_{uuid4().hex[:10]}"
+@cache
+def _register_digest(mode: ModeContent, page: int = 1) -> str:
+    """Hash of everything a register page shows for `mode`, except the generated timestamp."""
+
+    template = _issues_register_content_requests(
+        _register_page_id(page),
+        mode,
+        digest="",
+        generated="",
+        page=page,
+    )
+    encoded = json.dumps(template, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+@cache
+def _register_template_digest(row_count: int) -> str:
+    template = _register_template_layout("", {name: "" for name in REGISTER_ELEMENTS}, row_count)
+    encoded = json.dumps(template, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def _register_template_ids(row_count: int) -> tuple[str, dict[str, str]]:
+    """The template slide ID and its element IDs for a register of `row_count` issues."""
+
+    digest = _register_template_digest(row_count)
+    return (
+        f"{REGISTER_TEMPLATE_PREFIX}{digest}",
+        {name: f"irt_{name}_{digest}" for name in REGISTER_ELEMENTS},
+    )
+
+
+def _register_template_layout(
+    slide_id: str,
+    element_ids: Mapping[str, str],
+    row_count: int,
+) -> list[dict[str, Any]]:
+    rows = [
+        tuple(REGISTER_PLACEHOLDER.format(f"r{row}c{column}") for column in range(4))
+        for row in range(1, row_count + 1)
+    ]
+    return _register_layout_requests(
+        slide_id,
+        element_ids,
+        subtitle=REGISTER_PLACEHOLDER.format("subtitle"),
+        meta=REGISTER_PLACEHOLDER.format("meta"),
+        rows=rows,
+    )
+
+
+def _register_template_requests(row_count: int) -> list[dict[str, Any]]:
+    """Create the hidden template slide at the end of the deck."""
+
+    template_id, template_element_ids = _register_template_ids(row_count)
+    return [
+        {"createSlide": {"objectId": template_id}},
+        *_register_template_layout(template_id, template_element_ids, row_count),
+        {
+            "updateSlideProperties": {
+                "objectId": template_id,
+                "slideProperties": {"isSkipped": True},
+                "fields": "isSkipped",
+            }
+        },
+    ]
+
+
+def _register_from_template_requests(
+    slide_id: str,
+    mode: ModeContent,
+    insertion_index: int,
+    digest: str | None = None,
+    generated: str | None = None,
+    page: int = 1,
+) -> list[dict[str, Any]]:
+    """Duplicate the template into `slide_id` at `insertion_index` and fill in one page of `mode`."""
+
+    pages = _register_pages(mode)
+    rows = pages[page - 1]
+    template_id, template_element_ids = _register_template_ids(len(rows))
+    element_ids = _register_element_ids(_register_digest(mode, page) if digest is None else digest)
+    replacements = {
+        "subtitle": f"Focus: {mode.issues_register_summary}",
+        "meta": _register_meta(mode, pages, page, _register_generated(generated)),
+    }
+    for row, values in enumerate(rows, start=1):
+        for column, value in enumerate(values):
+            replacements[f"r{row}c{column}"] = value
+
+    return [
+        {
+            "duplicateObject": {
+                "objectId": template_id,
+                "objectIds": {
+                    template_id: slide_id,
+                    **{template_element_ids[name]: element_ids[name] for name in REGISTER_ELEMENTS},
+                },
+            }
+        },
+        {"updateSlidesPosition": {"slideObjectIds": [slide_id], "insertionIndex": insertion_index}},
+        {
+            "updateSlideProperties": {
+                "objectId": slide_id,
+                "slideProperties": {"isSkipped": False},
+                "fields": "isSkipped",
+            }
+        },
+        *(
+            {
+                "replaceAllText": {
+                    "containsText": {"text": REGISTER_PLACEHOLDER.format(key), "matchCase": True},
+                    "replaceText": value,
+                    "pageObjectIds": [slide_id],
+                }
+            }
+            for key, value in replacements.items()
+        ),
+    ]
 
 
 def _truncate(value: str, limit: int = 220) -> str:
@@ -46,9 +235,9 @@ def _extract_issue_category_and_text(comment: str) -> tuple[str, str]:
     return "ISSUE", stripped
 
 
-def _issues_register_rows(mode: ModeContent, max_rows: int = 8) -> list[tuple[str, str, str, str]]:
+def _issues_register_rows(mode: ModeContent) -> list[tuple[str, str, str, str]]:
     rows: list[tuple[str, str, str, str]] = []
-    for idx, (slide_ref, comment) in enumerate(mode.drive_comments[:max_rows], start=1):
+    for idx, (slide_ref, comment) in enumerate(mode.drive_comments, start=1):
         category, text = _extract_issue_category_and_text(comment)
         rows.append(
             (
@@ -61,20 +250,69 @@ def _issues_register_rows(mode: ModeContent, max_rows: int = 8) -> list[tuple[st
     return rows
 
 
+def _register_pages(mode: ModeContent) -> list[list[tuple[str, str, str, str]]]:
+    """The register rows split into one list per register slide (at least one)."""
+
+    rows = _issues_register_rows(mode)
+    return [
+        rows[start : start + REGISTER_ROWS_PER_SLIDE]
+        for start in range(0, len(rows), REGISTER_ROWS_PER_SLIDE)
+    ] or [[]]
+
+
+def _register_generated(generated: str | None) -> str:
+    return datetime.now(timezone.utc).strftime("%d %b %Y %H:%M UTC") if generated is None else generated
+
+
+def _register_meta(
+    mode: ModeContent,
+    pages: list[list[tuple[str, str, str, str]]],
+    page: int,
+    generated: str,
+) -> str:
+    rows = pages[page - 1]
+    total = len(mode.drive_comments)
+    if len(pages) == 1:
+        showing = f"Showing {len(rows)} of {total} issues"
+    else:
+        first = (page - 1) * REGISTER_ROWS_PER_SLIDE + 1
+        showing = f"Page {page} of {len(pages)} | Showing issues {first}-{first + len(rows) - 1} of {total}"
+    return f"Generated: {generated} | {showing} | Source: ADK demo comments"
+
+
 def _issues_register_content_requests(
     slide_id: str,
     mode: ModeContent,
+    digest: str | None = None,
+    generated: str | None = None,
+    page: int = 1,
 ) -> list[dict[str, Any]]:
-    generated = datetime.now(timezone.utc).strftime("%d %b %Y %H:%M UTC")
-    rows = _issues_register_rows(mode)
-    row_count = len(rows) + 1
+    pages = _register_pages(mode)
+    return _register_layout_requests(
+        slide_id,
+        _register_element_ids(_register_digest(mode, page) if digest is None else digest),
+        subtitle=f"Focus: {mode.issues_register_summary}",
+        meta=_register_meta(mode, pages, page, _register_generated(generated)),
+        rows=pages[page - 1],
+    )
 
-    top_bar_id = _new_object_id("issues_top_bar")
-    title_id = _new_object_id("issues_title")
-    subtitle_id = _new_object_id("issues_subtitle")
-    meta_id = _new_object_id("issues_meta")
-    table_id = _new_object_id("issues_table")
-    footer_id = _new_object_id("issues_footer")
+
+def _register_layout_requests(
+    slide_id: str,
+    element_ids: Mapping[str, str],
+    subtitle: str,
+    meta: str,
+    rows: list[tuple[str, str, str, str]],
+) -> list[dict[str, Any]]:
+    """Create and style every register element on `slide_id` with the given text."""
+
+    row_count = len(rows) + 1
+    top_bar_id = element_ids["top_bar"]
+    title_id = element_ids["title"]
+    subtitle_id = element_ids["subtitle"]
+    meta_id = element_ids["meta"]
+    table_id = element_ids["table"]
+    footer_id = element_ids["footer"]
 
     requests: list[dict[str, Any]] = [
         {
@@ -179,7 +417,7 @@ def _issues_register_content_requests(
             "insertText": {
                 "objectId": subtitle_id,
                 "insertionIndex": 0,
-                "text": f"Focus: {mode.issues_register_summary}",
+                "text": subtitle,
             }
         },
         {
@@ -218,10 +456,7 @@ def _issues_register_content_requests(
             "insertText": {
                 "objectId": meta_id,
                 "insertionIndex": 0,
-                "text": (
-                    f"Generated: {generated} | Showing {len(rows)} of {len(mode.drive_comments)} issues | "
-                    "Source: ADK demo comments"
-                ),
+                "text": meta,
             }
         },
         {
@@ -399,50 +634,64 @@ def _issues_register_content_requests(
     return requests
 
 
-def _extract_text_from_shape(shape: dict[str, Any]) -> str:
-    text_content = shape.get("text", {}).get("textElements", [])
-    chunks: list[str] = []
-    for element in text_content:
-        run = element.get("textRun")
-        if run and run.get("content"):
-            chunks.append(run["content"])
-    return "".join(chunks).strip()
+@dataclass(frozen=True)
+class _NotesTemplate:
+    """Speaker notes for one mode and style guide with the static text pre-rendered.
 
+    Everything except the slide heading, the per-slide AI comment and the
+    mode comment (which rotates by slide number) is identical on every slide,
+    so it is joined once and `render` only concatenates a few strings.
+    """
 
-def _slide_title(slide: dict[str, Any], fallback: str) -> str:
-    for page_element in slide.get("pageElements", []):
-        shape = page_element.get("shape")
-        if not shape:
-            continue
-        placeholder = shape.get("placeholder", {})
-        if placeholder.get("type") in {"TITLE", "CENTERED_TITLE"}:
-            title = _extract_text_from_shape(shape)
-            if title:
-                return title
-
-    for page_element in slide.get("pageElements", []):
-        shape = page_element.get("shape")
-        if not shape:
-            continue
-        text = _extract_text_from_shape(shape)
-        if text:
-            return text.splitlines()[0].strip()
+    ai_blocks: Mapping[int, str]
+    default_ai_block: str
+    feedback_blocks: tuple[str, ...]
+    tail: str
+
+    def render(self, content_slide_number: int, absolute_slide_number: int, slide_title: str) -> str:
+        return "".join(
+            (
+                f"Slide under review: Slide {content_slide_number} - {slide_title}\n"
+                f"Deck position (including Issues Register if present): {absolute_slide_number}\n\n",
+                self.ai_blocks.get(content_slide_number, self.default_ai_block),
+                self.feedback_blocks[(content_slide_number - 1) % len(self.feedback_blocks)],
+                self.tail,
+            )
+        )
 
-    return fallback
 
+def _bullets(lines: tuple[str, ...]) -> str:
+    return "\n".join(f"- {line}" for line in lines)
 
-def _has_text_in_page_elements(
-    page_elements: list[dict[str, Any]],
-    object_id: str,
-) -> bool:
-    for page_element in page_elements:
-        if page_element.get("objectId") != object_id:
-            continue
-        shape = page_element.get("shape")
-        if not shape:
-            return False
-        return bool(_extract_text_from_shape(shape))
-    return False
+
+@lru_cache(maxsize=16)
+def _notes_template(mode: ModeContent, style_guide_rules: tuple[str, ...]) -> _NotesTemplate:
+    def ai_block(lines: tuple[str, ...]) -> str:
+        return f"AI Comment (requested deck guidance):\n{_bullets(lines)}\n\n"
+
+    return _NotesTemplate(
+        ai_blocks={number: ai_block(lines) for number, lines in SLIDE_AI_COMMENTS.items() if lines},
+        default_ai_block=ai_block(("No explicit AI comment provided for this slide number.",)),
+        feedback_blocks=tuple(
+            "Per-slide feedback summary:\n"
+            f"- Benchmark reference: {slide_ref}\n"
+            f"- Priority concern: {mode_comment}\n"
+            for slide_ref, mode_comment in mode.drive_comments
+        ),
+        tail=(
+            "- Practical edit: tighten the headline so it states one clear decision implication.\n"
+            "- Presenter cue: explain evidence quality first, then recommendation confidence.\n\n"
+            "Review lens to apply while presenting:\n"
+            f"{_bullets(mode.speaker_focus)}\n\n"
+            "Wesfarmers style guide checks:\n"
+            f"{_bullets(style_guide_rules)}\n\n"
+            "Suggested talk track (demo narrative):\n"
+            "1) Open with the decision statement in one sentence.\n"
+            "2) Confirm evidence basis and key assumptions.\n"
+            "3) State commercial implication and risk owner.\n"
+            "4) Close with ask, owner, and due date for follow-up.\n"
+        ),
+    )
 
 
 def _speaker_note_text(
@@ -452,80 +701,308 @@ def _speaker_note_text(
     slide_title: str,
     style_guide_rules: tuple[str, ...],
 ) -> str:
-    slide_ref, mode_comment = mode.drive_comments[
-        (content_slide_number - 1) % len(mode.drive_comments)
-    ]
-    ai_comment_lines = load_slide_ai_comments(content_slide_number)
-    style_checks = "\n".join(f"- {rule}" for rule in style_guide_rules)
-    mode_focus = "\n".join(f"- {line}" for line in mode.speaker_focus)
-    ai_comment_block = (
-        "\n".join(f"- {line}" for line in ai_comment_lines)
-        if ai_comment_lines
-        else "- No explicit AI comment provided for this slide number."
+    return _notes_template(mode, style_guide_rules).render(
+        content_slide_number,
+        absolute_slide_number,
+        slide_title,
     )
 
-    return (
-        f"Slide under review: Slide {content_slide_number} - {slide_title}\n"
-        f"Deck position (including Issues Register if present): {absolute_slide_number}\n\n"
-        "AI Comment (requested deck guidance):\n"
-        f"{ai_comment_block}\n\n"
-        "Per-slide feedback summary:\n"
-        f"- Benchmark reference: {slide_ref}\n"
-        f"- Priority concern: {mode_comment}\n"
-        "- Practical edit: tighten the headline so it states one clear decision implication.\n"
-        "- Presenter cue: explain evidence quality first, then recommendation confidence.\n\n"
-        "Review lens to apply while presenting:\n"
-        f"{mode_focus}\n\n"
-        "Wesfarmers style guide checks:\n"
-        f"{style_checks}\n\n"
-        "Suggested talk track (demo narrative):\n"
-        "1) Open with the decision statement in one sentence.\n"
-        "2) Confirm evidence basis and key assumptions.\n"
-        "3) State commercial implication and risk owner.\n"
-        "4) Close with ask, owner, and due date for follow-up.\n"
+
+class BatchUpdateRequestError(RuntimeError):
+    """Raised when bisecting a rejected batchUpdate isolates the request at fault."""
+
+    def __init__(self, index: int, request: dict[str, Any], cause: HttpError) -> None:
+        (kind, payload), = request.items()
+        target = payload.get("objectId", "") if isinstance(payload, dict) else ""
+        super().__init__(
+            f"Slides rejected batchUpdate request #{index} ({kind} {target}".rstrip() + f"): {cause}"
+        )
+        self.index = index
+        self.request = request
+
+
+def _is_revision_conflict(exc: HttpError) -> bool:
+    """Whether a 400 rejects the `requiredRevisionId` pin rather than the requests."""
+
+    if http_status(exc) != 400:
+        return False
+    details = exc.error_details if isinstance(exc.error_details, list) else []
+    messages = [exc.reason or ""]
+    messages.extend(str(detail.get("message", "")) for detail in details if isinstance(detail, dict))
+    return any(_REVISION_CONFLICT_RE.search(message) for message in messages)
+
+
+def _send_batch(slides_service: Any, snapshot: DeckSnapshot, requests: list[dict[str, Any]]) -> dict[str, Any]:
+    """Send one batchUpdate pinned to the snapshot's revision and advance it.
+
+    If someone else edited the deck since it was read, the pinned write is
+    rejected and `DeckChangedError` is raised: the requests were built from
+    a stale deck, so the phase refetches and rebuilds them (see
+    `_with_fresh_deck`) instead of replaying them. Any other error is raised
+    as is.
+    """
+
+    revision_id = snapshot.revision_id
+    body: dict[str, Any] = {"requests": requests}
+    if revision_id:
+        body["writeControl"] = {"requiredRevisionId": revision_id}
+    try:
+        response = execute(
+            slides_service.presentations().batchUpdate(presentationId=snapshot.presentation_id, body=body),
+            api=SLIDES_WRITE,
+            # A pinned write that already applied fails the pin on resend.
+            idempotent=bool(revision_id),
+        )
+    except HttpError as exc:
+        if not revision_id or not _is_revision_conflict(exc):
+            raise
+        raise DeckChangedError(
+            f"Presentation {snapshot.presentation_id} was edited during the review: {exc.reason}"
+        ) from exc
+
+    snapshot.record_revision(
+        (response.get("writeControl") or {}).get("requiredRevisionId") if revision_id else None
     )
+    return response
 
 
-def _insert_issues_register_slide(
+def _send_bisecting(
     slides_service: Any,
-    presentation_id: str,
+    snapshot: DeckSnapshot,
+    requests: list[dict[str, Any]],
+    offset: int,
+) -> list[dict[str, Any]]:
+    """Send `requests`; if the batch is rejected, send each half in turn to find the bad request.
+
+    Halves that succeed stay applied, so the snapshot stops claiming a
+    revision and the run ends with `BatchUpdateRequestError` naming the
+    request at fault. `offset` is the index of `requests[0]` in the full list.
+    """
+
+    try:
+        return _send_batch(slides_service, snapshot, requests).get("replies", [])
+    except HttpError as exc:
+        if http_status(exc) not in BISECT_STATUS_CODES:
+            raise
+        snapshot.record_revision(None)
+        if len(requests) == 1:
+            raise BatchUpdateRequestError(offset, requests[0], exc) from exc
+    middle = len(requests) // 2
+    return [
+        *_send_bisecting(slides_service, snapshot, requests[:middle], offset),
+        *_send_bisecting(slides_service, snapshot, requests[middle:], offset + middle),
+    ]
+
+
+def _batch_update(slides_service: Any, snapshot: DeckSnapshot, requests: list[dict[str, Any]]) -> dict[str, Any]:
+    """Apply `requests` through as few batchUpdates as the payload limit allows.
+
+    The list goes through `optimize_requests`, then `chunk_requests` splits
+    it into batches under `batch_max_bytes()`. Each batch is atomic, but a
+    split list is not. Returns the replies of every batch in order.
+    """
+
+    with span("optimize_requests", requests=len(requests)) as current:
+        requests = optimize_requests(requests)
+        if current is not None:
+            current.attributes["optimized_requests"] = len(requests)
+
+    replies: list[dict[str, Any]] = []
+    offset = 0
+    for batch in chunk_requests(requests, batch_max_bytes()):
+        with span("batch_update", requests=len(batch)):
+            replies.extend(_send_bisecting(slides_service, snapshot, batch, offset))
+        offset += len(batch)
+    return {"presentationId": snapshot.presentation_id, "replies": replies}
+
+
+def _sync_issues_register_slide(
+    slides_service: Any,
+    snapshot: DeckSnapshot,
     mode: ModeContent,
-) -> dict[str, str]:
-    slide_id = _new_object_id("issues_register")
-    requests = [{"createSlide": {"objectId": slide_id, "insertionIndex": 0}}]
-    requests.extend(_issues_register_content_requests(slide_id=slide_id, mode=mode))
+) -> dict[str, Any]:
+    """Create, refill or leave alone the register slides so the deck holds exactly one register.
+
+    Each register slide is duplicated from the hidden template for its row
+    count, which is added in the same batchUpdate when the deck does not
+    have it yet. If any page differs, every page is rebuilt in place of the
+    old first page. Returns the register slide IDs, the action taken
+    (`created`, `updated` or `unchanged`) and what happened to the
+    templates. An unchanged register costs no write.
+    """
+
+    pages = _register_pages(mode)
+    wanted = {
+        _register_page_id(page): _register_element_ids(_register_digest(mode, page))
+        for page in range(1, len(pages) + 1)
+    }
+    templates = {len(rows): _register_template_ids(len(rows)) for rows in pages}
+    ready = set()
+    for template_id, template_element_ids in templates.values():
+        template = snapshot.index.slide_for(template_id)
+        if template is not None and set(template.element_ids) == set(template_element_ids.values()):
+            ready.add(template_id)
+
+    slides = snapshot.index.slides
+    existing = [slide for slide in slides if REGISTER_PAGE_RE.match(slide.object_id)]
+    removed = [
+        slide.object_id
+        for slide in slides
+        if LEGACY_REGISTER_RE.fullmatch(slide.object_id)
+        or (slide.object_id.startswith(REGISTER_TEMPLATE_PREFIX) and slide.object_id not in ready)
+    ]
+    requests: list[dict[str, Any]] = [{"deleteObject": {"objectId": object_id}} for object_id in removed]
+
+    position = 0
+    if not existing:
+        action = "created"
+    elif {slide.object_id for slide in existing} == set(wanted) and all(
+        set(slide.element_ids) == set(wanted[slide.object_id].values()) for slide in existing
+    ):
+        action = "unchanged"
+    else:
+        action = "updated"
+        for slide in slides:
+            if slide is existing[0]:
+                break
+            if slide.object_id not in removed:
+                position += 1
+        requests.extend({"deleteObject": {"objectId": slide.object_id}} for slide in existing)
+
+    created_templates = []
+    if action != "unchanged":
+        for row_count, (template_id, _) in templates.items():
+            if template_id not in ready:
+                created_templates.append(row_count)
+                requests.extend(_register_template_requests(row_count))
+        for page, slide_id in enumerate(wanted, start=1):
+            requests.extend(
+                _register_from_template_requests(
+                    slide_id,
+                    mode,
+                    position + page - 1,
+                    digest=_register_digest(mode, page),
+                    page=page,
+                )
+            )
 
-    slides_service.presentations().batchUpdate(
-        presentationId=presentation_id,
-        body={"requests": requests},
-    ).execute()
+    if requests:
+        _batch_update(slides_service, snapshot, requests)
+
+    for object_id in removed:
+        snapshot.record_slide_deleted(object_id)
+    for row_count in created_templates:
+        template_id, template_element_ids = templates[row_count]
+        snapshot.record_slide_inserted(
+            template_id,
+            insertion_index=len(snapshot.slides),
+            element_ids=tuple(template_element_ids.values()),
+        )
+    if action != "unchanged":
+        for slide in existing:
+            snapshot.record_slide_deleted(slide.object_id)
+        for offset, (slide_id, element_ids) in enumerate(wanted.items()):
+            snapshot.record_slide_inserted(
+                slide_id,
+                insertion_index=position + offset,
+                element_ids=tuple(element_ids.values()),
+            )
 
+    if action == "unchanged":
+        template_action = "unused"
+    else:
+        template_action = "created" if created_templates else "reused"
     return {
-        "slide_id": slide_id,
-        "action": "created",
+        "slide_id": ISSUES_REGISTER_SLIDE_ID,
+        "slide_ids": list(wanted),
+        "action": action,
+        "template": template_action,
+        "legacy_slides_removed": sum(1 for object_id in removed if LEGACY_REGISTER_RE.fullmatch(object_id)),
     }
 
 
+def _existing_comment_contents(drive_service: Any, presentation_id: str) -> set[str]:
+    """Contents of every live comment on the file, read page by page with a minimal mask."""
+
+    contents: set[str] = set()
+    comments = drive_service.comments()
+    request = comments.list(
+        fileId=presentation_id,
+        fields="nextPageToken,comments(content)",
+        pageSize=COMMENT_LIST_PAGE_SIZE,
+        includeDeleted=False,
+    )
+    while request is not None:
+        response = execute(request, api=DRIVE_COMMENTS)
+        contents.update(comment.get("content", "") for comment in response.get("comments", []))
+        request = comments.list_next(request, response)
+    return contents
+
+
 def _add_drive_comments(
     drive_service: Any,
     presentation_id: str,
     mode: ModeContent,
-) -> list[dict[str, str]]:
-    created: list[dict[str, str]] = []
+    batch_size: int = DEFAULT_COMMENT_BATCH_SIZE,
+    only: Collection[str] | None = None,
+) -> tuple[list[dict[str, str]], list[dict[str, str]], int]:
+    """Post the mode's comments that the file does not already have.
 
-    for slide_ref, content in mode.drive_comments:
-        response = (
-            drive_service.comments()
-            .create(
-                fileId=presentation_id,
-                fields="id,content,createdTime",
-                body={
-                    "content": f"{slide_ref}: {content}",
-                },
-            )
-            .execute()
+    `only` limits the run to comments with those bodies (a resumed run
+    retrying the ones that failed). Returns the created comments, the failed
+    ones with their `content`, and how many were skipped because an
+    identical comment already exists.
+    """
+
+    def _comment_request(body: str) -> Callable[[], Any]:
+        return lambda: drive_service.comments().create(
+            fileId=presentation_id,
+            fields="id,content,createdTime",
+            body={"content": body},
         )
 
+    candidates = [
+        (slide_ref, f"{slide_ref}: {content}")
+        for slide_ref, content in mode.drive_comments
+        if only is None or f"{slide_ref}: {content}" in only
+    ]
+    existing = _existing_comment_contents(drive_service, presentation_id)
+    pending = [(slide_ref, body) for slide_ref, body in candidates if body not in existing]
+    skipped = len(candidates) - len(pending)
+
+    def _already_posted(keys: list[str]) -> set[str]:
+        # comments.create is not idempotent: a call that failed may still have
+        # stored the comment, so re-list before resending.
+        existing = _existing_comment_contents(drive_service, presentation_id)
+        return {key for key in keys if pending[int(key)][1] in existing}
+
+    outcomes = execute_batched(
+        drive_service,
+        [(str(idx), _comment_request(body)) for idx, (_, body) in enumerate(pending)],
+        batch_size=batch_size,
+        api=DRIVE_COMMENTS,
+        already_applied=_already_posted,
+        idempotent=False,
+    )
+
+    created: list[dict[str, str]] = []
+    failed: list[dict[str, str]] = []
+    for (slide_ref, body), outcome in zip(pending, outcomes):
+        if outcome.already_applied:
+            skipped += 1
+            continue
+        if not outcome.ok:
+            failed.append(
+                {
+                    "slide_ref": slide_ref,
+                    "content": body,
+                    "error": str(outcome.error),
+                    "attempts": str(outcome.attempts),
+                }
+            )
+            continue
+
+        response = outcome.response or {}
         created.append(
             {
                 "comment_id": response.get("id", "unknown"),
@@ -535,137 +1012,410 @@ def _add_drive_comments(
             }
         )
 
-    return created
+    return created, failed, skipped
+
+
+def _notes_fingerprint(
+    slide: SlideRecord,
+    mode: ModeContent,
+    content_slide_number: int,
+    absolute_slide_number: int,
+    style_guide_version: str,
+) -> str:
+    """Hash of every input to a slide's generated notes.
+
+    Slide positions are included because the notes quote them and pick the
+    mode comment by content slide number.
+    """
+
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (
+        NOTES_TEMPLATE_VERSION,
+        mode.key,
+        style_guide_version,
+        str(content_slide_number),
+        str(absolute_slide_number),
+        slide.title,
+        slide.text,
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
 
 
 def _update_speaker_notes(
     slides_service: Any,
-    presentation_id: str,
+    snapshot: DeckSnapshot,
     mode: ModeContent,
-    issues_slide_id: str,
-) -> list[dict[str, str]]:
-    deck = slides_service.presentations().get(presentationId=presentation_id).execute()
-    style_guide_rules = load_style_guide_rules()
-    requests: list[dict[str, Any]] = []
+    register_slide_ids: Collection[str],
+    on_batch: Callable[[list[NoteWrite], NotesProgress], None] | None = None,
+    done_slide_ids: Collection[str] = (),
+) -> tuple[list[dict[str, str]], int, NotesProgress]:
+    """Rewrite notes on slides whose fingerprint changed.
+
+    Notes are rendered as they are sent and written in batches (see
+    `notes_writer`); each batch is recorded on the snapshot before `on_batch`
+    runs. The register slides and their hidden templates are not content
+    slides and keep their notes, and `done_slide_ids` (slides a resumed run
+    already wrote) count as unchanged without being fingerprinted. Returns
+    the updated slides, how many were skipped as unchanged and the write
+    progress.
+    """
+
+    style_guide = load_style_guide()
+    template = _notes_template(mode, style_guide.rules)
     updated_slides: list[dict[str, str]] = []
-    content_slide_number = 0
+    skipped = 0
 
-    for absolute_slide_number, slide in enumerate(deck.get("slides", []), start=1):
-        if slide.get("objectId") == issues_slide_id:
-            continue
+    def _writes() -> Iterator[NoteWrite]:
+        nonlocal skipped
+        content_slide_number = 0
+        for absolute_slide_number, slide in snapshot.index.numbered():
+            if slide.object_id in register_slide_ids or slide.object_id.startswith(REGISTER_TEMPLATE_PREFIX):
+                continue
 
-        content_slide_number += 1
-        notes_page = slide.get("slideProperties", {}).get("notesPage", {})
-        notes_page_elements = notes_page.get("pageElements", [])
-        notes_object_id = (
-            notes_page
-            .get("notesProperties", {})
-            .get("speakerNotesObjectId")
-        )
-        if not notes_object_id:
-            continue
+            content_slide_number += 1
+            notes_object_id = slide.notes_object_id
+            if not notes_object_id:
+                continue
+            if slide.object_id in done_slide_ids:
+                skipped += 1
+                continue
 
-        title = _slide_title(slide, fallback=f"Untitled slide {content_slide_number}")
-        text = _speaker_note_text(
-            mode,
-            content_slide_number=content_slide_number,
-            absolute_slide_number=absolute_slide_number,
-            slide_title=title,
-            style_guide_rules=style_guide_rules,
-        )
+            fingerprint = _notes_fingerprint(
+                slide,
+                mode,
+                content_slide_number,
+                absolute_slide_number,
+                style_guide.version,
+            )
+            if slide.notes_fingerprint == fingerprint:
+                skipped += 1
+                continue
 
-        if _has_text_in_page_elements(notes_page_elements, notes_object_id):
+            title = slide.title or f"Untitled slide {content_slide_number}"
+            text = (
+                template.render(content_slide_number, absolute_slide_number, title)
+                + f"\n{notes_fingerprint_marker(fingerprint)}"
+            )
+            requests: list[dict[str, Any]] = []
+            if slide.notes_has_text:
+                requests.append(
+                    {
+                        "deleteText": {
+                            "objectId": notes_object_id,
+                            "textRange": {"type": "ALL"},
+                        }
+                    }
+                )
             requests.append(
                 {
-                    "deleteText": {
+                    "insertText": {
                         "objectId": notes_object_id,
-                        "textRange": {"type": "ALL"},
+                        "insertionIndex": 0,
+                        "text": text,
                     }
                 }
             )
-        requests.append(
-            {
-                "insertText": {
-                    "objectId": notes_object_id,
-                    "insertionIndex": 0,
-                    "text": text,
-                }
-            }
-        )
+            yield NoteWrite(
+                slide_object_id=slide.object_id,
+                notes_object_id=notes_object_id,
+                text=text,
+                requests=tuple(requests),
+                summary={
+                    "slide_object_id": slide.object_id,
+                    "slide_number": str(content_slide_number),
+                    "slide_title": title,
+                },
+            )
 
-        updated_slides.append(
-            {
-                "slide_object_id": slide.get("objectId", "unknown"),
-                "slide_number": str(content_slide_number),
-                "slide_title": title,
-            }
-        )
+    def _checkpoint(batch: list[NoteWrite], progress: NotesProgress) -> None:
+        snapshot.record_notes_written({item.notes_object_id: item.text for item in batch})
+        updated_slides.extend(item.summary for item in batch)
+        if on_batch is not None:
+            on_batch(batch, progress)
 
-    if requests:
-        slides_service.presentations().batchUpdate(
-            presentationId=presentation_id,
-            body={"requests": requests},
-        ).execute()
+    # `snapshot.index` is read once here; recording a batch only drops the
+    # cached index for later readers.
+    progress = write_notes(
+        _writes(),
+        send=lambda requests: _batch_update(slides_service, snapshot, requests),
+        on_batch=_checkpoint,
+        pinned=lambda: snapshot.revision_id is not None,
+    )
+    return updated_slides, skipped, progress
+
+
+def _with_fresh_deck(
+    slides_service: Any,
+    snapshot: DeckSnapshot,
+    run: Callable[[], T],
+    on_refresh: Callable[[], None] | None = None,
+) -> T:
+    """Run a deck-writing phase, refetching the deck and rebuilding it after concurrent edits.
+
+    Register sync and speaker notes both compare against the deck before
+    writing, so a rerun against the fresh read only redoes what is missing.
+    `on_refresh` runs after each refetch.
+    """
+
+    attempt = 1
+    while True:
+        try:
+            return run()
+        except DeckChangedError:
+            if attempt >= DECK_CHANGED_ATTEMPTS:
+                raise
+        attempt += 1
+        with span("refetch_deck"):
+            snapshot.refresh(slides_service)
+        if on_refresh is not None:
+            on_refresh()
 
-    return updated_slides
+
+def _optional_phase_budget(name: str, deadline: Deadline | None) -> float:
+    """Time an optional phase needs left to start: its recent p95, or a share of the budget."""
+
+    observed = PHASE_DURATIONS.percentile(name, HEDGE_PERCENTILE)
+    if observed is not None:
+        return observed
+    if deadline is None:
+        return OPTIONAL_PHASE_MIN_BUDGET_S
+    return min(OPTIONAL_PHASE_MIN_BUDGET_S, deadline.budget_s * OPTIONAL_PHASE_MIN_BUDGET_FRACTION)
+
+
+def _traced_phase(
+    trace: Trace,
+    name: str,
+    run: Callable[[Mapping[str, Any]], Any],
+    depends_on: tuple[str, ...] = (),
+    optional: bool = False,
+    deadline: Deadline | None = None,
+) -> Phase:
+    def _run(done: Mapping[str, Any]) -> Any:
+        with span(name, trace=trace) as current:
+            result = run(done)
+        if current is not None:
+            PHASE_DURATIONS.record(name, current.duration_ms / 1000)
+        return result
+
+    return Phase(
+        name,
+        _run,
+        depends_on=depends_on,
+        optional=optional,
+        min_budget_s=_optional_phase_budget(name, deadline) if optional else 0.0,
+    )
 
 
 def run_review_workflow(
     presentation_id: str,
     review_mode: str,
     reviewer_name: str = "Wesfarmers BD Demo Agent",
+    comment_batch_size: int = DEFAULT_COMMENT_BATCH_SIZE,
+    max_phase_workers: int = DEFAULT_PHASE_WORKERS,
+    cancel_event: threading.Event | None = None,
+    use_snapshot_cache: bool = True,
+    resume: bool = False,
+    deadline_s: float | None = None,
 ) -> dict[str, Any]:
-    """Execute the full demo workflow against a Google Slides presentation."""
+    """Execute the full demo workflow against a Google Slides presentation.
+
+    Drive comments do not depend on the deck, so they run alongside the
+    fetch -> Issues Register -> speaker notes chain. Setting `cancel_event`
+    stops the run before the next phase starts. Every phase and API call is
+    recorded on a trace (see `instrumentation`), summarised in `timing_summary`.
+    The deck is read through the on-disk snapshot cache unless
+    `use_snapshot_cache` is False or `WESFARMERS_SNAPSHOT_CACHE=0`.
+
+    Completed phases and notes batches are written to a run journal (see
+    `run_journal`). With `resume`, work the last unfinished run of this
+    presentation and mode already did is not repeated. A second run of the
+    same presentation and mode raises `RunInProgressError` while one is going.
+
+    With `deadline_s`, every API call times out when the budget runs out.
+    Drive comments and speaker notes are optional and are skipped when less
+    time is left than they are expected to need (see `_optional_phase_budget`)
+    or when the deadline cuts them short; the result lists them in `skipped_phases`, and phases that
+    finished after the deadline in `late_phases`.
+    """
 
     mode = get_mode_or_raise(review_mode)
-    credentials = load_credentials()
-    slides_service = build_slides_service(credentials)
-    drive_service = build_drive_service(credentials)
+    deadline = Deadline(deadline_s) if deadline_s else None
+    journal = RunJournal.open(presentation_id, mode.key, resume=resume)
 
-    try:
-        presentation = (
-            slides_service.presentations()
-            .get(presentationId=presentation_id)
-            .execute()
+    def _fetch_deck(_: Mapping[str, Any]) -> DeckSnapshot:
+        snapshot = DeckSnapshot.fetch(
+            slides_service, presentation_id, cache=snapshot_cache, principal=clients.principal
         )
-        deck_title = presentation.get("title", "Untitled presentation")
+        journal.check_deck(snapshot.revision_id)
+        return snapshot
 
-        issues_slide = _insert_issues_register_slide(
-            slides_service=slides_service,
-            presentation_id=presentation_id,
-            mode=mode,
+    def _register(done: Mapping[str, Any]) -> dict[str, Any]:
+        snapshot = done["fetch_deck"]
+        journaled = journal.completed("issues_register")
+        if journaled is not None:
+            return journaled
+        result = _with_fresh_deck(
+            slides_service,
+            snapshot,
+            lambda: _sync_issues_register_slide(
+                slides_service=slides_service,
+                snapshot=snapshot,
+                mode=mode,
+            ),
+            on_refresh=lambda: journal.check_deck(snapshot.revision_id),
         )
+        journal.phase_done("issues_register", result, result["slide_ids"], snapshot.revision_id)
+        return result
 
-        created_comments = _add_drive_comments(
+    def _comments(_: Mapping[str, Any]) -> tuple[list[dict[str, str]], list[dict[str, str]], int]:
+        journaled = journal.completed("drive_comments", deck=False)
+        if journaled is not None and not journaled.get("failed"):
+            return [], [], len(journaled["created"]) + journaled["skipped"]
+        # A resumed run retries only the comments that failed last time.
+        created, failed, skipped = _add_drive_comments(
             drive_service=drive_service,
             presentation_id=presentation_id,
             mode=mode,
+            batch_size=comment_batch_size,
+            only=journaled["failed"] if journaled is not None else None,
         )
+        previous = journaled["created"] if journaled is not None else []
+        journal.phase_done(
+            "drive_comments",
+            {
+                "created": previous + created,
+                "skipped": skipped + (journaled["skipped"] if journaled is not None else 0),
+                "failed": [comment["content"] for comment in failed],
+            },
+            [comment["comment_id"] for comment in previous + created],
+            deck=False,
+        )
+        skipped += len(previous) + (journaled["skipped"] if journaled is not None else 0)
+        return created, failed, skipped
 
-        updated_notes = _update_speaker_notes(
-            slides_service=slides_service,
-            presentation_id=presentation_id,
-            mode=mode,
-            issues_slide_id=issues_slide["slide_id"],
+    def _notes(done: Mapping[str, Any]) -> tuple[list[dict[str, str]], int, NotesProgress]:
+        snapshot = done["fetch_deck"]
+        journaled = journal.completed("speaker_notes")
+        if journaled is not None:
+            return [], journaled["updated"] + journaled["skipped"], NotesProgress()
+        # Slides written by an attempt that a concurrent edit cut short are
+        # skipped as unchanged by the next one, so summaries are kept across
+        # attempts and those slides are reported as updated.
+        written: dict[str, dict[str, str]] = {}
+
+        def _on_batch(batch: list[NoteWrite], _: NotesProgress) -> None:
+            written.update((item.slide_object_id, item.summary) for item in batch)
+            journal.batch_done("speaker_notes", [item.slide_object_id for item in batch], snapshot.revision_id)
+
+        last_updated, skipped, progress = _with_fresh_deck(
+            slides_service,
+            snapshot,
+            lambda: _update_speaker_notes(
+                slides_service=slides_service,
+                snapshot=snapshot,
+                mode=mode,
+                register_slide_ids=done["issues_register"]["slide_ids"],
+                on_batch=_on_batch,
+                done_slide_ids=journal.written("speaker_notes"),
+            ),
+            on_refresh=lambda: journal.check_deck(snapshot.revision_id),
+        )
+        rewritten = {summary["slide_object_id"] for summary in last_updated}
+        skipped = max(0, skipped - sum(1 for slide_id in written if slide_id not in rewritten))
+        updated = list(written.values())
+        journal.phase_done(
+            "speaker_notes",
+            {"updated": len(updated), "skipped": skipped},
+            revision_id=snapshot.revision_id,
         )
+        return updated, skipped, progress
 
-    except HttpError as exc:
-        message = getattr(exc, "_get_reason", lambda: str(exc))()
-        raise RuntimeError(f"Google API request failed: {message}") from exc
+    with (
+        journal,
+        start_trace("review", presentation_id=presentation_id, review_mode=mode.key) as trace,
+        deadline_scope(deadline),
+    ):
+        with span("clients"):
+            clients = get_clients()
+        slides_service = clients.slides
+        drive_service = clients.drive
+        snapshot_cache = default_snapshot_cache() if use_snapshot_cache else None
+
+        try:
+            phase_run = run_phases(
+                [
+                    _traced_phase(trace, "fetch_deck", _fetch_deck),
+                    _traced_phase(trace, "issues_register", _register, depends_on=("fetch_deck",)),
+                    _traced_phase(trace, "drive_comments", _comments, optional=True, deadline=deadline),
+                    _traced_phase(
+                        trace,
+                        "speaker_notes",
+                        _notes,
+                        depends_on=("issues_register",),
+                        optional=True,
+                        deadline=deadline,
+                    ),
+                ],
+                max_workers=max_phase_workers,
+                cancel_event=cancel_event,
+                deadline=deadline,
+            )
+        except HttpError as exc:
+            message = getattr(exc, "_get_reason", lambda: str(exc))()
+            raise RuntimeError(f"Google API request failed: {message}") from exc
+
+        snapshot = phase_run.results["fetch_deck"]
+        if snapshot_cache is not None:
+            # Save the post-write state so the next run (e.g. another mode)
+            # only pays for the revision check.
+            with span("snapshot_store"):
+                snapshot.store(snapshot_cache)
+        # Skipped phases and failed comments stay open for `resume`.
+        if not phase_run.skipped and not (phase_run.results["drive_comments"] or ([], [], 0))[1]:
+            journal.run_completed()
+
+    issues_slide = phase_run.results["issues_register"]
+    created_comments, failed_comments, skipped_comments = phase_run.results["drive_comments"] or ([], [], 0)
+    updated_notes, skipped_notes, notes_progress = (
+        phase_run.results["speaker_notes"] or ([], 0, NotesProgress())
+    )
 
     return {
         "status": "ok",
         "presentation_id": presentation_id,
-        "presentation_title": deck_title,
+        "presentation_title": snapshot.title,
         "review_mode": mode.key,
         "review_mode_label": mode.label,
         "reviewer_name": reviewer_name,
         "issues_register_slide_id": issues_slide["slide_id"],
+        "issues_register_slide_ids": issues_slide["slide_ids"],
         "issues_register_action": issues_slide["action"],
+        "issues_register_template": issues_slide["template"],
+        "legacy_register_slides_removed": issues_slide["legacy_slides_removed"],
         "drive_comments_created": len(created_comments),
+        "drive_comments_failed": len(failed_comments),
+        "drive_comments_skipped": skipped_comments,
         "speaker_notes_updated": len(updated_notes),
+        "speaker_notes_skipped": skipped_notes,
+        "speaker_notes_batches": notes_progress.batches,
+        "speaker_notes_slides_per_sec": notes_progress.slides_per_sec,
+        "resumed": journal.resumed,
+        "resumed_phases": journal.resumed_phases,
+        "run_journal": str(journal.path) if journal.path is not None else "disabled",
+        "deadline_s": deadline_s,
+        "skipped_phases": phase_run.skipped,
+        "late_phases": phase_run.late,
         "created_comment_sample": created_comments[:3],
+        "failed_comment_sample": failed_comments[:3],
         "updated_slides_sample": updated_notes[:5],
+        "api_reads": snapshot.api_reads,
+        "snapshot_cache": (
+            "disabled" if snapshot_cache is None else "hit" if snapshot.from_cache else "miss"
+        ),
+        "phase_timings": phase_run.timing_summary(),
+        "timing_summary": trace.summary(),
         "style_guide_file": str(STYLE_GUIDE_FILE),
         "next_step": (
             "Open the deck and validate comments, the first slide Issues Register, and speaker notes. "
@@ -0,0 +1,286 @@
+"""Append-only JSONL journal of a review run, so a failed run can resume."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; runs are not locked there.
+    fcntl = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+RUN_JOURNAL_ENV = "WESFARMERS_RUN_JOURNAL"
+RUN_JOURNAL_DIR_ENV = "WESFARMERS_RUN_JOURNAL_DIR"
+
+
+class RunInProgressError(RuntimeError):
+    """Raised when another run of the same presentation and mode holds the journal."""
+
+
+def default_journal_directory() -> Path:
+    base = os.getenv("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+    return Path(base) / "wesfarmers_slide_reviewer" / "runs"
+
+
+def run_journal_enabled() -> bool:
+    return os.getenv(RUN_JOURNAL_ENV, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+@dataclass
+class JournalState:
+    """What an unfinished run recorded before it stopped."""
+
+    run_id: str = ""
+    phases: dict[str, Any] = field(default_factory=dict)
+    batches: dict[str, list[str]] = field(default_factory=dict)
+    # Deck revision after the last journaled deck write.
+    revision_id: str | None = None
+
+
+def _replay(lines: Iterable[str]) -> JournalState | None:
+    """State of the last run in the file, or None if it completed or never started.
+
+    A torn last line from a crash mid-write is ignored.
+    """
+
+    state: JournalState | None = None
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        event = record.get("event")
+        if event == "run_started":
+            state = JournalState(run_id=record.get("run_id", ""), revision_id=record.get("revision_id"))
+        elif state is None:
+            continue
+        elif event == "run_completed":
+            state = None
+        elif event == "phase_done":
+            state.phases[record["phase"]] = record.get("result")
+        elif event == "batch_done":
+            state.batches.setdefault(record["phase"], []).extend(record.get("object_ids", []))
+        if state is not None and "revision_id" in record and event in {"phase_done", "batch_done"}:
+            state.revision_id = record["revision_id"]
+    return state
+
+
+class RunJournal:
+    """Durable record of one review of one presentation in one mode.
+
+    Every record is a JSON line that is flushed and fsynced before the call
+    returns. A fresh run replaces the file; a resumed run appends to it.
+    The run holds an exclusive lock on a sidecar `.lock` file until `close`,
+    so two runs of one presentation and mode never share a journal.
+    A fresh run writes `run_started` with the deck revision once the deck is
+    fetched; records from phases that finish earlier are held until then.
+    Deck phases are only replayed when the deck is still at the revision the
+    journal last saw, since anything else means the deck changed underneath.
+    Drive comments are not part of the deck revision and are always replayed;
+    the ones that failed are recorded so a resumed run retries only those.
+    """
+
+    def __init__(self, path: Path | None, presentation_id: str, mode_key: str) -> None:
+        self.path = path
+        self.presentation_id = presentation_id
+        self.mode_key = mode_key
+        self.state = JournalState()
+        self.resumed = False
+        self.resumed_phases: list[str] = []
+        self._deck_trusted = False
+        self._started = True
+        self._held: list[dict[str, Any]] = []
+        self._lock_handle: Any = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(
+        cls,
+        presentation_id: str,
+        mode_key: str,
+        resume: bool = False,
+        directory: str | os.PathLike[str] | None = None,
+    ) -> RunJournal:
+        """Start a run, picking up the last unfinished one when `resume` is set.
+
+        Raises `RunInProgressError` if another run of this presentation and
+        mode is still going. With `WESFARMERS_RUN_JOURNAL=0` the journal
+        records nothing and takes no lock.
+        """
+
+        if not run_journal_enabled():
+            return cls(None, presentation_id, mode_key)
+
+        directory = Path(directory or os.getenv(RUN_JOURNAL_DIR_ENV) or default_journal_directory())
+        key = hashlib.sha256(f"{presentation_id}\0{mode_key}".encode("utf-8")).hexdigest()[:24]
+        journal = cls(directory / f"{key}.jsonl", presentation_id, mode_key)
+        journal._acquire()
+
+        previous = None
+        if resume:
+            try:
+                with journal.path.open(encoding="utf-8") as handle:
+                    previous = _replay(handle)
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                logger.warning("Ignoring unreadable run journal %s: %s", journal.path.name, exc)
+
+        if previous is not None:
+            journal.state = previous
+            journal.resumed = True
+            journal._append({"event": "run_resumed", "run_id": previous.run_id})
+        else:
+            journal.state = JournalState(run_id=uuid.uuid4().hex)
+            journal._started = False
+        return journal
+
+    def _acquire(self) -> None:
+        if self.path is None or fcntl is None:
+            return
+        lock_path = self.path.with_suffix(".lock")
+        try:
+            lock_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            handle = lock_path.open("a")
+        except OSError as exc:
+            logger.warning("Could not open run journal lock %s: %s", lock_path.name, exc)
+            return
+        try:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            raise RunInProgressError(
+                f"Another review of presentation {self.presentation_id} in mode {self.mode_key} "
+                "is still running; wait for it to finish."
+            ) from None
+        self._lock_handle = handle
+
+    def close(self) -> None:
+        """Write anything still held and release the run lock."""
+
+        self._start(None)
+        handle, self._lock_handle = self._lock_handle, None
+        if handle is not None:
+            handle.close()
+
+    def __enter__(self) -> RunJournal:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _start(self, revision_id: str | None) -> None:
+        """Write `run_started` for a fresh run, then the records held back for it."""
+
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            self.state.revision_id = revision_id
+            self._write(
+                {
+                    "event": "run_started",
+                    "run_id": self.state.run_id,
+                    "presentation_id": self.presentation_id,
+                    "review_mode": self.mode_key,
+                    "revision_id": revision_id,
+                },
+                fresh=True,
+            )
+            for record in self._held:
+                self._write(record)
+            self._held.clear()
+
+    def _append(self, record: dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        record = {**record, "ts": round(time.time(), 3)}
+        with self._lock:
+            if self._started:
+                self._write(record)
+            else:
+                self._held.append(record)
+
+    def _write(self, record: dict[str, Any], fresh: bool = False) -> None:
+        """Write one record; the caller holds `_lock`."""
+
+        if self.path is None:
+            return
+        record.setdefault("ts", round(time.time(), 3))
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        try:
+            self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            with self.path.open("w" if fresh else "a", encoding="utf-8") as handle:
+                handle.write(line)
+                handle.flush()
+                os.fsync(handle.fileno())
+        except OSError as exc:
+            # A lost record only means a rerun repeats that step instead of skipping it.
+            logger.warning("Could not write run journal %s: %s", self.path.name, exc)
+
+    def check_deck(self, revision_id: str | None) -> None:
+        """Decide from the freshly fetched revision whether deck records still hold.
+
+        The first call of a fresh run records the revision in `run_started`.
+        """
+
+        self._start(revision_id)
+        if self.resumed and revision_id != self.state.revision_id:
+            logger.info(
+                "Presentation %s changed since the journaled run; deck phases run again.",
+                self.presentation_id,
+            )
+        self._deck_trusted = (
+            self.resumed and revision_id is not None and revision_id == self.state.revision_id
+        )
+
+    def completed(self, phase: str, deck: bool = True) -> Any | None:
+        """The journaled result of `phase` if it can be reused, else None."""
+
+        if not self.resumed or (deck and not self._deck_trusted):
+            return None
+        result = self.state.phases.get(phase)
+        if result is not None:
+            with self._lock:
+                self.resumed_phases.append(phase)
+        return result
+
+    def written(self, phase: str) -> frozenset[str]:
+        """Object IDs of batches of `phase` that the deck still reflects."""
+
+        if not self._deck_trusted:
+            return frozenset()
+        return frozenset(self.state.batches.get(phase, ()))
+
+    def phase_done(
+        self,
+        phase: str,
+        result: Any,
+        object_ids: Iterable[str] = (),
+        revision_id: str | None = None,
+        deck: bool = True,
+    ) -> None:
+        record = {"event": "phase_done", "phase": phase, "result": result, "object_ids": list(object_ids)}
+        if deck:
+            record["revision_id"] = revision_id
+        self._append(record)
+
+    def batch_done(self, phase: str, object_ids: Iterable[str], revision_id: str | None) -> None:
+        self._append(
+            {"event": "batch_done", "phase": phase, "object_ids": list(object_ids), "revision_id": revision_id}
+        )
+
+    def run_completed(self) -> None:
+        self._append({"event": "run_completed", "run_id": self.state.run_id})
@@ -0,0 +1,279 @@
+"""Self-checks that guard performance properties of the package."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+from typing import Any
+
+PACKAGE_NAME = "wesfarmers_slide_reviewer"
+
+# Cumulative import time allowed for the package on the light CLI paths.
+DEFAULT_STARTUP_BUDGET_MS = 60.0
+STARTUP_COMMANDS: tuple[tuple[str, ...], ...] = (("modes",), ("--help",))
+
+# Modules that only the review path needs. Loading any of them for `modes`
+# or `--help` means an eager import crept back in.
+HEAVY_MODULE_PREFIXES: tuple[str, ...] = (
+    "googleapiclient",
+    "google.auth",
+    "google.oauth2",
+    "google_auth_httplib2",
+    "httplib2",
+    "dotenv",
+)
+
+
+@dataclass
+class CheckResult:
+    name: str
+    passed: bool
+    details: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"check": self.name, "passed": self.passed, **self.details}
+
+
+def _parse_importtime(stderr: str) -> list[tuple[str, int, int]]:
+    """Parse `python -X importtime` output into (module, self_us, cumulative_us)."""
+
+    entries: list[tuple[str, int, int]] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        entries.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+    return entries
+
+
+def measure_cli_import_time(argv: tuple[str, ...]) -> dict[str, Any]:
+    """Run the CLI in a fresh interpreter and summarise its import cost."""
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", PACKAGE_NAME, *argv],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    entries = _parse_importtime(completed.stderr)
+    package_us = next(
+        (cumulative for module, _, cumulative in entries if module == PACKAGE_NAME),
+        0,
+    )
+    heavy = sorted(
+        {
+            module
+            for module, _, _ in entries
+            if any(
+                module == prefix or module.startswith(prefix + ".")
+                for prefix in HEAVY_MODULE_PREFIXES
+            )
+        }
+    )
+    return {
+        "argv": list(argv),
+        "exit_code": completed.returncode,
+        "package_import_ms": round(package_us / 1000, 2),
+        "total_import_ms": round(sum(self_us for _, self_us, _ in entries) / 1000, 2),
+        "heavy_modules_loaded": heavy,
+    }
+
+
+def check_startup_budget(budget_ms: float = DEFAULT_STARTUP_BUDGET_MS) -> list[CheckResult]:
+    """Fail when `modes` or `--help` exceed the import budget or load the Google stack."""
+
+    results: list[CheckResult] = []
+    for argv in STARTUP_COMMANDS:
+        measurement = measure_cli_import_time(argv)
+        passed = (
+            measurement["exit_code"] == 0
+            and measurement["package_import_ms"] <= budget_ms
+            and not measurement["heavy_modules_loaded"]
+        )
+        results.append(
+            CheckResult(
+                name=f"startup_budget[{' '.join(argv)}]",
+                passed=passed,
+                details={"budget_ms": budget_ms, **measurement},
+            )
+        )
+    return results
+
+
+def check_register_template() -> list[CheckResult]:
+    """Fail when register slides duplicated from templates differ from ones built directly."""
+
+    import dataclasses
+
+    from .demo_content import REVIEW_MODES
+    from .emulator import SlidesDriveEmulator
+    from .review_workflow import (
+        _issues_register_content_requests,
+        _register_from_template_requests,
+        _register_page_id,
+        _register_pages,
+        _register_template_requests,
+    )
+    from .synthetic_deck import generate_presentation
+
+    base = generate_presentation(slide_count=3)
+    presentation_id = base["presentationId"]
+
+    def register(requests: list[dict[str, Any]], slide_ids: list[str]) -> list[tuple[int, list[Any], bool]]:
+        emulator = SlidesDriveEmulator()
+        emulator.add_presentation(base)
+        emulator.batch_update(presentation_id, {"requests": requests})
+        slides = emulator.presentations[presentation_id]["slides"]
+        pages = []
+        for slide_id in slide_ids:
+            position = next(index for index, slide in enumerate(slides) if slide["objectId"] == slide_id)
+            slide = slides[position]
+            pages.append((position, slide["pageElements"], bool(slide["slideProperties"].get("isSkipped"))))
+        return pages
+
+    modes = dict(REVIEW_MODES)
+    first = next(iter(REVIEW_MODES.values()))
+    modes["long"] = dataclasses.replace(first, drive_comments=first.drive_comments * 2)
+
+    results: list[CheckResult] = []
+    for key, mode in modes.items():
+        pages = _register_pages(mode)
+        slide_ids = [_register_page_id(page) for page in range(1, len(pages) + 1)]
+        direct: list[dict[str, Any]] = []
+        templated: list[dict[str, Any]] = []
+        fill: list[dict[str, Any]] = []
+        for row_count in dict.fromkeys(len(rows) for rows in pages):
+            templated.extend(_register_template_requests(row_count))
+        for page, slide_id in enumerate(slide_ids, start=1):
+            direct.append({"createSlide": {"objectId": slide_id, "insertionIndex": page - 1}})
+            direct.extend(_issues_register_content_requests(slide_id, mode, generated="golden", page=page))
+            fill.extend(_register_from_template_requests(slide_id, mode, page - 1, generated="golden", page=page))
+        templated.extend(fill)
+        same = register(direct, slide_ids) == register(templated, slide_ids)
+        results.append(
+            CheckResult(
+                name=f"register_template[{key}]",
+                passed=same,
+                details={
+                    "identical": same,
+                    "register_slides": len(slide_ids),
+                    "direct_requests": len(direct),
+                    "direct_bytes": len(json.dumps(direct)),
+                    "template_fill_requests": len(fill),
+                    "template_fill_bytes": len(json.dumps(fill)),
+                },
+            )
+        )
+    return results
+
+
+def check_tool_inputs() -> list[CheckResult]:
+    """Fail when a malformed tool argument escapes as an exception instead of an error result."""
+
+    import asyncio
+
+    from .tools import review_presentation, review_presentation_async
+
+    results: list[CheckResult] = []
+    for deadline in ("soon", "5 parsecs", "-3s"):
+        for name, call in (
+            ("review_presentation", lambda: review_presentation("deck", "ic_hard_mode", deadline=deadline)),
+            (
+                "review_presentation_async",
+                lambda: asyncio.run(review_presentation_async("deck", "ic_hard_mode", deadline=deadline)),
+            ),
+        ):
+            try:
+                outcome = call()
+                error = ""
+            except Exception as exc:
+                outcome = {}
+                error = f"{type(exc).__name__}: {exc}"
+            results.append(
+                CheckResult(
+                    name=f"tool_inputs[{name}:deadline={deadline}]",
+                    passed=not error and outcome.get("status") == "error",
+                    details={"status": outcome.get("status"), "raised": error},
+                )
+            )
+    return results
+
+
+def check_telemetry_spec() -> list[CheckResult]:
+    """Report a malformed `WESFARMERS_TELEMETRY`, and check a bad entry never aborts a review.
+
+    The review path logs and skips unknown exporters, so this is where a typo
+    in the setting shows up as a failure.
+    """
+
+    import tempfile
+
+    from . import instrumentation
+
+    results: list[CheckResult] = []
+    saved_env = os.environ.get(instrumentation.TELEMETRY_ENV)
+    try:
+        instrumentation.parse_exporter_spec(saved_env or "")
+        error = ""
+    except ValueError as exc:
+        error = str(exc)
+    results.append(
+        CheckResult(
+            name="telemetry_spec[env]",
+            passed=not error,
+            details={"spec": saved_env or "", **({"error": error} if error else {})},
+        )
+    )
+
+    with instrumentation._exporters_lock:
+        saved_exporters = list(instrumentation._exporters)
+        saved_loaded = instrumentation._env_loaded
+        instrumentation._exporters.clear()
+        instrumentation._env_loaded = False
+    raised = ""
+    exported = 0
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            target = os.path.join(tmp, "traces.jsonl")
+            os.environ[instrumentation.TELEMETRY_ENV] = f"otlp={target},carrier-pigeon"
+            try:
+                for _ in range(2):
+                    with instrumentation.start_trace("selfcheck"):
+                        pass
+            except ValueError as exc:
+                raised = type(exc).__name__
+            if os.path.exists(target):
+                with open(target, encoding="utf-8") as handle:
+                    exported = sum(1 for _ in handle)
+    finally:
+        if saved_env is None:
+            os.environ.pop(instrumentation.TELEMETRY_ENV, None)
+        else:
+            os.environ[instrumentation.TELEMETRY_ENV] = saved_env
+        with instrumentation._exporters_lock:
+            instrumentation._exporters[:] = saved_exporters
+            instrumentation._env_loaded = saved_loaded
+    results.append(
+        CheckResult(
+            name="telemetry_spec[malformed]",
+            passed=not raised and exported == 2,
+            details={"raised": raised or None, "exported_traces": exported},
+        )
+    )
+    return results
+
+
+def run_selfchecks(startup_budget_ms: float = DEFAULT_STARTUP_BUDGET_MS) -> dict[str, Any]:
+    results = check_startup_budget(startup_budget_ms)
+    results.extend(check_register_template())
+    results.extend(check_tool_inputs())
+    results.extend(check_telemetry_spec())
+    return {
+        "passed": all(result.passed for result in results),
+        "checks": [result.as_dict() for result in results],
+    }
@@ -0,0 +1,165 @@
+"""On-disk cache of deck snapshots keyed by account, presentation ID and revision."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_CACHE_ENV = "WESFARMERS_SNAPSHOT_CACHE"
+SNAPSHOT_CACHE_DIR_ENV = "WESFARMERS_SNAPSHOT_CACHE_DIR"
+SNAPSHOT_CACHE_MAX_MB_ENV = "WESFARMERS_SNAPSHOT_CACHE_MAX_MB"
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# The directory may be shared, so entries are JSON, which cannot execute code
+# when loaded. Bump the version when the stored shape changes.
+_FORMAT_VERSION = 1
+_SUFFIX = f".v{_FORMAT_VERSION}.json"
+
+
+def _digest(value: str, length: int) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:length]
+
+
+def _plain(value: Any) -> Any:
+    """Copy guarded (dict-subclass) responses into plain containers."""
+
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in dict.items(value)}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+
+class SnapshotCache:
+    """Size-bounded LRU directory of presentation resources.
+
+    One file per (account, presentation, fields mask, revision), so a deck
+    read by one account is never served to another. A hit refreshes the
+    file's mtime, and eviction removes the least recently used files until the
+    directory fits in `max_bytes`. Writes are atomic, so concurrent processes
+    can share a directory.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+
+    def _prefix(self, principal: str, presentation_id: str, fields: str) -> str:
+        return _digest(f"{principal}\0{presentation_id}\0{fields}", 24)
+
+    def _path(self, principal: str, presentation_id: str, fields: str, revision_id: str) -> Path:
+        prefix = self._prefix(principal, presentation_id, fields)
+        return self.directory / f"{prefix}.{_digest(revision_id, 16)}{_SUFFIX}"
+
+    def load(
+        self, principal: str, presentation_id: str, fields: str, revision_id: str
+    ) -> dict[str, Any] | None:
+        path = self._path(principal, presentation_id, fields, revision_id)
+        try:
+            presentation = json.loads(path.read_bytes())
+            os.utime(path)
+        except FileNotFoundError:
+            presentation = None
+        except (OSError, ValueError) as exc:
+            logger.warning("Discarding unreadable snapshot cache entry %s: %s", path.name, exc)
+            path.unlink(missing_ok=True)
+            presentation = None
+
+        if not isinstance(presentation, dict) or presentation.get("revisionId") != revision_id:
+            with self._lock:
+                self.stats.misses += 1
+            return None
+        with self._lock:
+            self.stats.hits += 1
+        return presentation
+
+    def store(self, principal: str, presentation_id: str, fields: str, presentation: dict[str, Any]) -> None:
+        """Save `presentation` under its own `revisionId` and drop older revisions."""
+
+        revision_id = presentation.get("revisionId")
+        if not revision_id:
+            return
+        path = self._path(principal, presentation_id, fields, revision_id)
+        staging = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+            staging.write_text(json.dumps(_plain(presentation), separators=(",", ":")), encoding="utf-8")
+            os.replace(staging, path)
+
+            prefix = self._prefix(principal, presentation_id, fields)
+            for stale in self.directory.glob(f"{prefix}.*{_SUFFIX}"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+            self._evict()
+        except OSError as exc:
+            # Without this entry the next run refetches the deck, nothing more.
+            logger.warning("Could not write snapshot cache entry %s: %s", path.name, exc)
+            staging.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self.stats.stores += 1
+
+    def _evict(self) -> None:
+        entries = []
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            with self._lock:
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        for path in self.directory.glob(f"*{_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+
+def default_cache_directory() -> Path:
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "wesfarmers_slide_reviewer" / "snapshots"
+
+
+@cache
+def default_snapshot_cache() -> SnapshotCache | None:
+    """The process-wide cache, or None when `WESFARMERS_SNAPSHOT_CACHE=0`."""
+
+    if os.getenv(SNAPSHOT_CACHE_ENV, "1").strip().lower() in {"0", "false", "no", "off"}:
+        return None
+    try:
+        max_bytes = int(float(os.environ[SNAPSHOT_CACHE_MAX_MB_ENV]) * 1024 * 1024)
+    except (KeyError, ValueError):
+        max_bytes = DEFAULT_MAX_BYTES
+    directory = os.getenv(SNAPSHOT_CACHE_DIR_ENV) or default_cache_directory()
+    return SnapshotCache(directory, max_bytes=max_bytes)
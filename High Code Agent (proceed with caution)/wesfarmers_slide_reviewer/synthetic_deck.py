@@ -0,0 +1,85 @@
+"""Synthetic Slides `Presentation` resources for self-checks and local runs."""
+
+from __future__ import annotations
+
+from typing import Any
+
+
+def _text_shape(object_id: str, lines: list[str], placeholder: str | None = None) -> dict[str, Any]:
+    shape: dict[str, Any] = {
+        "shapeType": "TEXT_BOX",
+        "text": {
+            "textElements": [
+                {"paragraphMarker": {"style": {"direction": "LEFT_TO_RIGHT"}}},
+                *(
+                    {"textRun": {"content": f"{line}\n", "style": {"fontFamily": "Arial"}}}
+                    for line in lines
+                ),
+            ]
+        },
+    }
+    if placeholder:
+        shape["placeholder"] = {"type": placeholder, "parentObjectId": "layout_title"}
+    return {
+        "objectId": object_id,
+        "size": {"width": {"magnitude": 600, "unit": "PT"}, "height": {"magnitude": 40, "unit": "PT"}},
+        "transform": {"scaleX": 1, "scaleY": 1, "translateX": 24, "translateY": 24, "unit": "PT"},
+        "shape": shape,
+    }
+
+
+def generate_presentation(
+    slide_count: int = 12,
+    body_lines: int = 4,
+    notes_every: int = 2,
+    presentation_id: str = "synthetic_deck",
+) -> dict[str, Any]:
+    """Build a presentation resource shaped like a real `presentations.get` response.
+
+    `body_lines` controls text density; every `notes_every`-th slide starts with
+    existing speaker notes; the others have no notes shape yet (0 leaves every
+    notes page empty).
+    """
+
+    slides: list[dict[str, Any]] = []
+    for idx in range(1, slide_count + 1):
+        notes_id = f"notes_{idx}_body"
+        has_notes = notes_every > 0 and idx % notes_every == 0
+        slides.append(
+            {
+                "objectId": f"slide_{idx}",
+                "pageType": "SLIDE",
+                "pageElements": [
+                    _text_shape(f"slide_{idx}_title", [f"Slide {idx} headline"], "TITLE"),
+                    _text_shape(
+                        f"slide_{idx}_body",
+                        [f"Point {line} for slide {idx} with supporting numbers." for line in range(body_lines)],
+                    ),
+                    {
+                        "objectId": f"slide_{idx}_image",
+                        "image": {"contentUrl": f"https://example.invalid/{idx}.png", "imageProperties": {}},
+                    },
+                ],
+                "slideProperties": {
+                    "layoutObjectId": "layout_title_body",
+                    "masterObjectId": "master",
+                    "notesPage": {
+                        "objectId": f"notes_{idx}",
+                        "pageType": "NOTES",
+                        "notesProperties": {"speakerNotesObjectId": notes_id},
+                        # Slides only creates the notes shape once notes are written.
+                        "pageElements": [_text_shape(notes_id, ["Existing presenter notes."])] if has_notes else [],
+                    },
+                },
+            }
+        )
+
+    return {
+        "presentationId": presentation_id,
+        "title": f"Synthetic deck ({slide_count} slides)",
+        "revisionId": "synthetic_revision_1",
+        "pageSize": {"width": {"magnitude": 9144000, "unit": "EMU"}, "height": {"magnitude": 5143500, "unit": "EMU"}},
+        "layouts": [{"objectId": "layout_title_body", "pageType": "LAYOUT"}],
+        "masters": [{"objectId": "master", "pageType": "MASTER"}],
+        "slides": slides,
+    }
@@ -2,10 +2,23 @@
 
 from __future__ import annotations
 
-from typing import Any
+import os
+import threading
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
+from .deadlines import parse_duration
 from .demo_content import REVIEW_MODES, normalize_mode
-from .review_workflow import run_review_workflow
+from .run_journal import RunInProgressError
+
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
+
+MAX_CONCURRENT_REVIEWS_ENV = "WESFARMERS_MAX_CONCURRENT_REVIEWS"
+DEFAULT_MAX_CONCURRENT_REVIEWS = 4
+
+_review_executor: ThreadPoolExecutor | None = None
+_review_executor_lock = threading.Lock()
 
 
 def list_review_modes() -> dict[str, Any]:
@@ -32,28 +45,130 @@ def list_review_modes() -> dict[str, Any]:
     }
 
 
-def review_presentation(
+def _max_concurrent_reviews() -> int:
+    try:
+        return max(1, int(os.getenv(MAX_CONCURRENT_REVIEWS_ENV, DEFAULT_MAX_CONCURRENT_REVIEWS)))
+    except ValueError:
+        return DEFAULT_MAX_CONCURRENT_REVIEWS
+
+
+def _reviews_executor() -> ThreadPoolExecutor:
+    """Process-wide pool that bounds how many reviews run at once."""
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    global _review_executor
+    with _review_executor_lock:
+        if _review_executor is None:
+            _review_executor = ThreadPoolExecutor(
+                max_workers=_max_concurrent_reviews(),
+                thread_name_prefix="review",
+            )
+        return _review_executor
+
+
+def _error_result(presentation_id: str, review_mode: str, exc: Exception, remediation: str) -> dict[str, Any]:
+    return {
+        "status": "error",
+        "presentation_id": presentation_id,
+        "review_mode": review_mode,
+        "error_message": str(exc),
+        "remediation": remediation,
+    }
+
+
+def _run_review(
     presentation_id: str,
     review_mode: str,
-    reviewer_name: str = "Wesfarmers BD Demo Agent",
+    reviewer_name: str,
+    cancel_event: threading.Event | None = None,
+    resume: bool = False,
+    deadline: str | None = None,
 ) -> dict[str, Any]:
-    """Run the demo review workflow over a Slides presentation."""
+    # Deferred so `list_review_modes` (and the `modes` CLI command) never loads
+    # the Google API client stack.
+    from .review_workflow import run_review_workflow
 
     normalized = normalize_mode(review_mode)
+    try:
+        deadline_s = parse_duration(deadline) if deadline else None
+    except ValueError as exc:
+        return _error_result(
+            presentation_id,
+            normalized,
+            exc,
+            "Pass `deadline` as a duration such as 45s, 2m or 500ms, or leave it empty.",
+        )
     try:
         return run_review_workflow(
             presentation_id=presentation_id,
             review_mode=normalized,
             reviewer_name=reviewer_name,
+            cancel_event=cancel_event,
+            resume=resume,
+            deadline_s=deadline_s,
+        )
+    except RunInProgressError as exc:
+        return _error_result(
+            presentation_id,
+            normalized,
+            exc,
+            "Wait for the other review of this presentation and mode to finish, then try again.",
         )
     except Exception as exc:  # pragma: no cover - surfaced in ADK tool response.
-        return {
-            "status": "error",
-            "presentation_id": presentation_id,
-            "review_mode": normalized,
-            "error_message": str(exc),
-            "remediation": (
-                "Check GOOGLE_SERVICE_ACCOUNT_JSON or ADC setup, confirm Slides/Drive API "
-                "access, and ensure the deck is shared with the credential identity."
-            ),
-        }
+        return _error_result(
+            presentation_id,
+            normalized,
+            exc,
+            "Check GOOGLE_SERVICE_ACCOUNT_JSON or ADC setup, confirm Slides/Drive API "
+            "access, and ensure the deck is shared with the credential identity.",
+        )
+
+
+def review_presentation(
+    presentation_id: str,
+    review_mode: str,
+    reviewer_name: str = "Wesfarmers BD Demo Agent",
+    resume: bool = False,
+    deadline: str | None = None,
+) -> dict[str, Any]:
+    """Run the demo review workflow over a Slides presentation.
+
+    Set `resume` to continue a review that failed partway instead of starting over.
+    Set `deadline` (e.g. "45s") to bound the run; optional phases are skipped if time runs short.
+    """
+
+    return _run_review(presentation_id, review_mode, reviewer_name, resume=resume, deadline=deadline)
+
+
+async def review_presentation_async(
+    presentation_id: str,
+    review_mode: str,
+    reviewer_name: str = "Wesfarmers BD Demo Agent",
+    resume: bool = False,
+    deadline: str | None = None,
+) -> dict[str, Any]:
+    """Run the demo review workflow over a Slides presentation without blocking the event loop.
+
+    Set `resume` to continue a review that failed partway instead of starting over.
+    Set `deadline` (e.g. "45s") to bound the run; optional phases are skipped if time runs short.
+    At most `WESFARMERS_MAX_CONCURRENT_REVIEWS` reviews run per process; extra
+    calls wait for a free slot. Cancelling the call drops a queued review, or
+    stops a running one at its next phase boundary.
+    """
+
+    # asyncio is imported here, not at module level, to keep it off the
+    # `modes` / `--help` startup path.
+    import asyncio
+
+    cancel_event = threading.Event()
+    loop = asyncio.get_running_loop()
+    future = loop.run_in_executor(
+        _reviews_executor(),
+        partial(_run_review, presentation_id, review_mode, reviewer_name, cancel_event, resume, deadline),
+    )
+    try:
+        return await future
+    except asyncio.CancelledError:
+        cancel_event.set()
+        raise